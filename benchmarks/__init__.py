@@ -0,0 +1,6 @@
+##############################################################################
+# CloudMage : JinjaUtils Benchmark Suite
+# ============================================================================
+# Reproducible micro and macro benchmarks for the JinjaUtils pipeline.
+# Run with: `poetry run python -m benchmarks --help`
+##############################################################################
@@ -0,0 +1,4 @@
+from .suite import main
+import sys
+
+sys.exit(main())
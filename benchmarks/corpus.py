@@ -0,0 +1,313 @@
+##############################################################################
+# CloudMage : JinjaUtils Synthetic Template Corpus Generator
+# ============================================================================
+# CloudMage Jinja Helper Object Utility/Library
+#   - Generate deterministic template trees and context data for scale tests.
+# Author: Richard Nason rnason@cloudmage.io
+# Project Start: 2/13/2020
+# License: GNU GPLv3
+##############################################################################
+
+###############
+# Imports:    #
+###############
+# Import Base Python Modules
+import argparse
+import hashlib
+import random
+import json
+import os
+
+
+# Words used to build deterministic filler text.
+WORDS = (
+    'alpha', 'bravo', 'charlie', 'delta', 'echo', 'foxtrot', 'golf',
+    'hotel', 'india', 'juliet', 'kilo', 'lima', 'mike', 'november',
+    'oscar', 'papa', 'quebec', 'romeo', 'sierra', 'tango', 'uniform',
+    'victor', 'whiskey', 'xray', 'yankee', 'zulu'
+)
+
+# Rendered width of a single loop row: "item_0000=00000000\n".
+ROW_SIZE = 19
+
+
+#####################
+# Class Definition: #
+#####################
+class CorpusGenerator(object):
+    """ CloudMage Jinja Synthetic Corpus Generator Class
+
+    This class writes a synthetic template tree made of a chain of layout
+    templates joined by extends, a pool of partial templates and page
+    templates spread over nested directories. Each page extends the last
+    layout, includes partials and loops over the generated context. The
+    generated files and context are fully determined by the seed and the
+    settings, so the same corpus can be rebuilt on any machine.
+    """
+
+    def __init__(
+        self,
+        seed=0,
+        files=100,
+        depth=2,
+        fanout=3,
+        inheritance=2,
+        includes=2,
+        partials=None,
+        loop_size=10,
+        output_size=1024
+    ):
+        """ CorpusGenerator Class Constructor
+
+        Parameters:
+            seed        (int): optional [default=0]
+            files       (int): optional [default=100]
+            depth       (int): optional [default=2]
+            fanout      (int): optional [default=3]
+            inheritance (int): optional [default=2]
+            includes    (int): optional [default=2]
+            partials    (int): optional [default=None]
+            loop_size   (int): optional [default=10]
+            output_size (int): optional [default=1024]
+
+        files is the number of page templates, depth and fanout set how many
+        directory levels the pages are spread over and how many directories
+        each level holds, inheritance is the length of the layout chain,
+        includes is the number of partials each page includes from a pool of
+        partials templates (default 4 x includes), loop_size is the number of
+        context items each loop renders and output_size is the approximate
+        rendered size in bytes of each page.
+        """
+        for name, value in (
+            ('files', files), ('depth', depth), ('fanout', fanout),
+            ('inheritance', inheritance), ('includes', includes),
+            ('loop_size', loop_size), ('output_size', output_size)
+        ):
+            if not isinstance(value, int) or value < 0:
+                raise ValueError(
+                    "{} expected non negative int but received: {}".format(
+                        name, value
+                    )
+                )
+        self.seed = seed
+        self.files = files
+        self.depth = depth
+        self.fanout = max(1, fanout)
+        self.inheritance = inheritance
+        self.includes = includes
+        self.partials = (
+            partials if partials is not None else max(1, includes * 4)
+        )
+        self.loop_size = loop_size
+        self.output_size = output_size
+
+    @property
+    def settings(self):
+        """ Return the generator settings as a dict. """
+        return {
+            'seed': self.seed,
+            'files': self.files,
+            'depth': self.depth,
+            'fanout': self.fanout,
+            'inheritance': self.inheritance,
+            'includes': self.includes,
+            'partials': self.partials,
+            'loop_size': self.loop_size,
+            'output_size': self.output_size
+        }
+
+    @staticmethod
+    def _filler(generator, size):
+        """ Return deterministic filler text of exactly size characters. """
+        words = []
+        length = 0
+        while length < size:
+            word = generator.choice(WORDS)
+            words.append(word)
+            length += len(word) + 1
+        return " ".join(words)[:size]
+
+    def context(self):
+        """ Context Method
+
+        Return the context data matching the generated templates. Pages
+        loop over context['items'] and partials read context['settings'].
+        """
+        generator = random.Random("{}:context".format(self.seed))
+        return {
+            'title': self._filler(generator, 24),
+            'items': [
+                {
+                    'key': "item_{:04d}".format(index % 10000),
+                    'value': generator.randrange(10 ** 8)
+                }
+                for index in range(self.loop_size)
+            ],
+            'settings': {
+                "setting_{:02d}".format(index): generator.randrange(1000)
+                for index in range(8)
+            }
+        }
+
+    def templates(self):
+        """ Templates Method
+
+        Return a dict mapping each template name, using / separators as
+        expected by the Jinja loaders, to its source.
+        """
+        generator = random.Random("{}:templates".format(self.seed))
+        sources = {}
+
+        # Layout chain, each layout extends the previous one.
+        layouts = []
+        for index in range(self.inheritance):
+            name = "layouts/layout_{:02d}.j2".format(index)
+            if index == 0:
+                sources[name] = (
+                    "{% block header %}== {{ title }} ==\n{% endblock %}"
+                    "{% block body %}{% endblock %}"
+                    "{% block footer %}-- layout_00 --\n{% endblock %}"
+                )
+            else:
+                sources[name] = (
+                    "{{% extends \"{}\" %}}"
+                    "{{% block body %}}[layout_{:02d}]\n{{{{ super() }}}}"
+                    "{{% endblock %}}"
+                ).format(layouts[-1], index)
+            layouts.append(name)
+
+        # Partial pool, each partial loops over the context items.
+        partials = []
+        for index in range(self.partials if self.includes else 0):
+            name = "partials/partial_{:03d}.j2".format(index)
+            sources[name] = (
+                "{{% for item in items %}}{{{{ item.key }}}}="
+                "{{{{ '%08d' | format(item.value) }}}}\n{{% endfor %}}"
+                "{{{{ settings.setting_{:02d} }}}}\n"
+            ).format(index % 8)
+            partials.append(name)
+
+        # Page templates spread over nested directories.
+        rendered = (
+            ROW_SIZE * self.loop_size * (1 + self.includes) +
+            4 * self.includes + 12 * self.inheritance + 64
+        )
+        for index in range(self.files):
+            directories = []
+            position = index
+            for level in range(self.depth):
+                directories.append(
+                    "d{}_{}".format(level, position % self.fanout)
+                )
+                position //= self.fanout
+            name = "/".join(
+                ["pages"] + directories + ["page_{:05d}.j2".format(index)]
+            )
+            included = "".join(
+                "{{% include \"{}\" %}}".format(generator.choice(partials))
+                for _ in range(self.includes)
+            )
+            body = (
+                "{}{{% for item in items %}}{{{{ item.key }}}}="
+                "{{{{ '%08d' | format(item.value) }}}}\n{{% endfor %}}"
+                "{}\n"
+            ).format(
+                included,
+                self._filler(generator, max(0, self.output_size - rendered))
+            )
+            if layouts:
+                sources[name] = (
+                    "{{% extends \"{}\" %}}{{% block body %}}"
+                    "{{{{ super() }}}}{}{{% endblock %}}"
+                ).format(layouts[-1], body)
+            else:
+                sources[name] = body
+        return sources
+
+    def pages(self):
+        """ Return the names of the generated page templates. """
+        return [name for name in self.templates() if name.startswith('pages/')]
+
+    def fingerprint(self, sources=None):
+        """ Return a SHA-256 fingerprint of the template names and sources.
+        """
+        fingerprint = hashlib.sha256()
+        for name, source in sorted((sources or self.templates()).items()):
+            fingerprint.update(name.encode('utf-8') + b"\0")
+            fingerprint.update(source.encode('utf-8') + b"\0")
+        return fingerprint.hexdigest()
+
+    def generate(self, directory, context_path=None):
+        """ Generate Method
+
+        Write the corpus templates into directory and return a manifest dict
+        holding the settings, the page template names, the context and a
+        fingerprint of the generated files. When context_path is set the
+        matching context is also written there as JSON.
+
+        Parameters:
+            directory    (str): required
+            context_path (str): optional [default=None]
+        """
+        sources = self.templates()
+        for name, source in sorted(sources.items()):
+            path = os.path.join(directory, *name.split("/"))
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            with open(path, "w", encoding="utf-8", newline="\n") as template:
+                template.write(source)
+        context = self.context()
+        if context_path is not None:
+            with open(context_path, "w", encoding="utf-8") as context_file:
+                json.dump(context, context_file, indent=2, sort_keys=True)
+        return {
+            'settings': self.settings,
+            'templates': len(sources),
+            'pages': [
+                name for name in sorted(sources) if name.startswith('pages/')
+            ],
+            'context': context,
+            'fingerprint': self.fingerprint(sources)
+        }
+
+
+def main(argv=None):
+    """ Corpus generator command line entry point. """
+    parser = argparse.ArgumentParser(
+        prog='python -m benchmarks.corpus',
+        description="Generate a synthetic JinjaUtils template corpus."
+    )
+    parser.add_argument('directory')
+    parser.add_argument('--context', metavar='PATH')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--files', type=int, default=100)
+    parser.add_argument('--depth', type=int, default=2)
+    parser.add_argument('--fanout', type=int, default=3)
+    parser.add_argument('--inheritance', type=int, default=2)
+    parser.add_argument('--includes', type=int, default=2)
+    parser.add_argument('--partials', type=int, default=None)
+    parser.add_argument('--loop-size', type=int, default=10)
+    parser.add_argument('--output-size', type=int, default=1024)
+    args = parser.parse_args(argv)
+    manifest = CorpusGenerator(
+        seed=args.seed,
+        files=args.files,
+        depth=args.depth,
+        fanout=args.fanout,
+        inheritance=args.inheritance,
+        includes=args.includes,
+        partials=args.partials,
+        loop_size=args.loop_size,
+        output_size=args.output_size
+    ).generate(args.directory, context_path=args.context)
+    print("Generated {} templates ({} pages) in {} fingerprint {}".format(
+        manifest['templates'],
+        len(manifest['pages']),
+        args.directory,
+        manifest['fingerprint']
+    ))
+    return 0
+
+
+if __name__ == '__main__':
+    import sys
+    sys.exit(main())
@@ -0,0 +1,462 @@
+##############################################################################
+# CloudMage : JinjaUtils Benchmark Suite
+# ============================================================================
+# CloudMage Jinja Helper Object Utility/Library
+#   - Micro and macro benchmarks covering the full JinjaUtils pipeline.
+# Author: Richard Nason rnason@cloudmage.io
+# Project Start: 2/13/2020
+# License: GNU GPLv3
+##############################################################################
+
+###############
+# Imports:    #
+###############
+# Import Package Modules:
+from cloudmage.jinjautils import JinjaUtils
+from .corpus import CorpusGenerator
+
+# Import Base Python Modules
+from contextlib import redirect_stdout
+from time import perf_counter
+import subprocess
+import statistics
+import argparse
+import platform
+import tempfile
+import shutil
+import random
+import json
+import sys
+import os
+
+
+# Registered benchmarks in definition order: name -> (kind, setup function).
+BENCHMARKS = {}
+
+# Repository root, so the startup benchmarks import this checkout.
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def benchmark(name, kind='micro'):
+    """ Register a benchmark.
+
+    The decorated function receives the shared corpus and returns the
+    zero argument callable that is timed.
+    """
+    def register(setup):
+        BENCHMARKS[name] = (kind, setup)
+        return setup
+    return register
+
+
+######################################
+# Synthetic Corpus:                  #
+######################################
+class Corpus(object):
+    """ Synthetic template corpus used by the benchmarks.
+
+    Generates a CorpusGenerator template tree, a large single template and
+    an output directory in a temporary location that is removed by close().
+    Extra keyword arguments are passed to the CorpusGenerator.
+    """
+
+    def __init__(self, size=100, rows=1000, seed=0, **settings):
+        self.size = size
+        self.rows = rows
+        self.root = tempfile.mkdtemp(prefix='jinjautils-bench-')
+        self.template_directory = os.path.join(self.root, 'templates')
+        self.output_directory = os.path.join(self.root, 'output')
+        os.makedirs(self.template_directory)
+        os.makedirs(self.output_directory)
+        generator = random.Random(seed)
+
+        self.manifest = CorpusGenerator(
+            seed=seed, files=size, **settings
+        ).generate(self.template_directory)
+        self.small_templates = self.manifest['pages']
+        self.small_context = self.manifest['context']
+        with open(
+            os.path.join(self.template_directory, 'large.j2'), "w"
+        ) as template:
+            template.write(
+                "{% for row in rows %}"
+                "{{ row.id }},{{ row.name | upper }},{{ row.value }}\n"
+                "{% endfor %}"
+            )
+        self.large_context = {
+            'rows': [
+                {
+                    'id': i,
+                    'name': "row{}".format(i),
+                    'value': generator.random()
+                }
+                for i in range(rows)
+            ]
+        }
+
+    def path(self, name):
+        """ Return the file path of a corpus template. """
+        return os.path.join(self.template_directory, *name.split("/"))
+
+    def close(self):
+        """ Remove the corpus from disk. """
+        shutil.rmtree(self.root, ignore_errors=True)
+
+
+def _loaded(corpus, template, **context):
+    """ Return a JinjaUtils object with the template loaded and rendered. """
+    jinja = JinjaUtils()
+    jinja.template_directory = corpus.template_directory
+    jinja.load = template
+    if context:
+        jinja.render(**context)
+    return jinja
+
+
+######################################
+# Micro Benchmarks:                  #
+######################################
+@benchmark('log_verbose_off')
+def bench_log_verbose_off(corpus):
+    jinja = JinjaUtils(verbose=False)
+    return lambda: jinja.log("benchmark", 'info', 'bench')
+
+
+@benchmark('log_verbose_on')
+def bench_log_verbose_on(corpus):
+    jinja = JinjaUtils(verbose=True)
+    devnull = open(os.devnull, "w")
+
+    def run():
+        with redirect_stdout(devnull):
+            jinja.log("benchmark", 'info', 'bench')
+    return run
+
+
+@benchmark('property_access')
+def bench_property_access(corpus):
+    jinja = _loaded(corpus, corpus.small_templates[0], **corpus.small_context)
+
+    def run():
+        jinja.trim_blocks
+        jinja.template_directory
+        jinja.rendered
+    return run
+
+
+@benchmark('load_by_name')
+def bench_load_by_name(corpus):
+    jinja = _loaded(corpus, corpus.small_templates[0])
+    names = corpus.small_templates
+    state = {'index': 0}
+
+    def run():
+        jinja.load = names[state['index'] % len(names)]
+        state['index'] += 1
+    return run
+
+
+@benchmark('load_by_path')
+def bench_load_by_path(corpus):
+    jinja = JinjaUtils()
+    path = corpus.path('large.j2')
+
+    def run():
+        jinja.load = path
+    return run
+
+
+@benchmark('render_small')
+def bench_render_small(corpus):
+    jinja = _loaded(corpus, corpus.small_templates[0])
+    context = corpus.small_context
+    return lambda: jinja.render(**context)
+
+
+@benchmark('render_large', kind='macro')
+def bench_render_large(corpus):
+    jinja = _loaded(corpus, 'large.j2')
+    context = corpus.large_context
+    return lambda: jinja.render(**context)
+
+
+@benchmark('write_backup')
+def bench_write_backup(corpus):
+    jinja = _loaded(corpus, corpus.small_templates[0], **corpus.small_context)
+    directory = tempfile.mkdtemp(dir=corpus.output_directory)
+    # The output exists before the first timed run, so every run copies it
+    # to a timestamped backup and then writes it. Backups taken within the
+    # same second share a name and replace each other, as they do for any
+    # repeated write, so one backup file is kept per second.
+    jinja.write(directory, 'out.txt', backup=False)
+    return lambda: jinja.write(directory, 'out.txt')
+
+
+@benchmark('write_no_backup')
+def bench_write_no_backup(corpus):
+    jinja = _loaded(corpus, corpus.small_templates[0], **corpus.small_context)
+    directory = tempfile.mkdtemp(dir=corpus.output_directory)
+    return lambda: jinja.write(directory, 'out.txt', backup=False)
+
+
+######################################
+# Macro Benchmarks:                  #
+######################################
+@benchmark('pipeline_corpus', kind='macro')
+def bench_pipeline_corpus(corpus):
+    directory = tempfile.mkdtemp(dir=corpus.output_directory)
+
+    def run():
+        jinja = JinjaUtils()
+        jinja.template_directory = corpus.template_directory
+        for name in corpus.small_templates:
+            jinja.load = name
+            jinja.render(**corpus.small_context)
+            jinja.write(
+                directory,
+                name.replace("/", "_") + '.txt',
+                backup=False
+            )
+    return run
+
+
+@benchmark('discover_corpus', kind='macro')
+def bench_discover_corpus(corpus):
+    def run():
+        jinja = JinjaUtils()
+        jinja.template_directory = corpus.template_directory
+        jinja.available_templates
+    return run
+
+
+@benchmark('write_many_corpus', kind='macro')
+def bench_write_many_corpus(corpus):
+    jinja = _loaded(corpus, corpus.small_templates[0], **corpus.small_context)
+    directory = tempfile.mkdtemp(dir=corpus.output_directory)
+    items = [
+        (
+            os.path.join(directory, name.replace("/", "_") + '.txt'),
+            jinja._rendered_template
+        )
+        for name in corpus.small_templates
+    ]
+    return lambda: jinja.write_many(items, backup=False)
+
+
+def _python(code):
+    """ Return a callable running code in a fresh interpreter. """
+    env = dict(os.environ)
+    env['PYTHONPATH'] = os.pathsep.join(
+        filter(None, [ROOT, env.get('PYTHONPATH')])
+    )
+    command = [sys.executable, "-c", code]
+    return lambda: subprocess.run(command, env=env, check=True)
+
+
+@benchmark('import_package', kind='macro')
+def bench_import_package(corpus):
+    return _python("import cloudmage.jinjautils")
+
+
+@benchmark('cold_start_render', kind='macro')
+def bench_cold_start_render(corpus):
+    directory = tempfile.mkdtemp(dir=corpus.output_directory)
+    return _python(
+        "from cloudmage.jinjautils import JinjaUtils\n"
+        "jinja = JinjaUtils()\n"
+        "jinja.load = {!r}\n"
+        "jinja.render(**{!r})\n"
+        "jinja.write({!r}, 'out.txt', backup=False)\n".format(
+            corpus.path('large.j2'),
+            {'rows': corpus.large_context['rows'][:10]},
+            directory
+        )
+    )
+
+
+######################################
+# Runner:                            #
+######################################
+def _time(function, min_time):
+    """ Calibrate a loop count so one repeat runs for at least min_time. """
+    number = 1
+    while True:
+        started = perf_counter()
+        for _ in range(number):
+            function()
+        elapsed = perf_counter() - started
+        if elapsed >= min_time or number >= 1 << 20:
+            return number
+        number *= 2 if elapsed <= 0 else max(
+            2, min(10, int(min_time / elapsed) + 1)
+        )
+
+
+def run_benchmarks(
+    names=None,
+    corpus_size=100,
+    rows=1000,
+    repeat=5,
+    min_time=0.05,
+    seed=0,
+    **settings
+):
+    """ Run the selected benchmarks.
+
+    Extra keyword arguments are passed to the CorpusGenerator. Returns a
+    dict mapping each benchmark name to its kind, loop count and the best,
+    median and mean seconds per call across the repeats.
+    """
+    corpus = Corpus(size=corpus_size, rows=rows, seed=seed, **settings)
+    results = {}
+    try:
+        for name, (kind, setup) in BENCHMARKS.items():
+            if names and name not in names:
+                continue
+            function = setup(corpus)
+            function()
+            number = _time(function, min_time)
+            timings = []
+            for _ in range(repeat):
+                started = perf_counter()
+                for _ in range(number):
+                    function()
+                timings.append((perf_counter() - started) / number)
+            results[name] = {
+                'kind': kind,
+                'number': number,
+                'best': min(timings),
+                'median': statistics.median(timings),
+                'mean': statistics.mean(timings)
+            }
+    finally:
+        corpus.close()
+    return results
+
+
+def compare(results, baseline, threshold=0.10, statistic='median'):
+    """ Compare benchmark results against a stored baseline.
+
+    Returns a list of (name, baseline_seconds, current_seconds, ratio)
+    tuples for every benchmark that is slower than the baseline by more
+    than the threshold fraction.
+    """
+    regressions = []
+    for name, result in results.items():
+        reference = baseline.get('results', {}).get(name)
+        if not reference or not reference.get(statistic):
+            continue
+        ratio = result[statistic] / reference[statistic]
+        if ratio > 1.0 + threshold:
+            regressions.append(
+                (name, reference[statistic], result[statistic], ratio)
+            )
+    return regressions
+
+
+def _format_seconds(seconds):
+    """ Format a per call duration with a readable unit. """
+    for unit, scale in (('s', 1.0), ('ms', 1e-3), ('us', 1e-6)):
+        if seconds >= scale:
+            return "{:.3f} {}".format(seconds / scale, unit)
+    return "{:.1f} ns".format(seconds / 1e-9)
+
+
+def main(argv=None):
+    """ Benchmark suite command line entry point. """
+    parser = argparse.ArgumentParser(
+        prog='python -m benchmarks',
+        description="Run the JinjaUtils benchmark suite."
+    )
+    parser.add_argument('names', nargs='*', help="benchmarks to run")
+    parser.add_argument('--list', action='store_true')
+    parser.add_argument('--corpus-size', type=int, default=100)
+    parser.add_argument('--rows', type=int, default=1000)
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--min-time', type=float, default=0.05)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--depth', type=int, default=2)
+    parser.add_argument('--fanout', type=int, default=3)
+    parser.add_argument('--inheritance', type=int, default=2)
+    parser.add_argument('--includes', type=int, default=2)
+    parser.add_argument('--loop-size', type=int, default=10)
+    parser.add_argument('--output-size', type=int, default=1024)
+    parser.add_argument('--save-baseline', metavar='PATH')
+    parser.add_argument('--compare', metavar='PATH')
+    parser.add_argument('--threshold', type=float, default=0.10)
+    args = parser.parse_args(argv)
+
+    if args.list:
+        for name, (kind, setup) in BENCHMARKS.items():
+            print("{:<20} {}".format(name, kind))
+        return 0
+
+    unknown = set(args.names) - set(BENCHMARKS)
+    if unknown:
+        parser.error("unknown benchmarks: {}".format(", ".join(unknown)))
+
+    settings = {
+        'depth': args.depth,
+        'fanout': args.fanout,
+        'inheritance': args.inheritance,
+        'includes': args.includes,
+        'loop_size': args.loop_size,
+        'output_size': args.output_size
+    }
+    results = run_benchmarks(
+        names=args.names,
+        corpus_size=args.corpus_size,
+        rows=args.rows,
+        repeat=args.repeat,
+        min_time=args.min_time,
+        seed=args.seed,
+        **settings
+    )
+    fingerprint = CorpusGenerator(
+        seed=args.seed, files=args.corpus_size, **settings
+    ).fingerprint()
+    for name, result in results.items():
+        print("{:<20} {:<6} median {:>12}  best {:>12}  ({} loops)".format(
+            name,
+            result['kind'],
+            _format_seconds(result['median']),
+            _format_seconds(result['best']),
+            result['number']
+        ))
+
+    if args.save_baseline:
+        with open(args.save_baseline, "w") as baseline_file:
+            json.dump({
+                'python': platform.python_version(),
+                'platform': platform.platform(),
+                'settings': dict(
+                    settings,
+                    corpus_size=args.corpus_size,
+                    rows=args.rows,
+                    seed=args.seed
+                ),
+                'fingerprint': fingerprint,
+                'results': results
+            }, baseline_file, indent=2, sort_keys=True)
+        print("Baseline saved to: {}".format(args.save_baseline))
+
+    if args.compare:
+        with open(args.compare) as baseline_file:
+            baseline = json.load(baseline_file)
+        if baseline.get('fingerprint') not in (None, fingerprint):
+            print(
+                "WARNING baseline was recorded against a different corpus",
+                file=sys.stderr
+            )
+        regressions = compare(results, baseline, args.threshold)
+        for name, reference, current, ratio in regressions:
+            print("REGRESSION {:<20} {} -> {} ({:+.1f}%)".format(
+                name,
+                _format_seconds(reference),
+                _format_seconds(current),
+                (ratio - 1.0) * 100.0
+            ), file=sys.stderr)
+        if regressions:
+            return 1
+        print("No regressions above {:.0%} threshold.".format(args.threshold))
+    return 0
@@ -1,2 +1,33 @@
-from .jinja import JinjaUtils
+# Public names are imported from their modules on first access, so importing
+# the package stays cheap until a class is actually used.
+import importlib
+
+_EXPORTS = {
+    'JinjaUtils': 'jinja',
+    'TemplateArchive': 'archive',
+    'OutputBackend': 'backends',
+    'LocalBackend': 'backends',
+    'MemoryBackend': 'backends',
+    'CallbackBackend': 'backends',
+    'StreamBackend': 'backends',
+    'ContentAddressedBackend': 'backends',
+    'ColumnarTable': 'columnar',
+    'LazyValue': 'lazy',
+}
+__all__ = list(_EXPORTS)
 name = 'jinjautils'
+
+
+def __getattr__(attribute):
+    module = _EXPORTS.get(attribute)
+    if module is None:
+        raise AttributeError(
+            "module {!r} has no attribute {!r}".format(__name__, attribute)
+        )
+    value = getattr(importlib.import_module("." + module, __name__), attribute)
+    globals()[attribute] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
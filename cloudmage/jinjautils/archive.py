@@ -0,0 +1,286 @@
+##############################################################################
+# CloudMage : Jinja Template Archive Output Target
+# ============================================================================
+# CloudMage Jinja Helper Object Utility/Library
+#   - Write rendered Jinja templates directly into tar or zip archives.
+# Author: Richard Nason rnason@cloudmage.io
+# Project Start: 2/13/2020
+# License: GNU GPLv3
+##############################################################################
+
+###############
+# Imports:    #
+###############
+# Import Base Python Modules
+import tarfile
+import zipfile
+import time
+import sys
+import io
+
+
+# Archive compression formats mapped to their tarfile mode suffix and
+# zipfile compression constant.
+ARCHIVE_COMPRESSION = {
+    None: ('', zipfile.ZIP_STORED),
+    'gzip': ('gz', zipfile.ZIP_DEFLATED),
+    'bz2': ('bz2', zipfile.ZIP_BZIP2),
+    'lzma': ('xz', zipfile.ZIP_LZMA),
+}
+
+# Archive file extentions used to infer the format and compression when
+# they are not explicitly provided.
+ARCHIVE_EXTENTIONS = (
+    ('.tar.gz', 'tar', 'gzip'),
+    ('.tgz', 'tar', 'gzip'),
+    ('.tar.bz2', 'tar', 'bz2'),
+    ('.tbz2', 'tar', 'bz2'),
+    ('.tar.xz', 'tar', 'lzma'),
+    ('.txz', 'tar', 'lzma'),
+    ('.tar', 'tar', None),
+    ('.zip', 'zip', None),
+)
+
+
+#####################
+# Class Definition: #
+#####################
+class TemplateArchive(object):
+    """ CloudMage Jinja Template Archive Class
+
+    This class is a context manager that writes rendered or streamed template
+    output directly into a tar or zip archive as archive members, without
+    writing any intermediate files to disk. Instances are normally created
+    by the JinjaUtils archive method.
+    """
+
+    def __init__(
+        self,
+        jinja_utils,
+        archive_path,
+        archive_format=None,
+        compression=None
+    ):
+        """ TemplateArchive Class Constructor
+
+        Parameters:
+            jinja_utils    (obj): required
+            archive_path   (str): required
+            archive_format (str): optional [default=None]
+            compression    (str): optional [default=None]
+
+        Attributes:
+            self._jinja_utils    (obj)  : private
+            self._archive_path   (str)  : private
+            self._archive_format (str)  : private
+            self._compression    (str)  : private
+            self._archive        (obj)  : private
+            self._members        (int)  : private
+            self._bytes_written  (int)  : private
+
+        Raises:
+            ValueError if the archive format or compression is not supported.
+        """
+        # Infer the archive format and compression from the path extention.
+        if archive_format is None:
+            for extention, extention_format, extention_compression in (
+                ARCHIVE_EXTENTIONS
+            ):
+                if archive_path.lower().endswith(extention):
+                    archive_format = extention_format
+                    if compression is None:
+                        compression = extention_compression
+                    break
+        if archive_format not in ('tar', 'zip'):
+            raise ValueError(
+                "Archive format expected tar or zip but received: {}".format(
+                    archive_format
+                )
+            )
+        if compression not in ARCHIVE_COMPRESSION:
+            raise ValueError(
+                "Compression expected one of {} but received: {}".format(
+                    [c for c in ARCHIVE_COMPRESSION if c is not None],
+                    compression
+                )
+            )
+
+        self._jinja_utils = jinja_utils
+        self._archive_path = archive_path
+        self._archive_format = archive_format
+        self._compression = compression
+        self._archive = None
+        self._members = 0
+        self._bytes_written = 0
+
+    def __enter__(self):
+        """ Open the archive for writing. """
+        self.open()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        """ Close the archive, finalizing its contents. """
+        self.close()
+        return False
+
+    @property
+    def stats(self):
+        """ Archive Stats Property Getter
+
+        Returns a dict containing the number of members and the total
+        uncompressed bytes written to the archive.
+        """
+        return {
+            'archive': self._archive_path,
+            'members': self._members,
+            'bytes_written': self._bytes_written
+        }
+
+    def open(self):
+        """ Open Archive Method
+
+        Open the archive file for writing. Called automatically when the
+        archive is used as a context manager.
+        """
+        if self._archive is not None:
+            return
+        if self._archive_format == 'tar':
+            self._archive = tarfile.open(
+                self._archive_path,
+                "w:{}".format(ARCHIVE_COMPRESSION[self._compression][0])
+            )
+        else:
+            self._archive = zipfile.ZipFile(
+                self._archive_path,
+                "w",
+                compression=ARCHIVE_COMPRESSION[self._compression][1]
+            )
+
+    def close(self):
+        """ Close Archive Method
+
+        Close the archive file, writing out any archive trailer.
+        """
+        if self._archive is not None:
+            self._archive.close()
+            self._archive = None
+
+    def add(self, member_name, content=None):
+        """ Add Archive Member Method
+
+        Add an archive member containing the provided content. Content can
+        be a str, bytes, or a stream of str/bytes chunks. If no content is
+        provided, the template output currently rendered or streamed by the
+        owning JinjaUtils instance is used.
+
+        Parameters:
+            member_name (str):  required
+            content     (obj):  optional [default=None]
+
+        Returns:
+            True if the member was added, False otherwise.
+        """
+        # Define this methods identity for functional logging:
+        __id = sys._getframe().f_code.co_name
+        jinja_utils = self._jinja_utils
+        try:
+            if not isinstance(member_name, str) or not member_name:
+                jinja_utils.log(
+                    "Archive member expected str name but received: {}".format(
+                        type(member_name)
+                    ),
+                    'error',
+                    __id
+                )
+                return False
+            if self._archive is None:
+                jinja_utils.log(
+                    "Archive is not open, unable to add: {}".format(
+                        member_name
+                    ),
+                    'error',
+                    __id
+                )
+                return False
+
+            # Fall back to the rendered output of the JinjaUtils instance.
+            if content is None:
+                if jinja_utils._rendered_stream is not None:
+                    content = jinja_utils._rendered_stream
+                    jinja_utils._rendered_stream = None
+                elif jinja_utils._rendered_template is not None:
+                    content = jinja_utils._rendered_text()
+                else:
+                    jinja_utils.log(
+                        "No rendered template available for archive member!",
+                        'warning',
+                        __id
+                    )
+                    return False
+
+            if self._archive_format == 'tar':
+                written = self._add_tar_member(member_name, content)
+            else:
+                written = self._add_zip_member(member_name, content)
+            self._members += 1
+            self._bytes_written += written
+            jinja_utils.log(
+                "{} added to archive: {}".format(
+                    member_name,
+                    self._archive_path
+                ),
+                'info',
+                __id
+            )
+            return True
+        except Exception as e:
+            jinja_utils._exception_handler(__id, e)
+            return False
+
+    def _add_tar_member(self, member_name, content):
+        """ Add a member to a tar archive.
+
+        Tar headers require the member size up front, so streamed content is
+        collected into an in memory buffer before the member is added.
+        """
+        if isinstance(content, str):
+            content = content.encode('utf-8')
+        if isinstance(content, (bytes, bytearray, memoryview)):
+            buffer = io.BytesIO(content)
+        else:
+            buffer = io.BytesIO()
+            for chunk in content:
+                if isinstance(chunk, str):
+                    chunk = chunk.encode('utf-8')
+                buffer.write(chunk)
+        size = len(buffer.getbuffer())
+        buffer.seek(0)
+        member = tarfile.TarInfo(name=member_name)
+        member.size = size
+        member.mtime = int(time.time())
+        member.mode = 0o644
+        self._archive.addfile(member, buffer)
+        return size
+
+    def _add_zip_member(self, member_name, content):
+        """ Add a member to a zip archive.
+
+        Zip members are written directly from the content, streaming each
+        chunk into the archive as it is produced.
+        """
+        if isinstance(content, str):
+            content = content.encode('utf-8')
+        if isinstance(content, (bytes, bytearray, memoryview)):
+            self._archive.writestr(member_name, content)
+            return len(content)
+        written = 0
+        with self._archive.open(
+            member_name,
+            "w",
+            force_zip64=True
+        ) as member:
+            for chunk in content:
+                if isinstance(chunk, str):
+                    chunk = chunk.encode('utf-8')
+                written += member.write(chunk)
+        return written
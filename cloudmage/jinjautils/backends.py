@@ -0,0 +1,526 @@
+##############################################################################
+# CloudMage : Jinja Template Output Backends
+# ============================================================================
+# CloudMage Jinja Helper Object Utility/Library
+#   - Output backends used by JinjaUtils to write rendered templates.
+# Author: Richard Nason rnason@cloudmage.io
+# Project Start: 2/13/2020
+# License: GNU GPLv3
+##############################################################################
+
+###############
+# Imports:    #
+###############
+# Import Base Python Modules
+# shutil, tempfile and hashlib are only needed for backups and the content
+# addressed store, and are imported when first used.
+from abc import ABC, abstractmethod
+import threading
+import io
+import os
+
+
+#####################
+# Class Definition: #
+#####################
+class OutputBackend(ABC):
+    """ CloudMage Jinja Output Backend Base Class
+
+    Abstract base class describing the file operations JinjaUtils needs to
+    write rendered templates. Backends implement directory checks, directory
+    creation, backup copies, reading existing outputs and opening a binary
+    output stream for a path. A backend missing any of these methods raises
+    TypeError when it is created. Backends that can move an output into
+    place also implement temporary_path, replace and remove, so streamed
+    outputs that fail part way never leave a truncated output behind.
+    """
+
+    @abstractmethod
+    def isdir(self, path):
+        """ Return True if the path is an existing output directory. """
+
+    @abstractmethod
+    def exists(self, path):
+        """ Return True if an output already exists at the path. """
+
+    @abstractmethod
+    def listdir(self, path):
+        """ Return the names of the entries in the output directory.
+
+        Raises FileNotFoundError if the directory does not exist, and
+        NotADirectoryError if the path is not a directory.
+        """
+
+    @abstractmethod
+    def makedirs(self, path):
+        """ Create the output directory and any missing parents. """
+
+    @abstractmethod
+    def copy(self, source, destination):
+        """ Copy an existing output, used to take file backups. """
+
+    @abstractmethod
+    def open(self, path):
+        """ Open and return a writable binary stream for the path. """
+
+    @abstractmethod
+    def read(self, path):
+        """ Return the bytes of an existing output, used to skip writing
+        unchanged outputs.
+        """
+
+    def temporary_path(self, path):
+        """ Return the path a streamed output is written to before replace
+        moves it to path, or None to write streamed outputs in place.
+        """
+        return None
+
+    def replace(self, source, destination):
+        """ Move a completed streamed output from its temporary path. """
+        raise NotImplementedError
+
+    def remove(self, path):
+        """ Remove the temporary output of a failed streamed write. """
+        raise NotImplementedError
+
+
+def _temporary_path(path):
+    """ Return a temporary path next to path, unique to this thread. """
+    return "{}.{}.{}.tmp".format(path, os.getpid(), threading.get_ident())
+
+
+class LocalBackend(OutputBackend):
+    """ CloudMage Jinja Local Filesystem Output Backend
+
+    Default output backend that writes to the local filesystem.
+    """
+
+    def isdir(self, path):
+        return os.path.isdir(path)
+
+    def exists(self, path):
+        return os.path.exists(path)
+
+    def listdir(self, path):
+        return os.listdir(path)
+
+    def makedirs(self, path):
+        os.makedirs(path, exist_ok=True)
+
+    def copy(self, source, destination):
+        import shutil
+        shutil.copy(source, destination)
+
+    def open(self, path):
+        return open(path, "wb")
+
+    def read(self, path):
+        with open(path, "rb") as existing:
+            return existing.read()
+
+    def temporary_path(self, path):
+        return _temporary_path(path)
+
+    def replace(self, source, destination):
+        os.replace(source, destination)
+
+    def remove(self, path):
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
+
+
+class _MemoryFile(io.BytesIO):
+    """ Writable in memory file that stores its value in the backend on close.
+    """
+
+    def __init__(self, backend, path):
+        super().__init__()
+        self._backend = backend
+        self._path = path
+
+    def close(self):
+        if not self.closed:
+            self._backend._files[self._path] = self.getvalue()
+        super().close()
+
+
+class MemoryBackend(OutputBackend):
+    """ CloudMage Jinja In Memory Output Backend
+
+    Output backend that stores every written output in a dict keyed by the
+    normalized output path. Useful for tests and previews where the output
+    never needs to touch the disk.
+    """
+
+    def __init__(self):
+        """ MemoryBackend Class Constructor
+
+        Attributes:
+            self._files       (dict) : private
+            self._directories (set)  : private
+        """
+        self._files = {}
+        self._directories = {os.path.normpath(os.sep), os.curdir}
+
+    @property
+    def files(self):
+        """ Return a copy of the stored outputs, keyed by output path. """
+        return dict(self._files)
+
+    def read(self, path):
+        """ Return the stored bytes of the output written to path. """
+        return self._files[os.path.normpath(path)]
+
+    @staticmethod
+    def _prefix(path):
+        """ Return the key prefix shared by all entries within path. """
+        if path == os.curdir:
+            return ""
+        return path.rstrip(os.sep) + os.sep
+
+    def isdir(self, path):
+        path = os.path.normpath(path)
+        if path in self._directories:
+            return True
+        prefix = self._prefix(path)
+        return any(name.startswith(prefix) for name in self._files)
+
+    def exists(self, path):
+        path = os.path.normpath(path)
+        return path in self._files or self.isdir(path)
+
+    def listdir(self, path):
+        path = os.path.normpath(path)
+        if path in self._files:
+            raise NotADirectoryError(path)
+        if not self.isdir(path):
+            raise FileNotFoundError(path)
+        prefix = self._prefix(path)
+        names = set()
+        for name in list(self._files) + list(self._directories):
+            if name != path and name.startswith(prefix):
+                names.add(name[len(prefix):].split(os.sep, 1)[0])
+        return sorted(names)
+
+    def makedirs(self, path):
+        path = os.path.normpath(path)
+        if path in self._files:
+            raise FileExistsError(path)
+        while path not in self._directories:
+            self._directories.add(path)
+            path = os.path.dirname(path) or os.curdir
+
+    def copy(self, source, destination):
+        self._files[os.path.normpath(destination)] = \
+            self._files[os.path.normpath(source)]
+
+    def open(self, path):
+        return _MemoryFile(self, os.path.normpath(path))
+
+    def temporary_path(self, path):
+        return _temporary_path(path)
+
+    def replace(self, source, destination):
+        self._files[os.path.normpath(destination)] = \
+            self._files.pop(os.path.normpath(source))
+
+    def remove(self, path):
+        self._files.pop(os.path.normpath(path), None)
+
+
+class _CallbackFile(io.BytesIO):
+    """ Writable in memory file that passes its value to a callback on close.
+    """
+
+    def __init__(self, callback, path):
+        super().__init__()
+        self._callback = callback
+        self._path = path
+
+    def close(self):
+        if not self.closed:
+            self._callback(self._path, self.getvalue())
+        super().close()
+
+
+class CallbackBackend(OutputBackend):
+    """ CloudMage Jinja Callback Output Backend
+
+    Output backend that hands each completed output to a callback as
+    callback(path, data) where data is the output bytes. Every directory is
+    treated as valid and no outputs are considered to exist, so backups are
+    never taken.
+    """
+
+    def __init__(self, callback):
+        """ CallbackBackend Class Constructor
+
+        Parameters:
+            callback (callable): required
+        """
+        if not callable(callback):
+            raise TypeError(
+                "Callback expected callable but received: {}".format(
+                    type(callback)
+                )
+            )
+        self._callback = callback
+
+    def isdir(self, path):
+        return True
+
+    def exists(self, path):
+        return False
+
+    def listdir(self, path):
+        return []
+
+    def makedirs(self, path):
+        pass
+
+    def copy(self, source, destination):
+        pass
+
+    def open(self, path):
+        return _CallbackFile(self._callback, path)
+
+    def read(self, path):
+        raise FileNotFoundError(path)
+
+
+class _StreamFile(io.RawIOBase):
+    """ Writable file that forwards every write to a shared stream. """
+
+    def __init__(self, stream):
+        super().__init__()
+        self._stream = stream
+
+    def writable(self):
+        return True
+
+    def write(self, data):
+        self._stream.write(data)
+        return len(data)
+
+    def close(self):
+        if not self.closed:
+            self._stream.flush()
+        super().close()
+
+
+class StreamBackend(CallbackBackend):
+    """ CloudMage Jinja Stream Output Backend
+
+    Output backend that writes every output, chunk by chunk as it is
+    produced, to a single writable binary stream such as sys.stdout.buffer
+    or a socket file.
+    """
+
+    def __init__(self, stream):
+        """ StreamBackend Class Constructor
+
+        Parameters:
+            stream (obj): required
+        """
+        if not hasattr(stream, 'write'):
+            raise TypeError(
+                "Stream expected writable object but received: {}".format(
+                    type(stream)
+                )
+            )
+        self._stream = stream
+
+    def open(self, path):
+        return _StreamFile(self._stream)
+
+
+class _ContentAddressedFile(io.RawIOBase):
+    """ Writable file that hashes its content and stores it as a blob on close.
+
+    Content is buffered in memory until it exceeds the spool size, after
+    which it is spilled to a temporary file within the store directory.
+    """
+
+    def __init__(self, backend, path):
+        import hashlib
+        super().__init__()
+        self._backend = backend
+        self._path = path
+        self._hash = hashlib.new(backend._algorithm)
+        self._buffer = bytearray()
+        self._spill = None
+        self._size = 0
+
+    def writable(self):
+        return True
+
+    def write(self, data):
+        self._hash.update(data)
+        self._size += len(data)
+        if self._spill is None:
+            self._buffer += data
+            if len(self._buffer) > self._backend._spool_size:
+                import tempfile
+                descriptor, spill_path = tempfile.mkstemp(
+                    dir=self._backend._store_directory
+                )
+                self._spill = (os.fdopen(descriptor, "wb"), spill_path)
+                self._spill[0].write(self._buffer)
+                self._buffer = bytearray()
+        else:
+            self._spill[0].write(data)
+        return len(data)
+
+    def close(self):
+        if self.closed:
+            return
+        try:
+            if self._spill is not None:
+                self._spill[0].close()
+            self._backend._store(
+                self._path,
+                self._hash.hexdigest(),
+                self._size,
+                self._buffer,
+                self._spill[1] if self._spill is not None else None
+            )
+        finally:
+            super().close()
+
+
+class ContentAddressedBackend(LocalBackend):
+    """ CloudMage Jinja Content Addressed Output Backend
+
+    Local filesystem output backend that stores each distinct output once in
+    a content addressed store, keyed by the hash of its content. Output paths
+    are hard linked (or symlinked) to the stored blob, so byte identical
+    outputs share a single copy on disk. Blobs are made read only, and
+    outputs are always replaced by a new link rather than written in place,
+    so a stored blob is never modified.
+    """
+
+    def __init__(
+        self,
+        store_directory,
+        link='hardlink',
+        algorithm='sha256',
+        spool_size=8 * 1024 * 1024
+    ):
+        """ ContentAddressedBackend Class Constructor
+
+        Parameters:
+            store_directory (str): required
+            link            (str): optional [default='hardlink']
+            algorithm       (str): optional [default='sha256']
+            spool_size      (int): optional [default=8MiB]
+
+        Attributes:
+            self._store_directory (str)  : private
+            self._link            (str)  : private
+            self._algorithm       (str)  : private
+            self._spool_size      (int)  : private
+            self._stats           (dict) : private
+            self._lock            (obj)  : private
+        """
+        if link not in ('hardlink', 'symlink'):
+            raise ValueError(
+                "Link expected hardlink or symlink but received: {}".format(
+                    link
+                )
+            )
+        import hashlib
+        hashlib.new(algorithm)
+        self._store_directory = os.path.abspath(store_directory)
+        self._link = link
+        self._algorithm = algorithm
+        self._spool_size = spool_size
+        self._stats = {
+            'outputs': 0,
+            'hits': 0,
+            'misses': 0,
+            'bytes_stored': 0,
+            'bytes_deduplicated': 0,
+            'copy_fallbacks': 0
+        }
+        self._lock = threading.Lock()
+        os.makedirs(self._store_directory, exist_ok=True)
+
+    @property
+    def stats(self):
+        """ Return a copy of the deduplication stats. """
+        with self._lock:
+            return dict(self._stats)
+
+    def blob_path(self, digest):
+        """ Return the store path of the blob with the given digest. """
+        return os.path.join(self._store_directory, digest[:2], digest[2:])
+
+    def copy(self, source, destination):
+        # Backups share the stored blob rather than copying its content.
+        import shutil
+        if self._link == 'symlink' and os.path.islink(source):
+            os.symlink(os.readlink(source), destination)
+        else:
+            try:
+                os.link(source, destination)
+            except OSError:
+                shutil.copy(source, destination)
+
+    def open(self, path):
+        return _ContentAddressedFile(self, path)
+
+    def _store(self, path, digest, size, buffer, spill_path):
+        """ Store a completed output as a blob and link the output path. """
+        import tempfile
+        import shutil
+        blob = self.blob_path(digest)
+        if os.path.exists(blob):
+            hit = True
+            if spill_path is not None:
+                os.remove(spill_path)
+        else:
+            hit = False
+            os.makedirs(os.path.dirname(blob), exist_ok=True)
+            if spill_path is None:
+                descriptor, spill_path = tempfile.mkstemp(
+                    dir=self._store_directory
+                )
+                with os.fdopen(descriptor, "wb") as spill:
+                    spill.write(buffer)
+            os.chmod(spill_path, 0o444)
+            # Linking fails if a concurrent write stored the same content
+            # first, which is counted as a hit like any existing blob.
+            try:
+                os.link(spill_path, blob)
+            except FileExistsError:
+                hit = True
+            except OSError:
+                os.replace(spill_path, blob)
+                spill_path = None
+            if spill_path is not None:
+                os.remove(spill_path)
+
+        # Link the output path to the blob, replacing any existing output.
+        link_path = _temporary_path(path)
+        fallback = False
+        if self._link == 'symlink':
+            os.symlink(blob, link_path)
+        else:
+            try:
+                os.link(blob, link_path)
+            except OSError:
+                shutil.copyfile(blob, link_path)
+                fallback = True
+        os.replace(link_path, path)
+
+        with self._lock:
+            self._stats['outputs'] += 1
+            if hit:
+                self._stats['hits'] += 1
+                self._stats['bytes_deduplicated'] += size
+            else:
+                self._stats['misses'] += 1
+                self._stats['bytes_stored'] += size
+            self._stats['copy_fallbacks'] += int(fallback)
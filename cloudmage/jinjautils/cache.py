@@ -0,0 +1,152 @@
+##############################################################################
+# CloudMage : JinjaUtils Compiled Template Cache
+# ============================================================================
+# CloudMage Jinja Helper Object Utility/Library
+#   - Keep templates compiled from strings, evicting the least recently
+#     used templates once their estimated memory size exceeds a limit.
+# Author: Richard Nason rnason@cloudmage.io
+# Project Start: 2/13/2020
+# License: GNU GPLv3
+##############################################################################
+
+###############
+# Imports:    #
+###############
+# Import Base Python Modules
+# hashlib is only needed to load string templates, and is imported when
+# first used.
+from collections import OrderedDict
+
+
+# Default memory limit of the compiled string template cache, in bytes.
+STRING_CACHE_BYTES = 64 * 1024 * 1024
+
+# Estimated memory size of a compiled template, measured with tracemalloc:
+# a fixed cost for the template object, module and render functions, plus
+# a cost per source character that is highest for tag dense sources.
+TEMPLATE_OVERHEAD = 16 * 1024
+TEMPLATE_BYTES_PER_CHARACTER = 32
+
+
+def source_digest(source):
+    """ Return the digest of a template source used in cache keys. """
+    import hashlib
+    return hashlib.blake2b(
+        source.encode('utf-8', 'surrogatepass'),
+        digest_size=16
+    ).digest()
+
+
+def template_size(source):
+    """ Return the estimated memory size of a template compiled from
+    source, in bytes.
+    """
+    return TEMPLATE_OVERHEAD + TEMPLATE_BYTES_PER_CHARACTER * len(source)
+
+
+#####################
+# Class Definition: #
+#####################
+class TemplateCache(object):
+    """ CloudMage Compiled Template Cache Class
+
+    Least recently used cache of compiled templates, bounded by the sum of
+    the estimated memory size of the cached templates instead of a number
+    of templates, so a few large templates can't hold as much memory as
+    many small ones. Templates larger than the limit are not cached, and a
+    limit of 0 disables the cache.
+    """
+
+    def __init__(self, max_bytes=STRING_CACHE_BYTES):
+        """ TemplateCache Class Constructor
+
+        Parameters:
+            max_bytes (int): optional [default=STRING_CACHE_BYTES]
+
+        Attributes:
+            self._templates (OrderedDict) : private
+            self._max_bytes (int)         : private
+            self._bytes     (int)         : private
+            self._hits      (int)         : private
+            self._misses    (int)         : private
+            self._evictions (int)         : private
+        """
+        self._templates = OrderedDict()
+        self._max_bytes = max_bytes
+        self._bytes = 0
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+
+    @property
+    def max_bytes(self):
+        """ Return the memory limit of the cache, in bytes. """
+        return self._max_bytes
+
+    @max_bytes.setter
+    def max_bytes(self, max_bytes):
+        """ Set the memory limit of the cache, evicting templates until the
+        cached templates fit.
+        """
+        self._max_bytes = max_bytes
+        self._evict(0)
+
+    def get(self, key):
+        """ Return the template cached for key, or None. """
+        entry = self._templates.get(key)
+        if entry is None:
+            self._misses += 1
+            return None
+        self._templates.move_to_end(key)
+        self._hits += 1
+        return entry[0]
+
+    def put(self, key, template, size):
+        """ Cache a template of the estimated memory size, evicting the least
+        recently used templates to make room. Returns True if the template
+        was cached.
+        """
+        self.discard(key)
+        if size > self._max_bytes:
+            return False
+        self._evict(size)
+        self._templates[key] = (template, size)
+        self._bytes += size
+        return True
+
+    def discard(self, key):
+        """ Remove the template cached for key, if any. """
+        entry = self._templates.pop(key, None)
+        if entry is not None:
+            self._bytes -= entry[1]
+
+    def clear(self):
+        """ Remove every cached template. """
+        self._templates.clear()
+        self._bytes = 0
+
+    def stats(self):
+        """ Return the cache size, limit and hit, miss and eviction counts. """
+        return {
+            'templates': len(self._templates),
+            'bytes': self._bytes,
+            'max_bytes': self._max_bytes,
+            'hits': self._hits,
+            'misses': self._misses,
+            'evictions': self._evictions
+        }
+
+    def _evict(self, size):
+        """ Evict the least recently used templates until size more bytes
+        fit in the limit.
+        """
+        while self._templates and self._bytes + size > self._max_bytes:
+            _, (_, evicted) = self._templates.popitem(last=False)
+            self._bytes -= evicted
+            self._evictions += 1
+
+    def __len__(self):
+        return len(self._templates)
+
+    def __contains__(self, key):
+        return key in self._templates
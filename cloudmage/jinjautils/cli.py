@@ -0,0 +1,485 @@
+##############################################################################
+# CloudMage : JinjaUtils Command Line Interface
+# ============================================================================
+# CloudMage Jinja Helper Object Utility/Library
+#   - Render a manifest of templates, contexts and outputs in parallel.
+# Author: Richard Nason rnason@cloudmage.io
+# Project Start: 2/13/2020
+# License: GNU GPLv3
+##############################################################################
+
+###############
+# Imports:    #
+###############
+# Import Base Python Modules
+# JinjaUtils and the manifest parsers are imported when first used so the
+# command starts quickly.
+from time import perf_counter
+import argparse
+import sys
+import os
+
+
+# Manifest and context file parsers by file extension.
+MANIFEST_FORMATS = {
+    '.json': 'json',
+    '.yaml': 'yaml',
+    '.yml': 'yaml',
+    '.toml': 'toml',
+}
+
+# Render jobs handed to a worker in a single call.
+MAX_CHUNK_SIZE = 64
+
+# Minimum number of jobs per worker process, small manifests are rendered
+# by fewer processes to avoid paying their startup cost.
+MIN_JOBS_PER_WORKER = 8
+
+
+class ManifestError(ValueError):
+    """ Raised when a manifest or context file is missing or invalid. """
+
+
+def load_data_file(path):
+    """ Load Data File Function
+
+    Load a JSON, YAML or TOML file selected by its file extension. YAML
+    requires the PyYAML package to be installed.
+
+    Parameters:
+        path (str): required
+
+    Returns:
+        The parsed file content.
+    """
+    data_format = MANIFEST_FORMATS.get(os.path.splitext(path)[1].lower())
+    if data_format is None:
+        raise ManifestError(
+            "{} expected a .json, .yaml, .yml or .toml file.".format(path)
+        )
+    try:
+        if data_format == 'json':
+            import json
+            with open(path, encoding='utf-8') as data_file:
+                return json.load(data_file)
+        if data_format == 'yaml':
+            try:
+                import yaml
+            except ImportError:
+                raise ManifestError(
+                    "{} requires PyYAML: pip install pyyaml".format(path)
+                )
+            with open(path, encoding='utf-8') as data_file:
+                return yaml.safe_load(data_file)
+        try:
+            import tomllib
+        except ImportError:
+            raise ManifestError(
+                "{} requires Python 3.11 or later for TOML.".format(path)
+            )
+        with open(path, 'rb') as data_file:
+            return tomllib.load(data_file)
+    except ManifestError:
+        raise
+    except (OSError, ValueError) as e:
+        raise ManifestError("Failed to load {}: {}".format(path, e))
+    except Exception as e:
+        # Parser specific errors, such as yaml.YAMLError.
+        raise ManifestError("Failed to parse {}: {}".format(path, e))
+
+
+def load_manifest(path):
+    """ Load Manifest Function
+
+    Load and validate a render manifest, resolving relative paths against
+    the manifest directory. A manifest holds an optional template_directory,
+    an optional output_directory, optional defaults (context, context_file,
+    backup, compression) and a list of renders, each with a template, an
+    output and an optional context and context_file.
+
+    Parameters:
+        path (str): required
+
+    Returns:
+        dict with the template_directory, defaults and resolved render jobs.
+    """
+    manifest = load_data_file(path)
+    if not isinstance(manifest, dict):
+        raise ManifestError("{} expected a mapping.".format(path))
+    base = os.path.dirname(os.path.abspath(path))
+
+    def resolve(value, directory=base):
+        return os.path.normpath(os.path.join(directory, value))
+
+    template_directory = manifest.get('template_directory')
+    if template_directory is not None:
+        template_directory = resolve(template_directory)
+        if not os.path.isdir(template_directory):
+            raise ManifestError(
+                "template_directory not found: {}".format(template_directory)
+            )
+    output_directory = resolve(manifest.get('output_directory', '.'))
+
+    defaults = manifest.get('defaults') or {}
+    if not isinstance(defaults, dict):
+        raise ManifestError("defaults expected a mapping.")
+    context_files = []
+    if defaults.get('context_file'):
+        context_files.append(resolve(defaults['context_file']))
+
+    if defaults.get('compression') not in (None, 'gzip', 'bz2', 'lzma'):
+        raise ManifestError(
+            "compression expected gzip, bz2 or lzma but received: {}".format(
+                defaults['compression']
+            )
+        )
+
+    renders = manifest.get('renders')
+    if not isinstance(renders, list):
+        raise ManifestError("{} expected a renders list.".format(path))
+    jobs = []
+    for index, render in enumerate(renders):
+        if (
+            not isinstance(render, dict) or
+            not isinstance(render.get('template'), str) or
+            not isinstance(render.get('output'), str)
+        ):
+            raise ManifestError(
+                "renders[{}] expected template and output strings.".format(
+                    index
+                )
+            )
+        context = render.get('context') or {}
+        if not isinstance(context, dict):
+            raise ManifestError(
+                "renders[{}] context expected a mapping.".format(index)
+            )
+        template = render['template']
+        if template_directory is None:
+            template = resolve(template)
+        jobs.append((
+            template,
+            resolve(render['output'], output_directory),
+            tuple(context_files) + (
+                (resolve(render['context_file']),)
+                if render.get('context_file') else ()
+            ),
+            context
+        ))
+    return {
+        'template_directory': template_directory,
+        'context': defaults.get('context') or {},
+        'backup': bool(defaults.get('backup', False)),
+        'compression': defaults.get('compression'),
+        'jobs': jobs
+    }
+
+
+class _Log(object):
+    """ Log object collecting the JinjaUtils error and warning messages. """
+
+    def __init__(self):
+        self.messages = []
+
+    def error(self, message):
+        # Drop the "CLS->JinjaUtils.<method>: -> " message prefix.
+        self.messages.append(message.split(": -> ", 1)[-1])
+
+    warning = error
+
+    def info(self, message):
+        pass
+
+    debug = info
+
+
+# Render state of a worker process, created by _init_worker. Renders in the
+# calling process use their own state from _create_worker instead.
+_WORKER = {}
+
+
+def _create_worker(template_directory, context, options, cache_size=None):
+    """ Create the render state holding the JinjaUtils object, log, default
+    context, options and cached context files of a worker. The template
+    directory Environment keeps cache_size compiled templates, or the Jinja
+    default when it is None.
+    """
+    from .jinja import JinjaUtils
+    log = _Log()
+    jinja = JinjaUtils(log=log)
+    if cache_size is not None:
+        jinja._cache_size = cache_size
+    if template_directory is not None:
+        jinja.template_directory = template_directory
+    return {
+        'jinja': jinja,
+        'log': log,
+        'context': context,
+        'options': options,
+        'context_files': {}
+    }
+
+
+def _init_worker(template_directory, context, options):
+    """ Create the render state of a worker process. """
+    _WORKER.clear()
+    _WORKER.update(_create_worker(template_directory, context, options))
+
+
+def _context(state, context_files, context):
+    """ Merge the default context, context files and inline context. """
+    merged = dict(state['context'])
+    for path in context_files:
+        data = state['context_files'].get(path)
+        if data is None:
+            data = state['context_files'][path] = load_data_file(path)
+            if not isinstance(data, dict):
+                raise ManifestError("{} expected a mapping.".format(path))
+        merged.update(data)
+    merged.update(context)
+    return merged
+
+
+def _render_chunk(jobs, state=None):
+    """ Render Chunk Function
+
+    Render a chunk of jobs with the given render state, or the state of the
+    current worker process, and write the rendered outputs in a single
+    write_many call.
+
+    Returns:
+        (write stats, {output: error}, {output: render seconds}) tuple.
+    """
+    if state is None:
+        state = _WORKER
+    jinja = state['jinja']
+    log = state['log']
+    options = state['options']
+    errors = {}
+    timings = {}
+    items = []
+    for template, output, context_files, context in jobs:
+        started = perf_counter()
+        del log.messages[:]
+        try:
+            jinja.load = template
+            if jinja._loaded_template is None:
+                raise ManifestError(
+                    log.messages[-1] if log.messages else
+                    "Template not found: {}".format(template)
+                )
+            jinja.render(**_context(state, context_files, context))
+            if jinja._rendered_template is None:
+                raise ManifestError(
+                    log.messages[-1] if log.messages else
+                    "Failed to render: {}".format(template)
+                )
+            items.append((output, jinja._rendered_template))
+        except Exception as e:
+            errors[output] = str(e)
+        timings[output] = perf_counter() - started
+    stats = jinja.write_many(
+        items,
+        backup=options['backup'],
+        max_workers=options['io_workers'],
+        compression=options['compression'],
+        skip_unchanged=options['skip_unchanged']
+    ) if items else {}
+    if stats is False:
+        stats = {}
+        errors.update(
+            (output, log.messages[-1] if log.messages else "Write failed.")
+            for output, _ in items
+        )
+    return stats, errors, timings
+
+
+def run_manifest(
+    manifest_path,
+    workers=1,
+    skip_unchanged=True,
+    backup=None,
+    compression=None
+):
+    """ Run Manifest Function
+
+    Render every job of a manifest and return a report dict holding the
+    total, written, unchanged and failed counts, bytes written, wall time,
+    renders per second, per output render timings and errors.
+
+    Parameters:
+        manifest_path  (str):  required
+        workers        (int):  optional [default=1]
+        skip_unchanged (bool): optional [default=True]
+        backup         (bool): optional [default=None]
+        compression    (str):  optional [default=None]
+    """
+    started = perf_counter()
+    manifest = load_manifest(manifest_path)
+    jobs = manifest['jobs']
+    options = {
+        'backup': manifest['backup'] if backup is None else backup,
+        'compression': compression or manifest['compression'],
+        'skip_unchanged': skip_unchanged,
+        'io_workers': 4
+    }
+    initargs = (manifest['template_directory'], manifest['context'], options)
+    workers = max(1, min(workers, -(-len(jobs) // MIN_JOBS_PER_WORKER)))
+    chunk_size = max(1, min(
+        MAX_CHUNK_SIZE,
+        -(-len(jobs) // (workers * 4))
+    ))
+    chunks = [
+        jobs[index:index + chunk_size]
+        for index in range(0, len(jobs), chunk_size)
+    ]
+
+    if workers == 1:
+        state = _create_worker(*initargs)
+        results = [_render_chunk(chunk, state) for chunk in chunks]
+    else:
+        from concurrent.futures import ProcessPoolExecutor
+        with ProcessPoolExecutor(
+            max_workers=workers,
+            initializer=_init_worker,
+            initargs=initargs
+        ) as executor:
+            results = list(executor.map(_render_chunk, chunks))
+
+    return _report(results, len(jobs), workers, started)
+
+
+def _report(results, total, workers, started):
+    """ Combine the _render_chunk results into a run report. """
+    report = {
+        'total': total,
+        'written': 0,
+        'unchanged': 0,
+        'failed': 0,
+        'bytes_written': 0,
+        'workers': workers,
+        'seconds': 0.0,
+        'renders_per_second': 0.0,
+        'timings': {},
+        'errors': {}
+    }
+    for stats, errors, timings in results:
+        report['written'] += stats.get('written', 0)
+        report['unchanged'] += stats.get('unchanged', 0)
+        report['bytes_written'] += stats.get('bytes_written', 0)
+        report['errors'].update(errors)
+        report['errors'].update(stats.get('errors', {}))
+        report['timings'].update(timings)
+    report['failed'] = len(report['errors'])
+    report['seconds'] = perf_counter() - started
+    if report['seconds'] > 0:
+        report['renders_per_second'] = report['total'] / report['seconds']
+    return report
+
+
+def main(argv=None):
+    """ JinjaUtils command line entry point. """
+    parser = argparse.ArgumentParser(
+        prog='jinjautils',
+        description=(
+            "Render the templates, contexts and outputs listed in a JSON, "
+            "YAML or TOML manifest."
+        )
+    )
+    parser.add_argument('manifest', help="path to the render manifest")
+    parser.add_argument(
+        '-j', '--workers', type=int, default=os.cpu_count() or 1,
+        help="number of render worker processes [default: CPU count]"
+    )
+    parser.add_argument(
+        '--force', action='store_true',
+        help="write every output, even if its content is unchanged"
+    )
+    backup = parser.add_mutually_exclusive_group()
+    backup.add_argument(
+        '--backup', dest='backup', action='store_true', default=None,
+        help="back up existing outputs before replacing them"
+    )
+    backup.add_argument(
+        '--no-backup', dest='backup', action='store_false',
+        help="never back up existing outputs"
+    )
+    parser.add_argument(
+        '--compression', choices=('gzip', 'bz2', 'lzma'),
+        help="compress every output"
+    )
+    parser.add_argument(
+        '--json', action='store_true',
+        help="print the full report as JSON"
+    )
+    parser.add_argument(
+        '-q', '--quiet', action='store_true',
+        help="only report failures"
+    )
+    parser.add_argument(
+        '-w', '--watch', action='store_true',
+        help="re-render the affected outputs when templates, context files "
+             "or the manifest change"
+    )
+    parser.add_argument(
+        '--poll', action='store_true',
+        help="watch by polling modification times instead of inotify"
+    )
+    parser.add_argument(
+        '--debounce', type=float, default=0.1,
+        help="seconds without changes that end a burst of changes "
+             "[default: 0.1]"
+    )
+    args = parser.parse_args(argv)
+    if args.workers < 1:
+        parser.error("--workers expected an int > 0")
+
+    def print_report(report):
+        if args.json:
+            import json
+            print(json.dumps(report, indent=2, sort_keys=True))
+            sys.stdout.flush()
+            return
+        for output, error in sorted(report['errors'].items()):
+            print("FAILED {}: {}".format(output, error), file=sys.stderr)
+        if not args.quiet:
+            for path in report.get('changed', ()):
+                print("Changed: {}".format(path))
+            print(
+                "{total} renders: {written} written, {unchanged} unchanged, "
+                "{failed} failed, {bytes_written} bytes in {seconds:.3f}s "
+                "({renders_per_second:.1f} renders/s, {workers} "
+                "workers)".format(**report)
+            )
+            sys.stdout.flush()
+
+    try:
+        if args.watch:
+            from .watch import ManifestWatcher
+            watcher = ManifestWatcher(
+                args.manifest,
+                skip_unchanged=not args.force,
+                backup=args.backup,
+                compression=args.compression,
+                debounce=args.debounce,
+                inotify=False if args.poll else None
+            )
+            try:
+                watcher.run(print_report)
+            except KeyboardInterrupt:
+                return 0
+            finally:
+                watcher.close()
+        report = run_manifest(
+            args.manifest,
+            workers=args.workers,
+            skip_unchanged=not args.force,
+            backup=args.backup,
+            compression=args.compression
+        )
+    except ManifestError as e:
+        print("jinjautils: error: {}".format(e), file=sys.stderr)
+        return 2
+
+    print_report(report)
+    return 1 if report['failed'] else 0
@@ -0,0 +1,266 @@
+##############################################################################
+# CloudMage : JinjaUtils Render Daemon Client
+# ============================================================================
+# CloudMage Jinja Helper Object Utility/Library
+#   - Thin client for the JinjaUtils render daemon Unix socket protocol.
+# Author: Richard Nason rnason@cloudmage.io
+# Project Start: 2/13/2020
+# License: GNU GPLv3
+##############################################################################
+
+###############
+# Imports:    #
+###############
+# Import Base Python Modules
+# Only the socket and framing modules are imported so the client starts
+# without importing Jinja.
+import socket
+import struct
+import json
+import sys
+import os
+
+
+# Frame header: the JSON body length as a 4 byte big endian unsigned int.
+FRAME_HEADER = struct.Struct(">I")
+
+# Largest accepted frame body in bytes.
+MAX_FRAME_SIZE = 64 * 1024 * 1024
+
+# Environment variable holding the default daemon socket path.
+SOCKET_ENV = 'JINJAUTILS_SOCKET'
+
+
+class ProtocolError(Exception):
+    """ Raised when a frame is truncated, oversized or not valid JSON. """
+
+
+def _recv_exact(connection, size):
+    """ Read exactly size bytes, returning b"" if the peer closed first. """
+    chunks = []
+    remaining = size
+    while remaining:
+        chunk = connection.recv(min(remaining, 1024 * 1024))
+        if not chunk:
+            if chunks:
+                raise ProtocolError("Connection closed mid frame.")
+            return b""
+        chunks.append(chunk)
+        remaining -= len(chunk)
+    return b"".join(chunks)
+
+
+def send_frame(connection, message):
+    """ Send a message as a length prefixed UTF-8 JSON frame. """
+    body = json.dumps(message, separators=(',', ':')).encode('utf-8')
+    if len(body) > MAX_FRAME_SIZE:
+        raise ProtocolError(
+            "Frame of {} bytes is too large.".format(len(body))
+        )
+    connection.sendall(FRAME_HEADER.pack(len(body)) + body)
+
+
+def recv_frame(connection, max_size=MAX_FRAME_SIZE):
+    """ Receive a length prefixed JSON frame, returning None at end of
+    stream.
+    """
+    header = _recv_exact(connection, FRAME_HEADER.size)
+    if not header:
+        return None
+    size, = FRAME_HEADER.unpack(header)
+    if size > max_size:
+        raise ProtocolError("Frame of {} bytes is too large.".format(size))
+    body = _recv_exact(connection, size)
+    if len(body) != size:
+        raise ProtocolError("Connection closed mid frame.")
+    try:
+        return json.loads(body.decode('utf-8'))
+    except ValueError as e:
+        raise ProtocolError("Invalid frame: {}".format(e))
+
+
+#####################
+# Class Definition: #
+#####################
+class DaemonClient(object):
+    """ CloudMage Jinja Render Daemon Client Class
+
+    Client for the JinjaUtils render daemon. A single connection is opened
+    on first use and reused for every request until close() is called, and
+    the client can be used as a context manager.
+    """
+
+    def __init__(self, socket_path=None, timeout=None):
+        """ DaemonClient Class Constructor
+
+        Parameters:
+            socket_path (str):   optional [default=$JINJAUTILS_SOCKET]
+            timeout     (float): optional [default=None]
+        """
+        self._socket_path = socket_path or os.environ.get(SOCKET_ENV)
+        if not self._socket_path:
+            raise ValueError(
+                "Socket path expected but none was provided or set in "
+                "{}.".format(SOCKET_ENV)
+            )
+        self._timeout = timeout
+        self._connection = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def close(self):
+        """ Close the daemon connection. """
+        if self._connection is not None:
+            self._connection.close()
+            self._connection = None
+
+    def request(self, message):
+        """ Request Method
+
+        Send a request message to the daemon and return its response dict.
+        Responses hold ok=True on success, or ok=False and an error message.
+        """
+        if self._connection is None:
+            connection = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            connection.settimeout(self._timeout)
+            connection.connect(self._socket_path)
+            self._connection = connection
+        try:
+            send_frame(self._connection, message)
+            response = recv_frame(self._connection)
+        except Exception:
+            self.close()
+            raise
+        if response is None:
+            self.close()
+            raise ProtocolError("Daemon closed the connection.")
+        return response
+
+    def ping(self):
+        """ Return True if the daemon answered. """
+        return self.request({'op': 'ping'}).get('ok', False)
+
+    def stats(self):
+        """ Return the daemon request and render stats. """
+        return self.request({'op': 'stats'})
+
+    def render(self, template, context=None, context_file=None):
+        """ Render a template in the daemon and return its response, holding
+        the rendered output in the rendered key.
+        """
+        return self.request(_render_request(
+            'render', template, context, context_file
+        ))
+
+    def write(
+        self,
+        template,
+        output,
+        context=None,
+        context_file=None,
+        backup=False,
+        compression=None,
+        skip_unchanged=True
+    ):
+        """ Render a template in the daemon and write it to the output path,
+        returning its response holding the written, unchanged and bytes
+        keys.
+        """
+        message = _render_request('write', template, context, context_file)
+        message.update(
+            output=os.path.abspath(output),
+            backup=backup,
+            compression=compression,
+            skip_unchanged=skip_unchanged
+        )
+        return self.request(message)
+
+    def shutdown(self):
+        """ Ask the daemon to stop serving. """
+        return self.request({'op': 'shutdown'})
+
+
+def _render_request(operation, template, context, context_file):
+    """ Build a render or write request, resolving file paths so they can
+    be opened by the daemon from any working directory.
+    """
+    message = {'op': operation, 'template': template}
+    if os.path.isfile(template):
+        message['template'] = os.path.abspath(template)
+    if context is not None:
+        message['context'] = context
+    if context_file is not None:
+        message['context_file'] = os.path.abspath(context_file)
+    return message
+
+
+def main(argv=None):
+    """ Render daemon client command line entry point. """
+    import argparse
+    parser = argparse.ArgumentParser(
+        prog='jinjautils-client',
+        description="Render templates with a running jinjautils-daemon."
+    )
+    parser.add_argument(
+        '-s', '--socket', default=os.environ.get(SOCKET_ENV),
+        help="daemon socket path [default: ${}]".format(SOCKET_ENV)
+    )
+    parser.add_argument(
+        'op', choices=('render', 'ping', 'stats', 'shutdown')
+    )
+    parser.add_argument('template', nargs='?')
+    parser.add_argument('-o', '--output', help="write to this output path")
+    parser.add_argument('-c', '--context', help="JSON encoded context")
+    parser.add_argument('-f', '--context-file', help="JSON/YAML/TOML file")
+    parser.add_argument('--backup', action='store_true')
+    parser.add_argument('--compression', choices=('gzip', 'bz2', 'lzma'))
+    parser.add_argument('--force', action='store_true')
+    args = parser.parse_args(argv)
+    if not args.socket:
+        parser.error("--socket or ${} is required".format(SOCKET_ENV))
+    if args.op == 'render' and not args.template:
+        parser.error("render requires a template")
+
+    try:
+        with DaemonClient(args.socket) as client:
+            if args.op == 'render':
+                context = json.loads(args.context) if args.context else None
+                if args.output:
+                    response = client.write(
+                        args.template,
+                        args.output,
+                        context=context,
+                        context_file=args.context_file,
+                        backup=args.backup,
+                        compression=args.compression,
+                        skip_unchanged=not args.force
+                    )
+                else:
+                    response = client.render(
+                        args.template,
+                        context=context,
+                        context_file=args.context_file
+                    )
+                    if response.get('ok'):
+                        sys.stdout.write(response['rendered'])
+            else:
+                response = client.request({'op': args.op})
+                print(json.dumps(response, indent=2, sort_keys=True))
+    except (OSError, ValueError, ProtocolError) as e:
+        print("jinjautils-client: error: {}".format(e), file=sys.stderr)
+        return 2
+    if not response.get('ok'):
+        print(
+            "jinjautils-client: error: {}".format(response.get('error')),
+            file=sys.stderr
+        )
+        return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
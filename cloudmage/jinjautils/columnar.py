@@ -0,0 +1,236 @@
+##############################################################################
+# CloudMage : JinjaUtils Columnar Context
+# ============================================================================
+# CloudMage Jinja Helper Object Utility/Library
+#   - Render large tables from columns without building a dict per row.
+# Author: Richard Nason rnason@cloudmage.io
+# Project Start: 2/13/2020
+# License: GNU GPLv3
+##############################################################################
+
+###############
+# Imports:    #
+###############
+# Import Base Python Modules
+from collections.abc import Mapping, Sequence
+from itertools import chain
+from array import array
+import sys
+
+
+# array.array typecodes holding float values, all other typecodes hold int.
+_FLOAT_TYPECODES = ('f', 'd')
+
+
+#####################
+# Class Definition: #
+#####################
+class ColumnarRow(Mapping):
+    """ CloudMage Columnar Row View Class
+
+    Read only view of one row of a ColumnarTable. A row only stores its
+    index, values are read from the table columns when accessed, so rows
+    can be created on demand while a template loops over the table. Values
+    are available as attributes, row.name, and as items, row['name'], and
+    rows behave as a read only mapping of column names to values.
+    """
+
+    __slots__ = ('_index',)
+
+    # Set on the row class created for each table.
+    _columns = {}
+    _names = ()
+
+    def __init__(self, index):
+        self._index = index
+
+    def __getitem__(self, name):
+        try:
+            column = self._columns[name]
+        except (KeyError, TypeError):
+            raise KeyError(name)
+        return column[self._index]
+
+    def __iter__(self):
+        return iter(self._names)
+
+    def __len__(self):
+        return len(self._names)
+
+    def __repr__(self):
+        return "{}({!r})".format(type(self).__name__, dict(self.items()))
+
+    def as_dict(self):
+        """ Return the row values as a new dict. """
+        return {name: self[name] for name in self._names}
+
+
+def _column_property(column):
+    """ Return a property reading a row value from a column. """
+    return property(lambda row: column[row._index])
+
+
+class ColumnarTable(Sequence):
+    """ CloudMage Columnar Table Class
+
+    Render context holding a table as a dict of equal length columns, such
+    as lists, tuples, array.array or memoryview objects, instead of a list
+    of dicts. Iterating or indexing the table returns ColumnarRow views
+    built on demand, so no per row dict is kept in memory and typed array
+    columns store each value in a few bytes. Templates loop over a table
+    exactly as they would over a list of dicts:
+    {% for row in table %}{{ row.name }} {{ row['value'] }}{% endfor %}.
+    """
+
+    __slots__ = ('_columns', '_names', '_length', '_row')
+
+    def __init__(self, columns):
+        """ ColumnarTable Class Constructor
+
+        Parameters:
+            columns (dict): required
+
+        Attributes:
+            self._columns (dict)  : private
+            self._names   (tuple) : private
+            self._length  (int)   : private
+            self._row     (type)  : private
+        """
+        if not isinstance(columns, Mapping):
+            raise TypeError(
+                "columns expected dict but received: {}".format(
+                    type(columns)
+                )
+            )
+        length = None
+        for name, column in columns.items():
+            if not isinstance(name, str):
+                raise TypeError(
+                    "Column name expected str but received: {}".format(
+                        type(name)
+                    )
+                )
+            if (
+                isinstance(column, (str, bytes, Mapping)) or
+                not hasattr(column, '__getitem__') or
+                not hasattr(column, '__len__')
+            ):
+                raise TypeError(
+                    "Column {} expected a sequence but received: {}".format(
+                        name,
+                        type(column)
+                    )
+                )
+            if length is None:
+                length = len(column)
+            elif len(column) != length:
+                raise ValueError(
+                    "Column {} has {} values but expected {}.".format(
+                        name,
+                        len(column),
+                        length
+                    )
+                )
+        self._columns = dict(columns)
+        self._names = tuple(self._columns)
+        self._length = length or 0
+
+        # Each table has its own row class, with a property per column so
+        # attribute access does not go through a fallback lookup.
+        attributes = {
+            '__slots__': (),
+            '_columns': self._columns,
+            '_names': self._names
+        }
+        for name, column in self._columns.items():
+            if name.isidentifier() and not hasattr(ColumnarRow, name):
+                attributes[name] = _column_property(column)
+        self._row = type('ColumnarRow', (ColumnarRow,), attributes)
+
+    @classmethod
+    def from_records(cls, records, names=None, typecodes=None):
+        """ From Records Method
+
+        Build a table from an iterable of dicts, such as one of the record
+        readers in the sources module, reading one record at a time. Column
+        names default to the keys of the first record, and missing values
+        are stored as None. Columns listed in typecodes are stored in an
+        array.array of that typecode, converting the values with int or
+        float, so CSV values can be stored as numbers.
+
+        Parameters:
+            records   (iter): required
+            names     (list): optional [default=None]
+            typecodes (dict): optional [default=None]
+        """
+        typecodes = typecodes or {}
+        records = iter(records)
+        first = next(records, None)
+        if names is None:
+            names = list(first) if first is not None else list(typecodes)
+        columns = {}
+        converters = {}
+        for name in names:
+            typecode = typecodes.get(name)
+            if typecode is None:
+                columns[name] = []
+            else:
+                columns[name] = array(typecode)
+                converters[name] = (
+                    float if typecode in _FLOAT_TYPECODES else int
+                )
+        appenders = [
+            (name, columns[name].append, converters.get(name))
+            for name in names
+        ]
+        if first is not None:
+            for record in chain((first,), records):
+                for name, append, convert in appenders:
+                    value = record.get(name)
+                    append(value if convert is None else convert(value))
+        return cls(columns)
+
+    @property
+    def columns(self):
+        """ Return the dict of table columns. """
+        return dict(self._columns)
+
+    @property
+    def names(self):
+        """ Return the tuple of column names. """
+        return self._names
+
+    def column(self, name):
+        """ Return a single column of the table. """
+        return self._columns[name]
+
+    def __len__(self):
+        return self._length
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return type(self)({
+                name: column[index]
+                for name, column in self._columns.items()
+            })
+        if index < 0:
+            index += self._length
+        if not 0 <= index < self._length:
+            raise IndexError("ColumnarTable index out of range")
+        return self._row(index)
+
+    def __iter__(self):
+        row = self._row
+        for index in range(self._length):
+            yield row(index)
+
+    def __repr__(self):
+        return "ColumnarTable(columns={}, rows={})".format(
+            list(self._names),
+            self._length
+        )
+
+    def __sizeof__(self):
+        return object.__sizeof__(self) + sum(
+            sys.getsizeof(column) for column in self._columns.values()
+        )
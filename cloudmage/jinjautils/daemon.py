@@ -0,0 +1,332 @@
+##############################################################################
+# CloudMage : JinjaUtils Render Daemon
+# ============================================================================
+# CloudMage Jinja Helper Object Utility/Library
+#   - Serve render and write requests from a warm JinjaUtils over a socket.
+# Author: Richard Nason rnason@cloudmage.io
+# Project Start: 2/13/2020
+# License: GNU GPLv3
+##############################################################################
+
+###############
+# Imports:    #
+###############
+# Import Package Modules:
+from .jinja import JinjaUtils
+from .cli import _Log, load_data_file
+from .client import recv_frame, send_frame, ProtocolError, SOCKET_ENV
+
+# Import Base Python Modules
+from time import perf_counter
+import socketserver
+import threading
+import socket
+import sys
+import os
+
+
+#####################
+# Class Definition: #
+#####################
+class RenderDaemon(object):
+    """ CloudMage Jinja Render Daemon Class
+
+    Long running render server listening on a Unix domain socket. Every
+    connection is handled on its own thread, and may send any number of
+    length prefixed JSON request frames, each answered by a response frame.
+    All threads share one Jinja Environment, so templates are compiled once
+    and served from its cache for the life of the daemon, while each thread
+    uses its own JinjaUtils object for the load, render and write calls.
+    Context files are cached until their modification time changes.
+
+    Requests hold an op of ping, stats, render, write or shutdown. Render
+    and write requests hold a template, an optional context dict and an
+    optional context_file path. Write requests also hold the output path
+    and optional backup, compression and skip_unchanged settings.
+    """
+
+    def __init__(self, socket_path, template_directory=None):
+        """ RenderDaemon Class Constructor
+
+        Parameters:
+            socket_path        (str): required
+            template_directory (str): optional [default=None]
+
+        Attributes:
+            self._socket_path   (str)  : private
+            self._jinja         (obj)  : private
+            self._local         (obj)  : private
+            self._context_files (dict) : private
+            self._stats         (dict) : private
+            self._lock          (obj)  : private
+            self._server        (obj)  : private
+            self._thread        (obj)  : private
+        """
+        self._socket_path = os.path.abspath(socket_path)
+        self._jinja = JinjaUtils(log=_Log())
+        if template_directory is not None:
+            self._jinja.template_directory = template_directory
+            if self._jinja._jinja_tpl_library is None:
+                raise ValueError(
+                    "Invalid template directory: {}".format(
+                        template_directory
+                    )
+                )
+        self._local = threading.local()
+        self._context_files = {}
+        self._stats = {
+            'requests': 0,
+            'errors': 0,
+            'renders': 0,
+            'writes': 0,
+            'connections': 0,
+            'started': perf_counter()
+        }
+        self._lock = threading.Lock()
+        self._server = None
+        self._thread = None
+
+    @property
+    def socket_path(self):
+        """ Return the path of the daemon socket. """
+        return self._socket_path
+
+    def _bind(self):
+        """ Bind the socket, replacing a stale socket file left behind by a
+        daemon that is no longer running.
+        """
+        if os.path.exists(self._socket_path):
+            probe = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            try:
+                probe.connect(self._socket_path)
+            except OSError:
+                os.remove(self._socket_path)
+            else:
+                raise OSError(
+                    "A daemon is already listening on: {}".format(
+                        self._socket_path
+                    )
+                )
+            finally:
+                probe.close()
+
+        daemon = self
+
+        class _Handler(socketserver.BaseRequestHandler):
+            def handle(self):
+                daemon._handle(self.request)
+
+        # Create the socket with owner only permissions.
+        umask = os.umask(0o177)
+        try:
+            server = socketserver.ThreadingUnixStreamServer(
+                self._socket_path,
+                _Handler
+            )
+        finally:
+            os.umask(umask)
+        server.daemon_threads = True
+        self._server = server
+
+    def serve_forever(self):
+        """ Serve requests until a shutdown request or close() is called. """
+        if self._server is None:
+            self._bind()
+        try:
+            self._server.serve_forever()
+        finally:
+            self._server.server_close()
+            if os.path.exists(self._socket_path):
+                os.remove(self._socket_path)
+
+    def start(self):
+        """ Serve requests on a background thread and return the daemon. """
+        self._bind()
+        self._thread = threading.Thread(
+            target=self.serve_forever,
+            daemon=True
+        )
+        self._thread.start()
+        return self
+
+    def close(self):
+        """ Stop serving and remove the socket file. """
+        if self._server is not None:
+            self._server.shutdown()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def stats(self):
+        """ Return a copy of the daemon request stats. """
+        with self._lock:
+            stats = dict(self._stats)
+        stats['uptime'] = perf_counter() - stats.pop('started')
+        stats['cached_templates'] = (
+            len(self._jinja._jinja_tpl_library.cache)
+            if self._jinja._jinja_tpl_library is not None and
+            self._jinja._jinja_tpl_library.cache is not None else 0
+        )
+        return stats
+
+    def _worker(self):
+        """ Return the JinjaUtils object of the current thread, sharing the
+        daemon Environment and its template cache.
+        """
+        jinja = getattr(self._local, 'jinja', None)
+        if jinja is None:
+            jinja = JinjaUtils(log=_Log())
+            jinja._template_directory = self._jinja._template_directory
+            jinja._available_templates = self._jinja._available_templates
+            jinja._jinja_loader = self._jinja._jinja_loader
+            jinja._jinja_tpl_library = self._jinja._jinja_tpl_library
+            self._local.jinja = jinja
+        del jinja._log.messages[:]
+        return jinja
+
+    def _context_file(self, path):
+        """ Load a context file, cached until its modification time changes.
+        """
+        status = os.stat(path)
+        key = (status.st_mtime_ns, status.st_size)
+        cached = self._context_files.get(path)
+        if cached is None or cached[0] != key:
+            data = load_data_file(path)
+            if not isinstance(data, dict):
+                raise ValueError("{} expected a mapping.".format(path))
+            cached = self._context_files[path] = (key, data)
+        return cached[1]
+
+    def _handle(self, connection):
+        """ Answer every request frame received on a connection. """
+        with self._lock:
+            self._stats['connections'] += 1
+        while True:
+            try:
+                request = recv_frame(connection)
+            except (ProtocolError, OSError) as e:
+                try:
+                    send_frame(connection, {'ok': False, 'error': str(e)})
+                except OSError:
+                    pass
+                return
+            if request is None:
+                return
+            started = perf_counter()
+            try:
+                response = self._dispatch(request)
+            except Exception as e:
+                response = {'ok': False, 'error': str(e)}
+            response['seconds'] = perf_counter() - started
+            with self._lock:
+                self._stats['requests'] += 1
+                self._stats['errors'] += int(not response.get('ok'))
+            try:
+                send_frame(connection, response)
+            except OSError:
+                return
+            if isinstance(request, dict) and request.get('op') == 'shutdown':
+                threading.Thread(target=self._server.shutdown).start()
+                return
+
+    def _dispatch(self, request):
+        """ Run a single request and return its response. """
+        if not isinstance(request, dict):
+            raise ValueError("Request expected a JSON object.")
+        operation = request.get('op')
+        if operation == 'ping':
+            return {'ok': True, 'pid': os.getpid()}
+        if operation == 'stats':
+            return dict(self.stats(), ok=True)
+        if operation == 'shutdown':
+            return {'ok': True}
+        if operation not in ('render', 'write'):
+            raise ValueError("Unknown op: {}".format(operation))
+
+        template = request.get('template')
+        context = request.get('context') or {}
+        if not isinstance(template, str) or not isinstance(context, dict):
+            raise ValueError("Request expected template and context.")
+        if request.get('context_file'):
+            context = dict(
+                self._context_file(request['context_file']),
+                **context
+            )
+
+        jinja = self._worker()
+        jinja.load = template
+        if jinja._loaded_template is None:
+            raise ValueError(
+                jinja._log.messages[-1] if jinja._log.messages else
+                "Template not found: {}".format(template)
+            )
+        jinja.render(**context)
+        rendered = jinja._rendered_template
+        if rendered is None:
+            raise ValueError(
+                jinja._log.messages[-1] if jinja._log.messages else
+                "Failed to render: {}".format(template)
+            )
+        if operation == 'render':
+            with self._lock:
+                self._stats['renders'] += 1
+            return {'ok': True, 'rendered': rendered}
+
+        output = request.get('output')
+        if not isinstance(output, str) or not os.path.isabs(output):
+            raise ValueError("Write expected an absolute output path.")
+        stats = jinja.write_many(
+            [(output, rendered)],
+            backup=bool(request.get('backup', False)),
+            compression=request.get('compression'),
+            skip_unchanged=bool(request.get('skip_unchanged', True))
+        )
+        if not stats or stats['failed']:
+            raise ValueError(
+                list(stats['errors'].values())[0] if stats else
+                jinja._log.messages[-1] if jinja._log.messages else
+                "Failed to write: {}".format(output)
+            )
+        with self._lock:
+            self._stats['writes'] += 1
+        return {
+            'ok': True,
+            'written': bool(stats['written']),
+            'unchanged': bool(stats['unchanged']),
+            'bytes': stats['bytes_written']
+        }
+
+
+def main(argv=None):
+    """ Render daemon command line entry point. """
+    import argparse
+    parser = argparse.ArgumentParser(
+        prog='jinjautils-daemon',
+        description="Serve template renders over a Unix domain socket."
+    )
+    parser.add_argument(
+        '-s', '--socket', default=os.environ.get(SOCKET_ENV),
+        help="socket path to listen on [default: ${}]".format(SOCKET_ENV)
+    )
+    parser.add_argument(
+        '-t', '--template-directory',
+        help="template directory loaded into the shared Environment"
+    )
+    args = parser.parse_args(argv)
+    if not args.socket:
+        parser.error("--socket or ${} is required".format(SOCKET_ENV))
+    try:
+        daemon = RenderDaemon(args.socket, args.template_directory)
+        print("jinjautils-daemon listening on: {}".format(daemon.socket_path))
+        sys.stdout.flush()
+        daemon.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    except (OSError, ValueError) as e:
+        print("jinjautils-daemon: error: {}".format(e), file=sys.stderr)
+        return 2
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
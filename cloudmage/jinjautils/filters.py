@@ -0,0 +1,523 @@
+##############################################################################
+# CloudMage : JinjaUtils Template Filters
+# ============================================================================
+# CloudMage Jinja Helper Object Utility/Library
+#   - JSON, YAML and table filters registered on the Jinja Environment.
+# Author: Richard Nason rnason@cloudmage.io
+# Project Start: 2/13/2020
+# License: GNU GPLv3
+##############################################################################
+
+###############
+# Imports:    #
+###############
+# Import Package Modules:
+from .columnar import ColumnarTable
+from .lazy import lazy_json_default, resolve_lazy
+
+# Import Base Python Modules
+from collections.abc import Mapping, Sequence
+from itertools import islice, repeat
+from operator import itemgetter
+from array import array
+
+
+# Size of the chunks yielded by the to_json_chunks and to_yaml_chunks
+# filters, values are joined until a chunk reaches this many characters.
+CHUNK_SIZE = 65536
+
+# Items of a top level list or dict encoded together by to_json_chunks.
+JSON_BATCH_ITEMS = 256
+
+# Most encoder option sets kept by to_json, the cache is cleared when full.
+MAX_CACHED_ENCODERS = 64
+
+_json_encoders = {}
+
+
+def _json_encoder(compact=False, **options):
+    """ Return a json.JSONEncoder for a set of json.dumps options, reusing
+    the encoder built for the same options by an earlier call. compact
+    removes the whitespace after item and key separators.
+    """
+    if compact:
+        options.setdefault('separators', (',', ':'))
+    if 'cls' not in options:
+        # Serialize lazy values a template stored in lists and dicts.
+        options.setdefault('default', lazy_json_default)
+    key = tuple(options.items())
+    try:
+        return _json_encoders[key]
+    except KeyError:
+        pass
+    except TypeError:
+        # Unhashable option values, such as separators passed as a list.
+        try:
+            key = tuple(
+                (name, tuple(value) if isinstance(value, list) else value)
+                for name, value in key
+            )
+            hash(key)
+        except TypeError:
+            key = None
+    import json
+    encoder = options.pop('cls', None) or json.JSONEncoder
+    encoder = encoder(**options)
+    if key is not None:
+        if len(_json_encoders) >= MAX_CACHED_ENCODERS:
+            _json_encoders.clear()
+        _json_encoders[key] = encoder
+    return encoder
+
+
+def to_json(value, compact=False, **options):
+    """ to_json template filter
+
+    Return a value serialized as JSON. Options are the json.dumps keyword
+    arguments, such as indent and sort_keys, and the encoder built for each
+    set of options is reused by later calls. compact removes the whitespace
+    after item and key separators.
+
+    Parameters:
+        value   (obj):  required
+        compact (bool): optional [default=False]
+    """
+    return _json_encoder(compact, **options).encode(resolve_lazy(value))
+
+
+def _join_chunks(pieces, chunk_size):
+    """ Join an iterable of strings into chunks of at least chunk_size
+    characters, the last chunk can be shorter.
+    """
+    chunk = []
+    size = 0
+    for piece in pieces:
+        chunk.append(piece)
+        size += len(piece)
+        if size >= chunk_size:
+            yield ''.join(chunk)
+            chunk = []
+            size = 0
+    if chunk:
+        yield ''.join(chunk)
+
+
+def _json_pieces(encoder, value):
+    """ Yield the JSON text of a value in pieces. The items of a top level
+    list or dict are encoded in batches of JSON_BATCH_ITEMS, keeping the C
+    accelerated encoder, and the brackets of each batch are removed, so each
+    piece only holds a batch of items. Other values are encoded whole.
+    """
+    if isinstance(value, dict):
+        items = sorted(value.items()) if encoder.sort_keys else value.items()
+        batches = map(dict, _batches(items, JSON_BATCH_ITEMS))
+    elif isinstance(value, (list, tuple)):
+        batches = _batches(value, JSON_BATCH_ITEMS)
+    else:
+        yield encoder.encode(value)
+        return
+    if not value:
+        yield encoder.encode(value)
+        return
+    # Batches are encoded at the first indent level, so only the brackets,
+    # and the line breaks next to them, are removed.
+    trim = 1 if encoder.indent is None else 2
+    separator = encoder.item_separator
+    if encoder.indent is not None:
+        separator += '\n'
+    text = encoder.encode(next(batches))
+    yield text[:-trim]
+    for batch in batches:
+        text = encoder.encode(batch)
+        yield separator + text[trim:-trim]
+    yield text[-trim:]
+
+
+def _batches(items, size):
+    """ Yield lists of up to size items from an iterable. """
+    items = iter(items)
+    batch = list(islice(items, size))
+    while batch:
+        yield batch
+        batch = list(islice(items, size))
+
+
+def to_json_chunks(value, chunk_size=CHUNK_SIZE, compact=False, **options):
+    """ to_json_chunks template filter
+
+    Yield the JSON text of a value in chunks of at least chunk_size
+    characters, with the same options as the to_json filter. The items of a
+    top level list or dict are encoded a batch at a time, so a template
+    rendered with render_stream writes large structures without first
+    building them as a single string:
+    {% for chunk in records | to_json_chunks %}{{ chunk }}{% endfor %}.
+    Joined, the chunks are identical to the to_json output.
+
+    Parameters:
+        value      (obj):  required
+        chunk_size (int):  optional [default=65536]
+        compact    (bool): optional [default=False]
+    """
+    encoder = _json_encoder(compact, **options)
+    return _join_chunks(
+        _json_pieces(encoder, resolve_lazy(value)),
+        chunk_size
+    )
+
+
+def _yaml_options(compact=False, sort_keys=False, indent=None, **options):
+    """ Return the yaml dumper and dump options for the to_yaml filters,
+    using the libyaml based dumper when PyYAML was built with it.
+    """
+    try:
+        import yaml
+    except ImportError:
+        raise ImportError("to_yaml requires PyYAML: pip install pyyaml")
+    dumper = getattr(yaml, 'CSafeDumper', yaml.SafeDumper)
+    options.setdefault('allow_unicode', True)
+    options.setdefault('default_flow_style', True if compact else False)
+    if compact:
+        options.setdefault('width', 2 ** 30)
+    return yaml, dict(
+        options,
+        Dumper=dumper,
+        sort_keys=sort_keys,
+        indent=indent
+    )
+
+
+def _yaml_strip(text):
+    """ Remove the trailing line break, and the document end marker added
+    after plain scalars, from yaml.dump output.
+    """
+    if text.endswith('\n...\n'):
+        return text[:-5]
+    return text[:-1] if text.endswith('\n') else text
+
+
+def to_yaml(value, compact=False, sort_keys=False, indent=None, **options):
+    """ to_yaml template filter
+
+    Return a value serialized as YAML with the PyYAML safe dumper, in block
+    style, or in flow style on a single line when compact is True. Keys keep
+    their order unless sort_keys is True, and other yaml.dump keyword
+    arguments are passed through. The text does not end with a line break.
+    Requires PyYAML to be installed.
+
+    Parameters:
+        value     (obj):  required
+        compact   (bool): optional [default=False]
+        sort_keys (bool): optional [default=False]
+        indent    (int):  optional [default=None]
+    """
+    yaml, options = _yaml_options(compact, sort_keys, indent, **options)
+    return _yaml_strip(yaml.dump(resolve_lazy(value), **options))
+
+
+# yaml.dump options that add document markers, which would be repeated for
+# every item dumped on its own.
+YAML_DOCUMENT_OPTIONS = ('explicit_start', 'explicit_end', 'version', 'tags')
+
+
+def _yaml_shares_objects(value):
+    """ Return True if an object within value, other than the scalars the
+    safe dumper never aliases, is referenced more than once, so yaml.dump
+    would write it once with an anchor and then as aliases.
+    """
+    seen = set()
+    pending = [value]
+    while pending:
+        item = pending.pop()
+        if item is None or isinstance(
+            item, (str, bytes, bool, int, float)
+        ) or (isinstance(item, tuple) and not item):
+            continue
+        if id(item) in seen:
+            return True
+        seen.add(id(item))
+        if isinstance(item, dict):
+            pending.extend(item.keys())
+            pending.extend(item.values())
+        elif isinstance(item, (list, tuple, set)):
+            pending.extend(item)
+    return False
+
+
+def _yaml_pieces(yaml, options, value):
+    """ Yield the YAML text of a value in pieces, dumping a top level block
+    style list or dict one item at a time. Values dumped with document
+    markers, or sharing objects that are written as anchors and aliases,
+    are dumped whole.
+    """
+    if options['default_flow_style'] is not False or not value or (
+        not isinstance(value, (list, tuple, dict))
+    ) or any(options.get(name) for name in YAML_DOCUMENT_OPTIONS) or (
+        _yaml_shares_objects(value)
+    ):
+        yield _yaml_strip(yaml.dump(value, **options))
+        return
+    if isinstance(value, dict):
+        items = value.items()
+        if options['sort_keys']:
+            items = sorted(items)
+        items = ({name: item} for name, item in items)
+    else:
+        items = ([item] for item in value)
+    pending = None
+    for item in items:
+        if pending is not None:
+            yield pending
+        pending = yaml.dump(item, **options)
+    yield _yaml_strip(pending)
+
+
+def to_yaml_chunks(value, chunk_size=CHUNK_SIZE, compact=False,
+                   sort_keys=False, indent=None, **options):
+    """ to_yaml_chunks template filter
+
+    Yield the YAML text of a value in chunks of at least chunk_size characters,
+    with the same options as the to_yaml filter, dumping the items of a top
+    level list or dict one at a time so large structures are never held as
+    a single string. Joined, the chunks are identical to the to_yaml output.
+    Values dumped with explicit_start, explicit_end, version or tags, and
+    values that reference the same list, dict or other object more than
+    once, are dumped as a single string so the document markers, anchors
+    and aliases match to_yaml.
+
+    Parameters:
+        value      (obj):  required
+        chunk_size (int):  optional [default=65536]
+        compact    (bool): optional [default=False]
+        sort_keys  (bool): optional [default=False]
+        indent     (int):  optional [default=None]
+    """
+    yaml, options = _yaml_options(compact, sort_keys, indent, **options)
+    return _join_chunks(
+        _yaml_pieces(yaml, options, resolve_lazy(value)),
+        chunk_size
+    )
+
+
+# Tables are built a column at a time with map, zip and str.join, so the
+# per cell work runs in C instead of one template loop iteration per cell.
+def _table_columns(rows, columns=None):
+    """ Return the column keys and a list of values for each column of a
+    table given as a ColumnarTable, a dict of columns, or an iterable of
+    dict or sequence rows. Missing values, including the end of a column
+    shorter than the others, are returned as None.
+    """
+    rows = resolve_lazy(rows)
+    if isinstance(rows, ColumnarTable):
+        keys = list(rows.names) if columns is None else list(columns)
+        return keys, [rows.column(key) for key in keys]
+    if isinstance(rows, Mapping):
+        keys = list(rows) if columns is None else list(columns)
+        values = [rows[key] for key in keys]
+        # Shorter columns are padded so zipping them drops no rows.
+        length = max(map(len, values), default=0)
+        return keys, [
+            column if len(column) == length else
+            list(column) + [None] * (length - len(column))
+            for column in values
+        ]
+    if not isinstance(rows, Sequence) or isinstance(rows, (str, bytes)):
+        rows = list(rows)
+    if not rows:
+        return list(columns or ()), [[] for _ in columns or ()]
+    first = rows[0]
+    if isinstance(first, Mapping):
+        keys = list(first) if columns is None else list(columns)
+        missing = KeyError
+    else:
+        keys = list(range(len(first))) if columns is None else list(columns)
+        missing = IndexError
+    values = []
+    for key in keys:
+        try:
+            values.append(list(map(itemgetter(key), rows)))
+        except missing:
+            values.append([_get(row, key) for row in rows])
+    return keys, values
+
+
+def _get(row, key):
+    """ Return a row value, or None if the row does not have it. """
+    try:
+        return row[key]
+    except (KeyError, IndexError):
+        return None
+
+
+def _strings(column):
+    """ Return a column as a list of str, with None as an empty string, and
+    whether every value of a non empty column is an int or float other than
+    bool, so numeric columns can be right aligned.
+    """
+    if isinstance(column, array):
+        return list(map(str, column)), True
+    types = set(map(type, column))
+    if type(None) in types:
+        column = ['' if value is None else value for value in column]
+        types.discard(type(None))
+        types.add(str)
+    if types <= {str}:
+        return list(column), False
+    return list(map(str, column)), types <= {int, float}
+
+
+def _headers(keys, headers):
+    """ Return the header labels of a table as a list of str. """
+    if headers is None:
+        return list(map(str, keys))
+    headers = list(map(str, headers))
+    if len(headers) != len(keys):
+        raise ValueError(
+            "headers expected {} labels but received: {}".format(
+                len(keys),
+                len(headers)
+            )
+        )
+    return headers
+
+
+def to_csv(rows, columns=None, headers=None, header=True, delimiter=',',
+           lineterminator='\n', **fmtparams):
+    """ to_csv template filter
+
+    Return a table as CSV text, written by csv.writer in a single
+    writerows call. Rows can be a ColumnarTable, a dict of columns, or an
+    iterable of dict or sequence rows. The columns argument selects and
+    orders the columns, and defaults to the table column names, the keys of
+    the first row, or every index of the first row. The header row holds
+    headers, or the column keys when headers is not provided, unless header
+    is False. Missing and None values are written as empty fields, and the
+    text does not end with a line terminator. Extra csv.writer format
+    parameters, such as quoting, are passed through.
+
+    Parameters:
+        rows           (iter): required
+        columns        (list): optional [default=None]
+        headers        (list): optional [default=None]
+        header         (bool): optional [default=True]
+        delimiter      (str):  optional [default=',']
+        lineterminator (str):  optional [default='\\n']
+    """
+    import csv
+    import io
+    keys, values = _table_columns(rows, columns)
+    output = io.StringIO()
+    writer = csv.writer(
+        output,
+        delimiter=delimiter,
+        lineterminator=lineterminator,
+        **fmtparams
+    )
+    if header and keys:
+        writer.writerow(_headers(keys, headers))
+    writer.writerows(zip(*values))
+    text = output.getvalue()
+    if lineterminator and text.endswith(lineterminator):
+        text = text[:-len(lineterminator)]
+    return text
+
+
+def _markdown_escape(column):
+    """ Escape pipes and line breaks in Markdown table cells. """
+    text = ''.join(column)
+    if '|' not in text and '\n' not in text and '\r' not in text:
+        return column
+    return [
+        value.replace('|', '\\|').replace('\r\n', '<br>').replace(
+            '\n', '<br>'
+        ).replace('\r', '<br>')
+        for value in column
+    ]
+
+
+def to_markdown_table(rows, columns=None, headers=None, align=None):
+    """ to_markdown_table template filter
+
+    Return a table as a GitHub flavored Markdown table. Rows and columns are
+    handled as they are by the to_csv filter. Pipes in cell values are
+    escaped and line breaks are replaced with <br>. Columns holding only
+    numbers are right aligned, and align can map column keys to 'left',
+    'right' or 'center' to set the alignment of any column.
+
+    Parameters:
+        rows    (iter): required
+        columns (list): optional [default=None]
+        headers (list): optional [default=None]
+        align   (dict): optional [default=None]
+    """
+    keys, values = _table_columns(rows, columns)
+    if not keys:
+        return ''
+    align = align or {}
+    markers = {'left': ':---', 'right': '---:', 'center': ':---:'}
+    separator = []
+    cells = []
+    for key, column in zip(keys, values):
+        strings, numeric = _strings(column)
+        alignment = align.get(key, 'right' if numeric else None)
+        separator.append(markers.get(alignment, '---'))
+        cells.append(_markdown_escape(strings))
+    lines = [
+        ' | '.join(_markdown_escape(_headers(keys, headers))),
+        ' | '.join(separator)
+    ]
+    lines.extend(map(' | '.join, zip(*cells)))
+    return '| ' + ' |\n| '.join(lines) + ' |'
+
+
+def to_aligned_table(rows, columns=None, headers=None, header=True,
+                     separator='  ', align=None):
+    """ to_aligned_table template filter
+
+    Return a table as plain text with each column padded to its widest
+    value, and the header row underlined with dashes unless header is
+    False. Rows and columns are handled as they are by the to_csv filter.
+    Columns holding only numbers are right aligned and other columns are
+    left aligned, and align can map column keys to 'left', 'right' or
+    'center' to set the alignment of any column. Trailing spaces are
+    removed from each line.
+
+    Parameters:
+        rows      (iter): required
+        columns   (list): optional [default=None]
+        headers   (list): optional [default=None]
+        header    (bool): optional [default=True]
+        separator (str):  optional [default='  ']
+        align     (dict): optional [default=None]
+    """
+    keys, values = _table_columns(rows, columns)
+    if not keys:
+        return ''
+    align = align or {}
+    labels = _headers(keys, headers) if header else None
+    padded = []
+    for index, (key, column) in enumerate(zip(keys, values)):
+        cells, numeric = _strings(column)
+        alignment = align.get(key, 'right' if numeric else 'left')
+        if labels is not None:
+            cells[:0] = [labels[index], '-' * len(labels[index])]
+        width = max(map(len, cells), default=0)
+        if labels is not None:
+            cells[1] = '-' * width
+        pad = {'right': str.rjust, 'center': str.center}.get(
+            alignment,
+            str.ljust
+        )
+        padded.append(list(map(pad, cells, repeat(width))))
+    return '\n'.join(map(str.rstrip, map(separator.join, zip(*padded))))
+
+
+# Filters registered on the managed Jinja Environment.
+FILTERS = {
+    'to_json': to_json,
+    'to_json_chunks': to_json_chunks,
+    'to_yaml': to_yaml,
+    'to_yaml_chunks': to_yaml_chunks,
+    'to_csv': to_csv,
+    'to_markdown_table': to_markdown_table,
+    'to_aligned_table': to_aligned_table,
+}
@@ -13,17 +13,65 @@
 ###############
 # Import Pip Installed Modules:
 from jinja2 import Template, Environment, FileSystemLoader
+from jinja2 import TemplateNotFound
+from jinja2.loaders import split_template_path
+from jinja2.defaults import DEFAULT_NAMESPACE
+
+# Import Package Modules:
+from .backends import OutputBackend, LocalBackend
+from .metrics import PhaseMetrics, PHASES
+from .profiler import RenderProfiler
+from .filters import FILTERS
+from .lazy import (
+    LazyContext,
+    LazyValue,
+    lazy_json_default,
+    resolve_lazy
+)
+from .variables import template_variables, file_uptodate
+from .cache import TemplateCache, source_digest, template_size
 
 # Import Base Python Modules
+# Modules only needed on specific paths, such as archives, the metrics
+# endpoint, memory profiling and batch writes, are imported when first used
+# to keep the package import fast. datetime is cheap to import and used by
+# every log call, so it is imported here.
+from collections.abc import Mapping
 from datetime import datetime
-import inspect
+from time import perf_counter
+import importlib
+import weakref
 import ntpath
-import shutil
-import json
+import io
 import sys
 import os
 
 
+# Supported write compression formats mapped to their stdlib module and
+# output file extension. Modules are imported when first used.
+COMPRESSION_FORMATS = {
+    'gzip': ('gzip', '.gz'),
+    'bz2': ('bz2', '.bz2'),
+    'lzma': ('lzma', '.xz'),
+}
+
+# Most per record errors kept in the render_many stats, later errors are
+# only counted.
+MAX_RECORDED_ERRORS = 1000
+
+# Encoding of text outputs, the default encoding of io.TextIOWrapper.
+TEXT_ENCODING = io.TextIOWrapper(io.BytesIO()).encoding
+
+
+def _encode_text(text):
+    """ Encode text output as a text mode file would write it, translating
+    newlines to the platform line separator.
+    """
+    if os.linesep != '\n':
+        text = text.replace('\n', os.linesep)
+    return text.encode(TEXT_ENCODING)
+
+
 #####################
 # Class Definition: #
 #####################
@@ -37,12 +85,14 @@ class JinjaUtils(object):
     class.
     """
 
-    def __init__(self, verbose=False, log=None):
+    def __init__(self, verbose=False, log=None, metrics=False, native=False):
         """ JinjaHelper Class Constructor
 
         Parameters:
             verbose (bool): optional [default=False]
             log     (obj):  optional [default=None]
+            metrics (bool): optional [default=False]
+            native  (bool): optional [default=False]
 
         Attributes:
             self._verbose             (bool) : private
@@ -50,30 +100,77 @@ class JinjaUtils(object):
             self._log_context         (str)  : private
             self._trim_blocks         (bool) : private
             self._lstrip_blocks       (bool) : private
+            self._native              (bool) : private
             self._template_directory  (str)  : private
             self._available_templates (list) : private
             self._loaded_template     (obj)  : private
             self._rendered_template   (obj)  : private
+            self._rendered_stream     (obj)  : private
             self._jinja_loader        (obj)  : private
             self._jinja_tpl_library   (str)  : private
+            self._cache_size          (int)  : private
             self._output_directory    (str)  : private
             self._output_file         (str)  : private
+            self._output_backend      (obj)  : private
+            self._metrics             (obj)  : private
+            self._instrumented        (bool) : private
+            self._hooks               (dict) : private
+            self._profiler            (obj)  : private
+            self._loaded_template_path (str) : private
+            self._memory_profiler     (obj)  : private
+            self._memory_finalizer    (obj)  : private
+            self._lazy_stats          (dict) : private
+            self._globals             (dict) : private
+            self._template_globals    (dict) : private
+            self._context_class       (type) : private
+            self._file_environments   (dict) : private
+            self._compiled_templates  (dict) : private
+            self._template_variables  (dict) : private
+            self._string_templates    (obj)  : private
+            self._string_environments (dict) : private
+            self._loaded_string       (tuple): private
 
         Properties:
             self.trim_blocks         (bool) : public
             self.lstrip_blocks       (bool) : public
+            self.native              (bool) : public
             self.verbose             (bool) : public
             self.template_directory  (str)  : public
             self.available_templates (str)  : public
             self.load                (str)  : public
             self.rendered:           (str)  : public
+            self.output_backend      (obj)  : public
+            self.metrics             (bool) : public
+            self.profile             (bool) : public
+            self.memory_profile      (bool) : public
+            self.string_cache_size   (int)  : public
 
         Methods:
             self._exception_handler
             self.log
             self.load
+            self.load_string
             self.render
+            self.render_string
+            self.render_stream
+            self.lazy_stats
+            self.add_globals
+            self.remove_globals
+            self.required_variables
+            self.missing_variables
+            self.prune_context
+            self.string_cache_stats
             self.write
+            self.write_many
+            self.archive
+            self.metrics_snapshot
+            self.metrics_openmetrics
+            self.metrics_export
+            self.metrics_serve
+            self.add_hook
+            self.remove_hook
+            self.profile_report
+            self.profile_export
         """
 
         # Class Public Properties and Attributes ######
@@ -99,17 +196,69 @@ class JinjaUtils(object):
         # Getter and Setter propert vars
         self._trim_blocks = True
         self._lstrip_blocks = True
+        self._native = native is True
         self._template_directory = None
         self._available_templates = []
         self._loaded_template = None
         self._rendered_template = None
+        self._rendered_stream = None
 
         # Jinja Objects using Jinja FileSystemLoader,
-        # and Jinja Environment objects.
+        # and Jinja Environment objects, with the Jinja default number of
+        # cached templates.
         self._jinja_loader = None
         self._jinja_tpl_library = None
+        self._cache_size = 400
         self._output_directory = None
         self._output_file = None
+        self._output_backend = LocalBackend()
+
+        # Pipeline instrumentation, only active when metrics are enabled
+        # or pipeline hooks are registered.
+        self._metrics = None
+        self._instrumented = False
+        self._hooks = {}
+        if metrics is True:
+            self._metrics = PhaseMetrics()
+            self._instrumented = True
+
+        # Line level render profiler, only active when profiling is enabled.
+        self._profiler = None
+        self._loaded_template_path = None
+
+        # tracemalloc memory profiler, only active when memory profiling
+        # is enabled, and the finalizer closing it.
+        self._memory_profiler = None
+        self._memory_finalizer = None
+
+        # Resolution statistics of LazyValue render arguments.
+        self._lazy_stats = {}
+
+        # Shared globals, looked up by the template Context class of this
+        # instance when a variable is not passed to the render, and the
+        # Environments compiling templates loaded from a file path.
+        self._globals = {}
+        self._template_globals = {}
+        self._context_class = type('LazyContext', (LazyContext,), {
+            'environment_globals': self._globals,
+            'template_globals': self._template_globals
+        })
+        self._file_environments = {}
+
+        # Templates returned by the last load of each template name, held
+        # weakly so they are dropped once evicted from the Environment cache.
+        self._compiled_templates = weakref.WeakValueDictionary()
+
+        # Variables read by each analyzed template, keyed by template name
+        # or file path.
+        self._template_variables = {}
+
+        # Templates compiled from strings, keyed by a digest of the source
+        # and the settings they were compiled with, and the Environments
+        # compiling them.
+        self._string_templates = TemplateCache()
+        self._string_environments = {}
+        self._loaded_string = None
 
     ############################################
     # Class Exception Handler:                 #
@@ -155,7 +304,7 @@ class JinjaUtils(object):
             Log Stream
         """
         # Define this methods identity for functional logging:
-        __id = inspect.stack()[0][3]
+        __id = sys._getframe().f_code.co_name
         try:
             # Internal method variable assignments:
             this_log_msg_caller = f"{self._log_context}.{log_id}"
@@ -210,7 +359,7 @@ class JinjaUtils(object):
         This method will return the verbose setting.
         """
         # Define this methods identity for functional logging:
-        __id = inspect.stack()[0][3]
+        __id = sys._getframe().f_code.co_name
         self.log(f"{__id} property requested.", 'info', __id)
         return self._verbose
 
@@ -223,7 +372,7 @@ class JinjaUtils(object):
         bool value is provided.
         """
         # Define this methods identity for functional logging:
-        __id = inspect.stack()[0][3]
+        __id = sys._getframe().f_code.co_name
         self.log(f"{__id} property update requested.", 'info', __id)
 
         if verbose is not None and isinstance(verbose, bool):
@@ -241,6 +390,551 @@ class JinjaUtils(object):
                 __id
             )
 
+    ################################################
+    # Metrics Setter / Getter Methods:             #
+    ################################################
+    @property
+    def metrics(self):
+        """ Metrics Property Getter
+
+        Getter method for the metrics property.
+        This method will return True if pipeline metrics are enabled.
+        """
+        # Define this methods identity for functional logging:
+        __id = sys._getframe().f_code.co_name
+        self.log(f"{__id} property requested.", 'info', __id)
+        return self._metrics is not None
+
+    @metrics.setter
+    def metrics(self, metrics):
+        """ Metrics Property Setter
+
+        Setter method for the metrics property. Enabling metrics starts
+        collecting per phase timings for the load, render and write methods.
+        Disabling metrics discards any collected metrics.
+        """
+        # Define this methods identity for functional logging:
+        __id = sys._getframe().f_code.co_name
+        self.log(f"{__id} property update requested.", 'info', __id)
+
+        if metrics is not None and isinstance(metrics, bool):
+            if metrics and self._metrics is None:
+                self._metrics = PhaseMetrics()
+            elif not metrics:
+                self._metrics = None
+            self._update_instrumented()
+            self.log(
+                f"Updated {__id} property with value: {metrics}",
+                'info',
+                __id
+            )
+        else:
+            self.log(
+                f"{__id} property argument expected type bool "
+                f"but received type: {type(metrics)}",
+                'error',
+                __id
+            )
+
+    def metrics_snapshot(self, reset=False):
+        """ Metrics Snapshot Method
+
+        Class method that returns a snapshot of the collected pipeline
+        metrics. Each phase (lookup, compile, render, backup, write) maps
+        template names to their count, error count, total/min/max/mean
+        seconds, output bytes and latency histogram. Returns an empty dict
+        when metrics are disabled.
+
+        Parameters:
+            reset (bool): optional [default=False]
+        """
+        if self._metrics is None:
+            return {}
+        return self._metrics.snapshot(reset=reset)
+
+    ################################################
+    # Profile Setter / Getter Methods:             #
+    ################################################
+    @property
+    def profile(self):
+        """ Profile Property Getter
+
+        Getter method for the profile property.
+        This method will return True if render profiling is enabled.
+        """
+        # Define this methods identity for functional logging:
+        __id = sys._getframe().f_code.co_name
+        self.log(f"{__id} property requested.", 'info', __id)
+        return self._profiler is not None
+
+    @profile.setter
+    def profile(self, profile):
+        """ Profile Property Setter
+
+        Setter method for the profile property. Enabling profiling runs every
+        render under the line level RenderProfiler, which maps render time
+        back to template source lines and blocks. Profiling adds significant
+        overhead and is intended for diagnosing slow templates. Disabling
+        profiling discards the collected profile.
+        """
+        # Define this methods identity for functional logging:
+        __id = sys._getframe().f_code.co_name
+        self.log(f"{__id} property update requested.", 'info', __id)
+
+        if profile is not None and isinstance(profile, bool):
+            if profile and self._profiler is None:
+                self._profiler = RenderProfiler()
+            elif not profile:
+                self._profiler = None
+            self.log(
+                f"Updated {__id} property with value: {profile}",
+                'info',
+                __id
+            )
+        else:
+            self.log(
+                f"{__id} property argument expected type bool "
+                f"but received type: {type(profile)}",
+                'error',
+                __id
+            )
+
+    def profile_report(self, template=None, limit=None):
+        """ Profile Report Method
+
+        Class method that returns the render profile keyed by template name.
+        Each template maps to a list of line entries (line, block, seconds,
+        hits, percent, source) sorted slowest first. Returns an empty dict
+        when profiling is disabled.
+
+        Parameters:
+            template (str): optional [default=None]
+            limit    (int): optional [default=None]
+        """
+        if self._profiler is None:
+            return {}
+        return self._profiler.report(template=template, limit=limit)
+
+    def profile_export(self, output_path=None):
+        """ Profile Export Method
+
+        Class method that returns the render profile in the collapsed stack
+        format read by flame graph tools, optionally writing it to the
+        provided output path. Returns None when profiling is disabled.
+
+        Parameters:
+            output_path (str): optional [default=None]
+        """
+        # Define this methods identity for functional logging:
+        __id = sys._getframe().f_code.co_name
+        if self._profiler is None:
+            self.log("Profiling is not enabled!", 'warning', __id)
+            return None
+        try:
+            collapsed_stacks = self._profiler.collapsed_stacks()
+            if output_path is not None:
+                with open(output_path, "w") as output:
+                    output.write(collapsed_stacks)
+                self.log(
+                    "Profile exported to: {}".format(output_path),
+                    'info',
+                    __id
+                )
+            return collapsed_stacks
+        except Exception as e:
+            self._exception_handler(__id, e)
+            return None
+
+    def _profile_render(self, **kwargs):
+        """ Render the loaded template under the render profiler. """
+        if self._loaded_template_path is not None:
+            with open(self._loaded_template_path) as template_file:
+                self._profiler.add_source(
+                    self._loaded_template.name,
+                    template_file.read()
+                )
+        return self._profiler.run(self._loaded_template.render, **kwargs)
+
+    ################################################
+    # Memory Profile Setter / Getter Methods:      #
+    ################################################
+    @property
+    def memory_profile(self):
+        """ Memory Profile Property Getter
+
+        Getter method for the memory_profile property.
+        This method will return True if memory profiling is enabled.
+        """
+        # Define this methods identity for functional logging:
+        __id = sys._getframe().f_code.co_name
+        self.log(f"{__id} property requested.", 'info', __id)
+        return self._memory_profiler is not None
+
+    @memory_profile.setter
+    def memory_profile(self, memory_profile):
+        """ Memory Profile Property Setter
+
+        Setter method for the memory_profile property. Enabling memory
+        profiling measures every load, render and write call with
+        tracemalloc, recording peak and retained memory and the source lines
+        that retained the most memory. Tracing slows every allocation and is
+        intended for diagnosing memory heavy templates. Disabling memory
+        profiling, or dropping this object, discards the collected
+        measurements and stops tracemalloc if it was started by this object.
+        Every phase is keyed by the loaded template name, the file name for
+        templates loaded from a file path.
+        """
+        # Define this methods identity for functional logging:
+        __id = sys._getframe().f_code.co_name
+        self.log(f"{__id} property update requested.", 'info', __id)
+
+        if memory_profile is not None and isinstance(memory_profile, bool):
+            if memory_profile and self._memory_profiler is None:
+                from .memory import MemoryProfiler
+                self._memory_profiler = MemoryProfiler()
+                # Stop tracemalloc if this object is dropped while profiling.
+                self._memory_finalizer = weakref.finalize(
+                    self,
+                    self._memory_profiler.close
+                )
+            elif not memory_profile and self._memory_profiler is not None:
+                self._memory_finalizer()
+                self._memory_finalizer = None
+                self._memory_profiler = None
+            self.log(
+                f"Updated {__id} property with value: {memory_profile}",
+                'info',
+                __id
+            )
+        else:
+            self.log(
+                f"{__id} property argument expected type bool "
+                f"but received type: {type(memory_profile)}",
+                'error',
+                __id
+            )
+
+    def memory_report(self, template=None, limit=None):
+        """ Memory Report Method
+
+        Class method that returns the memory profile. The phases key maps
+        load, render and write to the measured templates, each with its call
+        count, largest peak, last peak, total and last retained bytes and
+        the top allocation sites. The renders key maps each rendered
+        template to its context size, output size, output to context ratio
+        and whether the ratio exceeded the amplification threshold. Returns
+        an empty dict when memory profiling is disabled.
+
+        Parameters:
+            template (str): optional [default=None]
+            limit    (int): optional [default=None]
+        """
+        if self._memory_profiler is None:
+            return {}
+        return self._memory_profiler.report(template=template, limit=limit)
+
+    def _memory_render(self, kwargs):
+        """ Render the loaded template under the memory profiler and check
+        its output size against its context size.
+        """
+        __id = 'render'
+        template = self._template_label()
+        self._memory_profiler.measure(
+            'render',
+            template,
+            self.render,
+            kwargs=kwargs
+        )
+        if self._rendered_template is None:
+            return
+        if self._memory_profiler.record_render(
+            template,
+            kwargs,
+            self._rendered_template
+        ):
+            self.log(
+                "{} output is over {}x the size of its context!".format(
+                    template,
+                    self._memory_profiler.amplification
+                ),
+                'warning',
+                __id
+            )
+
+    def metrics_openmetrics(self):
+        """ Metrics OpenMetrics Method
+
+        Class method that returns the collected pipeline metrics in the
+        OpenMetrics text exposition format, ready to be scraped by
+        Prometheus compatible collectors. Returns None when metrics are
+        disabled.
+        """
+        if self._metrics is None:
+            return None
+        from .openmetrics import generate_openmetrics
+        return generate_openmetrics(self._metrics)
+
+    def metrics_export(self, target):
+        """ Metrics Export Method
+
+        Class method that exports the OpenMetrics exposition to the provided
+        target, which can be a file path (written atomically for node
+        exporter textfile collectors) or a callable that receives the
+        exposition text.
+
+        Parameters:
+            target (str or callable): required
+
+        Returns:
+            True if the metrics were exported, False otherwise.
+        """
+        # Define this methods identity for functional logging:
+        __id = sys._getframe().f_code.co_name
+        try:
+            exposition = self.metrics_openmetrics()
+            if exposition is None:
+                self.log("Metrics are not enabled!", 'warning', __id)
+                return False
+            if callable(target):
+                target(exposition)
+            elif isinstance(target, str):
+                temporary_target = "{}.{}.tmp".format(target, os.getpid())
+                with open(temporary_target, "w") as output:
+                    output.write(exposition)
+                os.replace(temporary_target, target)
+            else:
+                self.log(
+                    "{} expected str path or callable but received: {}".format(
+                        __id,
+                        type(target)
+                    ),
+                    'error',
+                    __id
+                )
+                return False
+            self.log("Metrics exported to: {}".format(target), 'info', __id)
+            return True
+        except Exception as e:
+            self._exception_handler(__id, e)
+            return False
+
+    def metrics_serve(self, host='127.0.0.1', port=0):
+        """ Metrics Serve Method
+
+        Class method that starts a small HTTP endpoint on a daemon thread
+        that serves the OpenMetrics exposition on every GET request. Binds
+        to localhost on a random free port by default, the bound address is
+        available from the returned server url and address properties.
+
+        Parameters:
+            host (str): optional [default='127.0.0.1']
+            port (int): optional [default=0]
+
+        Returns:
+            MetricsServer object, or None if the server could not be started.
+        """
+        # Define this methods identity for functional logging:
+        __id = sys._getframe().f_code.co_name
+        try:
+            if self._metrics is None:
+                self.log("Metrics are not enabled!", 'warning', __id)
+                return None
+            from .openmetrics import MetricsServer
+            server = MetricsServer(
+                lambda: self.metrics_openmetrics() or "# EOF\n",
+                host=host,
+                port=port
+            )
+            self.log(
+                "Serving metrics on: {}".format(server.url),
+                'info',
+                __id
+            )
+            return server
+        except Exception as e:
+            self._exception_handler(__id, e)
+            return None
+
+    def _record_cache_lookup(self, template, loaded):
+        """ Remember the template object a load returned, and count whether
+        it is the object returned by the previous load of the same name,
+        served from the Environment template cache, or a newly compiled
+        template.
+        """
+        previous = self._compiled_templates.get(template)
+        self._compiled_templates[template] = loaded
+        if self._metrics is not None:
+            self._metrics.increment(
+                'template_cache_hits' if previous is loaded else
+                'template_cache_misses',
+                template
+            )
+
+    def _template_exists(self, template):
+        """ Return True if a template name can be loaded from the template
+        directory, checking the templates loaded before and the template
+        file instead of listing every template in the directory.
+        """
+        if template in self._compiled_templates:
+            return True
+        try:
+            pieces = split_template_path(template)
+        except TemplateNotFound:
+            return False
+        return any(
+            os.path.isfile(os.path.join(path, *pieces))
+            for path in self._jinja_loader.searchpath
+        )
+
+    def _rendered_text(self):
+        """ Return the rendered template, converting a native render result
+        that is not str or bytes to str, as a standard render would.
+        """
+        rendered = self._rendered_template
+        if rendered is None or isinstance(rendered, (str, bytes)):
+            return rendered
+        return str(rendered)
+
+    def _template_label(self):
+        """ Return the loaded template name used to key phase metrics. """
+        if self._loaded_template is not None:
+            return self._loaded_template.name
+        return None
+
+    ################################################
+    # Pipeline Hook Methods:                       #
+    ################################################
+    def add_hook(self, phase, before=None, after=None):
+        """ Add Hook Method
+
+        Class method that registers tracing callbacks around a pipeline
+        phase, one of lookup, compile, render, backup or write. The before
+        callback is called as before(phase, template) when the phase starts,
+        and the after callback as after(phase, template, seconds, size,
+        error) when it completes. Exceptions raised by hooks are logged and
+        never interrupt the pipeline. When no hooks are registered and
+        metrics are disabled, dispatch costs a single attribute check.
+
+        Parameters:
+            phase  (str):      required
+            before (callable): optional [default=None]
+            after  (callable): optional [default=None]
+
+        Returns:
+            True if the hook was registered, False otherwise.
+        """
+        # Define this methods identity for functional logging:
+        __id = sys._getframe().f_code.co_name
+        if phase not in PHASES:
+            self.log(
+                "{} phase expected one of {} but received: {}".format(
+                    __id,
+                    list(PHASES),
+                    phase
+                ),
+                'error',
+                __id
+            )
+            return False
+        if (
+            (before is None and after is None) or
+            (before is not None and not callable(before)) or
+            (after is not None and not callable(after))
+        ):
+            self.log(
+                "{} expected callable before or after hooks.".format(__id),
+                'error',
+                __id
+            )
+            return False
+        self._hooks.setdefault(phase, []).append((before, after))
+        self._update_instrumented()
+        self.log(
+            "Registered {} hook for phase: {}".format(__id, phase),
+            'info',
+            __id
+        )
+        return True
+
+    def remove_hook(self, phase=None, before=None, after=None):
+        """ Remove Hook Method
+
+        Class method that removes registered tracing callbacks. If no
+        callbacks are provided, every hook of the phase is removed, and if
+        no phase is provided every registered hook is removed.
+
+        Parameters:
+            phase  (str):      optional [default=None]
+            before (callable): optional [default=None]
+            after  (callable): optional [default=None]
+
+        Returns:
+            Number of hooks removed.
+        """
+        removed = 0
+        for hook_phase in list(self._hooks):
+            if phase is not None and hook_phase != phase:
+                continue
+            hooks = self._hooks[hook_phase]
+            remaining = [
+                hook for hook in hooks
+                if (before is not None and hook[0] is not before) or
+                (after is not None and hook[1] is not after)
+            ] if (before is not None or after is not None) else []
+            removed += len(hooks) - len(remaining)
+            if remaining:
+                self._hooks[hook_phase] = remaining
+            else:
+                del self._hooks[hook_phase]
+        self._update_instrumented()
+        return removed
+
+    def _phase_start(self, phase, template):
+        """ Phase Start Instrumentation Helper
+
+        Internal helper that dispatches the before hooks of a pipeline phase
+        and returns the phase start time. Callers only invoke this when
+        self._instrumented is set, so the uninstrumented path costs a single
+        attribute check.
+        """
+        hooks = self._hooks.get(phase)
+        if hooks:
+            for before, after in hooks:
+                if before is not None:
+                    try:
+                        before(phase, template)
+                    except Exception as e:
+                        self._exception_handler('hook', e)
+        return perf_counter()
+
+    def _phase_end(self, phase, template, started, size=None, error=False):
+        """ Phase End Instrumentation Helper
+
+        Internal helper that records a completed pipeline phase and
+        dispatches the after hooks of the phase. Callers only invoke this
+        when self._instrumented is set.
+        """
+        seconds = perf_counter() - started
+        if self._metrics is not None:
+            self._metrics.record(phase, template, seconds, size, error)
+        hooks = self._hooks.get(phase)
+        if hooks:
+            for before, after in hooks:
+                if after is not None:
+                    try:
+                        after(phase, template, seconds, size, error)
+                    except Exception as e:
+                        self._exception_handler('hook', e)
+
+    def _update_instrumented(self):
+        """ Enable the instrumentation points when metrics or hooks are
+        active.
+        """
+        self._instrumented = (
+            self._metrics is not None or
+            any(self._hooks.values())
+        )
+
     ############################################
     # Jinja Option Getters and Setters:        #
     ############################################
@@ -251,7 +945,7 @@ class JinjaUtils(object):
         Getter method for Jinja trim_blocks property.
         This method returns the current trim_blocks setting value."""
         # Define this methods identity for functional logging:
-        __id = inspect.stack()[0][3]
+        __id = sys._getframe().f_code.co_name
         self.log(f"{__id} property requested.", 'info', __id)
         return self._trim_blocks
 
@@ -264,7 +958,7 @@ class JinjaUtils(object):
         as a valid value for the property.
         """
         # Define this methods identity for functional logging:
-        __id = inspect.stack()[0][3]
+        __id = sys._getframe().f_code.co_name
         self.log(f"{__id} property update requested.", 'info', __id)
 
         # if the passed value is a valid bool value then set the value.
@@ -299,7 +993,7 @@ class JinjaUtils(object):
         This method returns the current lstrip_blocks setting value.
         """
         # Define this methods identity for functional logging:
-        __id = inspect.stack()[0][3]
+        __id = sys._getframe().f_code.co_name
         self.log(f"{__id} property requested.", 'info', __id)
         return self._lstrip_blocks
 
@@ -312,7 +1006,7 @@ class JinjaUtils(object):
         for the lstrip_blocks property.
         """
         # Define this methods identity for functional logging:
-        __id = inspect.stack()[0][3]
+        __id = sys._getframe().f_code.co_name
         self.log(f"{__id} property update requested.", 'info', __id)
 
         # if the passed value is a valid bool value then set the value.
@@ -339,6 +1033,55 @@ class JinjaUtils(object):
                 __id
             )
 
+    @property
+    def native(self):
+        """ Native Property Getter
+
+        Getter method for the native rendering property.
+        This method returns the current native setting value.
+        """
+        # Define this methods identity for functional logging:
+        __id = sys._getframe().f_code.co_name
+        self.log(f"{__id} property requested.", 'info', __id)
+        return self._native
+
+    @native.setter
+    def native(self, native_setting=False):
+        """ Native Property Setter
+
+        Setter method for the native rendering property. When enabled, the
+        template_directory Environment is a Jinja NativeEnvironment, and
+        templates loaded from a file path are NativeTemplates, so the render
+        method returns Python objects instead of str. As with trim_blocks,
+        the setting applies to the template_directory and templates set
+        after it. This method will only take a value of true or false as a
+        valid value for the native property.
+        """
+        # Define this methods identity for functional logging:
+        __id = sys._getframe().f_code.co_name
+        self.log(f"{__id} property update requested.", 'info', __id)
+
+        # if the passed value is a valid bool value then set the value.
+        if native_setting is not None and isinstance(native_setting, bool):
+            self._native = native_setting
+            self.log(
+                "Updated {} property with value: {}".format(
+                    __id,
+                    self._native
+                ),
+                'info',
+                __id
+            )
+        else:
+            self.log(
+                "{} argument expected bool but received type: {}".format(
+                    __id,
+                    type(native_setting)
+                ),
+                'error',
+                __id
+            )
+
     ############################################
     # Jinja Template Directory Getter/Setter:  #
     ############################################
@@ -350,7 +1093,7 @@ class JinjaUtils(object):
         template directory and return it back to the method caller.
         """
         # Define this methods identity for functional logging:
-        __id = inspect.stack()[0][3]
+        __id = sys._getframe().f_code.co_name
         self.log(f"{__id} property requested.", 'info', __id)
         if self._template_directory is None:
             return "A template directory has not yet been configured."
@@ -368,7 +1111,7 @@ class JinjaUtils(object):
         template_directory is updated.
         """
         # Define this methods identity for functional logging:
-        __id = inspect.stack()[0][3]
+        __id = sys._getframe().f_code.co_name
         self.log("Call to retrieve available_templates", 'info', __id)
         if (
             self._available_templates is not None and
@@ -388,7 +1131,7 @@ class JinjaUtils(object):
         template directory and populate the available_templates list property.
         """
         # Define this methods identity for functional logging:
-        __id = inspect.stack()[0][3]
+        __id = sys._getframe().f_code.co_name
         self.log(f"{__id} property update requested.", 'info', __id)
 
         try:
@@ -414,12 +1157,24 @@ class JinjaUtils(object):
                     self._jinja_loader = FileSystemLoader(
                         self._template_directory
                     )
-                    self._jinja_tpl_library = Environment(
+                    environment = Environment
+                    if self._native:
+                        from jinja2.nativetypes import NativeEnvironment
+                        environment = NativeEnvironment
+                    self._jinja_tpl_library = environment(
                         loader=self._jinja_loader,
                         trim_blocks=self._trim_blocks,
-                        lstrip_blocks=self._lstrip_blocks
+                        lstrip_blocks=self._lstrip_blocks,
+                        cache_size=self._cache_size
                     )
-                    self._jinja_tpl_library.filters['to_json'] = json.dumps
+                    self._jinja_tpl_library.context_class = \
+                        self._context_class
+                    self._use_lazy_json(self._jinja_tpl_library)
+                    self._jinja_tpl_library.filters.update(FILTERS)
+                    self._template_variables = {}
+                    self._compiled_templates.clear()
+                    self._string_templates.clear()
+                    self._string_environments = {}
                     self.log(
                         "Jinja successfully loaded: {}".format(
                             self._template_directory
@@ -432,6 +1187,13 @@ class JinjaUtils(object):
                         'debug',
                         __id
                     )
+                    self.log(
+                        "Added {} filters to Jinja Environment object.".format(
+                            ", ".join(sorted(set(FILTERS) - {'to_json'}))
+                        ),
+                        'debug',
+                        __id
+                    )
                     # Set Jinja template library
                     template_list = self._jinja_tpl_library.list_templates()
 
@@ -480,7 +1242,7 @@ class JinjaUtils(object):
         self._loaded_template back to the caller
         """
         # Define this methods identity for functional logging:
-        __id = inspect.stack()[0][3]
+        __id = sys._getframe().f_code.co_name
         self.log(f"{__id} property requested.", 'info', __id)
 
         # Return the loaded template name.
@@ -503,17 +1265,59 @@ class JinjaUtils(object):
           from a template_directory
         * A file path to a valid jinja file on the filesystem
         """
+        if (
+            self._memory_profiler is not None and
+            not self._memory_profiler.active
+        ):
+            self._memory_profiler.measure(
+                'load',
+                lambda: self._template_label() or os.path.basename(
+                    str(template)
+                ),
+                type(self).load.fset,
+                (self, template)
+            )
+            return
+
         # Reinitialize the loaded template
         self._loaded_template = None
+        self._loaded_template_path = None
+        self._loaded_string = None
+        instrumented = self._instrumented
+        template_name = template
+        phase = None
         try:
             # Define this methods identity for functional logging:
-            __id = inspect.stack()[0][3]
+            __id = sys._getframe().f_code.co_name
             self.log(f"{__id} property update requested.", 'info', __id)
 
             # Check the value passed to determine what type
             # of template was passed.
-            if os.path.isfile(template) and os.access(template, os.R_OK):
-                self._loaded_template = Template(open(template).read())
+            is_file = (
+                os.path.isfile(template) and os.access(template, os.R_OK)
+            )
+            # Templates loaded from a file path are labelled with the file
+            # name, as they are named once loaded.
+            if is_file:
+                template_name = os.path.basename(template)
+            phase = 'lookup'
+            started = (
+                self._phase_start(phase, str(template_name))
+                if instrumented else 0.0
+            )
+            if is_file:
+                with open(template) as template_file:
+                    template_source = template_file.read()
+                if instrumented:
+                    self._phase_end(phase, template_name, started)
+                    phase = 'compile'
+                    started = self._phase_start(phase, template_name)
+                self._loaded_template = self._file_environment().from_string(
+                    template_source
+                )
+                if instrumented:
+                    self._phase_end(phase, template_name, started)
+                    phase = None
                 self.log(
                     "Loaded template file from path: {}".format(
                         self._loaded_template
@@ -523,6 +1327,7 @@ class JinjaUtils(object):
                 )
                 if not self._loaded_template.name:
                     self._loaded_template.name = os.path.basename(template)
+                self._loaded_template_path = template
                 self.log(
                     "Loaded template name set to: {}".format(
                         self._loaded_template.name
@@ -532,12 +1337,34 @@ class JinjaUtils(object):
                 )
             else:
                 if isinstance(template, str):
-                    for tpl in self._jinja_tpl_library.list_templates():
-                        if template == tpl:
+                    if self._template_exists(template):
+                        # A template returned from the Environment cache is
+                        # timed as part of the lookup, compile is only
+                        # recorded when the template is compiled.
+                        previous = self._compiled_templates.get(template)
+                        if instrumented and not (
+                            previous is not None and
+                            previous.is_up_to_date
+                        ):
+                            self._phase_end(phase, template, started)
+                            phase = 'compile'
+                            started = self._phase_start(phase, template)
+                        try:
                             self._loaded_template = \
                                 self._jinja_tpl_library.get_template(
                                     template
                                 )
+                        except TemplateNotFound:
+                            # The cached template file has been removed.
+                            self._loaded_template = None
+                        else:
+                            self._record_cache_lookup(
+                                template,
+                                self._loaded_template
+                            )
+                            if instrumented:
+                                self._phase_end(phase, template, started)
+                                phase = None
                             self.log(
                                 "Loaded template file from: {}".format(
                                     self._loaded_template
@@ -548,6 +1375,10 @@ class JinjaUtils(object):
                     if (
                         self._loaded_template is None
                     ):
+                        if instrumented:
+                            self._phase_end(
+                                phase, template, started, error=True
+                            )
                         self.log(
                             "Requested template not found in: {}".format(
                                 self._template_directory
@@ -565,25 +1396,289 @@ class JinjaUtils(object):
                         __id
                     )
         except Exception as e:
+            if instrumented and phase is not None:
+                self._phase_end(
+                    phase,
+                    str(template_name),
+                    started,
+                    error=True
+                )
             self._exception_handler(__id, e)
 
-    @property
-    def rendered(self):
-        """ Rendered Template Property Getter
+    def _string_environment(self):
+        """ Return the Environment compiling string templates with the
+        current trim_blocks, lstrip_blocks and native settings, loading
+        extended and included templates from the template directory.
+        """
+        library = self._jinja_tpl_library
+        if (
+            library is not None and
+            library.trim_blocks == self._trim_blocks and
+            library.lstrip_blocks == self._lstrip_blocks and
+            (type(library) is not Environment) == self._native
+        ):
+            return library
+        key = (self._native, self._trim_blocks, self._lstrip_blocks)
+        environment = self._string_environments.get(key)
+        if environment is None:
+            environment_class = Environment
+            if self._native:
+                from jinja2.nativetypes import NativeEnvironment
+                environment_class = NativeEnvironment
+            environment = environment_class(
+                loader=self._jinja_loader,
+                trim_blocks=self._trim_blocks,
+                lstrip_blocks=self._lstrip_blocks
+            )
+            environment.context_class = self._context_class
+            self._use_lazy_json(environment)
+            environment.filters.update(FILTERS)
+            self._string_environments[key] = environment
+        return environment
+
+    def load_string(self, source, name=None):
+        """ Load String Method
+
+        Class method to load a template from a source string, such as a
+        template stored in a database or configuration, instead of a file.
+        Compiled templates are cached, keyed by a digest of the source, the
+        name and the trim_blocks, lstrip_blocks and native settings, so
+        loading the same source again skips parsing and compiling it. The
+        least recently used templates are evicted once the estimated memory
+        size of the cache exceeds the string_cache_size property. String
+        templates can extend and include templates of the template
+        directory, and the name is used to look up template globals. Without
+        a name, the template is named "<string:...>" after the start of the
+        source digest, so log messages, metrics and hooks can tell string
+        templates apart.
 
-        Class method that will return the currently rendered version
-        of the currently loaded template.
+        Parameters:
+            source (str): required
+            name   (str): optional [default=None]
+
+        Returns:
+            True if the template was loaded, False otherwise.
         """
         # Define this methods identity for functional logging:
-        __id = inspect.stack()[0][3]
-        self.log(f"{__id} property requested.", 'info', __id)
+        __id = sys._getframe().f_code.co_name
+        self.log(f"{__id} requested.", 'info', __id)
 
-        # Return the rendered template value.
+        # Reinitialize the loaded template
+        self._loaded_template = None
+        self._loaded_template_path = None
+        self._loaded_string = None
+        if not isinstance(source, str) or (
+            name is not None and not isinstance(name, str)
+        ):
+            self.log(
+                "{} expected str source and name but received: {}".format(
+                    __id,
+                    (type(source), type(name))
+                ),
+                'error',
+                __id
+            )
+            return False
+        started = 0.0
+        try:
+            digest = source_digest(source)
+            if name is None:
+                name = "<string:{}>".format(digest.hex()[:12])
+            key = (
+                digest,
+                name,
+                self._native,
+                self._trim_blocks,
+                self._lstrip_blocks
+            )
+            template = self._string_templates.get(key)
+            if self._metrics is not None:
+                self._metrics.increment(
+                    'template_cache_misses' if template is None else
+                    'template_cache_hits',
+                    name
+                )
+            if template is None:
+                if self._instrumented:
+                    started = self._phase_start('compile', name)
+                environment = self._string_environment()
+                template = environment.template_class.from_code(
+                    environment,
+                    environment.compile(source, name),
+                    environment.make_globals(None)
+                )
+                if self._instrumented:
+                    self._phase_end('compile', name, started)
+                    started = 0.0
+                self._string_templates.put(
+                    key,
+                    template,
+                    template_size(source)
+                )
+            else:
+                self.log(
+                    "Loaded template from the string template cache.",
+                    'debug',
+                    __id
+                )
+            self._loaded_template = template
+            self._loaded_string = (digest, source)
+            self.log(
+                "Loaded template from string: {}".format(template),
+                'info',
+                __id
+            )
+            return True
+        except Exception as e:
+            if started:
+                self._phase_end('compile', name, started, error=True)
+            self._exception_handler(__id, e)
+        return False
+
+    def render_string(self, source, /, *, template_name=None, **kwargs):
+        """ Render String Method
+
+        Class method that loads a template from a source string with the
+        load_string method, and renders it with the provided keyword
+        arguments as the render method does. Repeated renders of the same
+        source reuse the compiled template. The template_name argument is
+        passed to load_string as the template name, so a name keyword
+        argument remains a template variable.
+
+        Parameters:
+            source        (str): required
+            template_name (str): optional [default=None]
+
+        Returns:
+            The rendered template, or None if the template could not be
+            loaded or rendered.
+        """
+        if not self.load_string(source, template_name):
+            return None
+        self.render(**kwargs)
+        return self._rendered_template
+
+    @property
+    def string_cache_size(self):
+        """ String Cache Size Property Getter
+
+        Getter method for the memory limit, in bytes, of the compiled string
+        template cache.
+        """
+        # Define this methods identity for functional logging:
+        __id = sys._getframe().f_code.co_name
+        self.log(f"{__id} property requested.", 'info', __id)
+        return self._string_templates.max_bytes
+
+    @string_cache_size.setter
+    def string_cache_size(self, string_cache_size):
+        """ String Cache Size Property Setter
+
+        Setter method for the memory limit, in bytes, of the compiled string
+        template cache. Templates are evicted, least recently used first,
+        until the cached templates fit in the new limit, and a limit of 0
+        disables the cache. This method will only take an int value of 0 or
+        more as a valid value for the property.
+        """
+        # Define this methods identity for functional logging:
+        __id = sys._getframe().f_code.co_name
+        self.log(f"{__id} property update requested.", 'info', __id)
+
+        if (
+            isinstance(string_cache_size, int) and
+            not isinstance(string_cache_size, bool) and
+            string_cache_size >= 0
+        ):
+            self._string_templates.max_bytes = string_cache_size
+            self.log(
+                "Updated {} property with value: {}".format(
+                    __id,
+                    string_cache_size
+                ),
+                'info',
+                __id
+            )
+        else:
+            self.log(
+                "{} argument expected int >= 0 but received: {}".format(
+                    __id,
+                    string_cache_size
+                ),
+                'error',
+                __id
+            )
+
+    def string_cache_stats(self):
+        """ String Cache Stats Method
+
+        Class method that returns the number of cached string templates,
+        their estimated memory size and limit in bytes, and the cache hit,
+        miss and eviction counts.
+        """
+        return self._string_templates.stats()
+
+    @property
+    def rendered(self):
+        """ Rendered Template Property Getter
+
+        Class method that will return the currently rendered version
+        of the currently loaded template.
+        """
+        # Define this methods identity for functional logging:
+        __id = sys._getframe().f_code.co_name
+        self.log(f"{__id} property requested.", 'info', __id)
+
+        # Return the rendered template value.
         if self._rendered_template is not None:
             return self._rendered_template
         else:
             return "No template has been rendered!"
 
+    ############################################
+    # Output Backend Getter/Setter:            #
+    ############################################
+    @property
+    def output_backend(self):
+        """ Output Backend Property Getter
+
+        Getter method for the output_backend property.
+        This method returns the backend used by the write methods.
+        """
+        # Define this methods identity for functional logging:
+        __id = sys._getframe().f_code.co_name
+        self.log(f"{__id} property requested.", 'info', __id)
+        return self._output_backend
+
+    @output_backend.setter
+    def output_backend(self, output_backend):
+        """ Output Backend Property Setter
+
+        Setter method for the output_backend property. This method will only
+        take an OutputBackend instance such as LocalBackend, MemoryBackend,
+        CallbackBackend or StreamBackend. Setting None restores the default
+        local filesystem backend.
+        """
+        # Define this methods identity for functional logging:
+        __id = sys._getframe().f_code.co_name
+        self.log(f"{__id} property update requested.", 'info', __id)
+
+        if output_backend is None:
+            output_backend = LocalBackend()
+        if isinstance(output_backend, OutputBackend):
+            self._output_backend = output_backend
+            self.log(
+                f"Updated {__id} property with value: {output_backend}",
+                'info',
+                __id
+            )
+        else:
+            self.log(
+                f"{__id} property argument expected type OutputBackend "
+                f"but received type: {type(output_backend)}",
+                'error',
+                __id
+            )
+
     def render(self, **kwargs):
         """ Render Template Method
 
@@ -592,13 +1687,25 @@ class JinjaUtils(object):
         dictionary objects as an input provided that they were provided
         in the format of keyword = dictionary where keyword is the variable
         in the Jinja template that will map to the dictionary object being
-        passed.
+        passed. In native mode the rendered property holds the Python object
+        produced by a template made of a single expression or literal.
+        LazyValue arguments are only computed if the template reads them,
+        once per render, and recorded in the lazy_stats method results.
         """
+        if (
+            self._memory_profiler is not None and
+            not self._memory_profiler.active
+        ):
+            self._memory_render(kwargs)
+            return
+
         # Reinitialize the rendered property
         self._rendered_template = None
+        self._rendered_stream = None
+        lazy = self._bind_lazy(kwargs)
         try:
             # Define this methods identity for functional logging:
-            __id = inspect.stack()[0][3]
+            __id = sys._getframe().f_code.co_name
             self.log(
                 "{} of loaded template requested.".format(__id),
                 'info',
@@ -609,8 +1716,41 @@ class JinjaUtils(object):
                 hasattr(self._loaded_template, 'render')
             ):
                 # Render the template passing in the kwargs input.
-                self._rendered_template = \
-                    self._loaded_template.render(**kwargs)
+                if self._instrumented:
+                    started = self._phase_start(
+                        'render',
+                        self._loaded_template.name
+                    )
+                try:
+                    if self._profiler is not None:
+                        self._rendered_template = \
+                            self._profile_render(**kwargs)
+                    else:
+                        self._rendered_template = \
+                            self._loaded_template.render(**kwargs)
+                except Exception:
+                    if self._instrumented:
+                        self._phase_end(
+                            'render',
+                            self._loaded_template.name,
+                            started,
+                            error=True
+                        )
+                    raise
+                # A native render of a single lazy variable returns its proxy.
+                self._rendered_template = resolve_lazy(
+                    self._rendered_template
+                )
+                if self._instrumented:
+                    self._phase_end(
+                        'render',
+                        self._loaded_template.name,
+                        started,
+                        size=len(self._rendered_template) if isinstance(
+                            self._rendered_template,
+                            str
+                        ) else None
+                    )
                 self.log(
                     "{} rendered successfully!".format(
                         self._loaded_template
@@ -626,17 +1766,469 @@ class JinjaUtils(object):
                 )
         except Exception as e:
             self._exception_handler(__id, e)
+        finally:
+            if lazy:
+                self._record_lazy(kwargs, lazy)
+
+    @staticmethod
+    def _use_lazy_json(environment):
+        """ Let the tojson filter of an Environment serialize lazy values.
+        """
+        environment.policies['json.dumps_kwargs'] = dict(
+            environment.policies['json.dumps_kwargs'],
+            default=lazy_json_default
+        )
+
+    def _bind_lazy(self, kwargs):
+        """ Replace the LazyValue arguments of a render with new unresolved
+        copies, so each render memoizes its own values, and return their
+        names.
+        """
+        lazy = [
+            name for name, value in kwargs.items()
+            if isinstance(value, LazyValue)
+        ]
+        for name in lazy:
+            kwargs[name] = kwargs[name].bind()
+        return lazy
+
+    def _record_lazy(self, kwargs, lazy):
+        """ Record which LazyValue arguments a render resolved. """
+        for name in lazy:
+            value = kwargs[name]
+            stats = self._lazy_stats.get(name)
+            if stats is None:
+                stats = self._lazy_stats[name] = {
+                    'renders': 0,
+                    'resolved': 0,
+                    'seconds': 0.0
+                }
+            stats['renders'] += 1
+            if value.resolved:
+                stats['resolved'] += 1
+                stats['seconds'] += value.seconds
+
+    def lazy_stats(self, reset=False):
+        """ Lazy Stats Method
+
+        Class method that returns the LazyValue statistics of the renders
+        so far. Each LazyValue argument name maps to the number of renders
+        it was passed to, the number of renders that resolved it, and the
+        total seconds spent computing it. Values passed to many renders but
+        rarely resolved are the ones lazy evaluation saves.
+
+        Parameters:
+            reset (bool): optional [default=False]
+        """
+        stats = {name: dict(value) for name, value in self._lazy_stats.items()}
+        if reset:
+            self._lazy_stats = {}
+        return stats
+
+    def _file_environment(self):
+        """ Return the Environment compiling templates loaded from a file
+        path, created on first use with the same default settings as
+        Template(source), and a NativeEnvironment in native mode.
+        """
+        environment = self._file_environments.get(self._native)
+        if environment is None:
+            if self._native:
+                from jinja2.nativetypes import NativeEnvironment
+                environment = NativeEnvironment()
+            else:
+                environment = Environment()
+            environment.context_class = self._context_class
+            self._use_lazy_json(environment)
+            self._file_environments[self._native] = environment
+        return environment
+
+    def add_globals(self, values=None, template=None, **kwargs):
+        """ Add Globals Method
+
+        Class method that registers global template variables once, instead
+        of passing them to every render. Globals are shared by every
+        template of this instance, or only by the template named template,
+        the file name for templates loaded from a file path. They are looked
+        up only when a variable is not passed to the render, so they are
+        never copied into the render context, render keyword arguments
+        override template globals, and template globals override shared
+        globals. Globals can be provided as a values dict, keyword arguments
+        or both, and LazyValue globals are computed once on first use.
+
+        Parameters:
+            values   (dict): optional [default=None]
+            template (str):  optional [default=None]
+
+        Returns:
+            True if the globals were registered, False otherwise.
+        """
+        # Define this methods identity for functional logging:
+        __id = sys._getframe().f_code.co_name
+        if values is not None and not isinstance(values, dict):
+            self.log(
+                "{} values expected dict but received: {}".format(
+                    __id,
+                    type(values)
+                ),
+                'error',
+                __id
+            )
+            return False
+        values = dict(values or {}, **kwargs)
+        if not values or not all(isinstance(name, str) for name in values):
+            self.log(
+                "{} expected one or more globals with str names.".format(
+                    __id
+                ),
+                'error',
+                __id
+            )
+            return False
+        if template is None:
+            self._globals.update(values)
+        else:
+            self._template_globals.setdefault(template, {}).update(values)
+        self.log(
+            "Registered {} globals: {}".format(
+                template or 'shared',
+                sorted(values)
+            ),
+            'info',
+            __id
+        )
+        return True
+
+    def remove_globals(self, *names, template=None):
+        """ Remove Globals Method
+
+        Class method that removes registered globals by name, or every
+        registered global when no names are provided. Shared globals are
+        removed unless a template name is provided, in which case the
+        globals of that template are removed.
+
+        Parameters:
+            names    (str): optional
+            template (str): optional [default=None]
+
+        Returns:
+            Number of globals removed.
+        """
+        if template is None:
+            registered = self._globals
+        else:
+            registered = self._template_globals.get(template, {})
+        names = names or list(registered)
+        removed = 0
+        for name in names:
+            if name in registered:
+                del registered[name]
+                removed += 1
+        if template is not None and not registered:
+            self._template_globals.pop(template, None)
+        return removed
+
+    def _analyze_variables(self, template):
+        """ Return the name of a template, the set of variables it reads and
+        whether any of its referenced templates could not be analyzed. The
+        template source is parsed once and the result reused until the
+        template, or a template it references, is modified.
+        """
+        if template is None:
+            if self._loaded_string is not None:
+                # String templates never change, the analysis of the
+                # loaded string is kept until another template is loaded.
+                digest, source = self._loaded_string
+                name = self._loaded_template.name
+                analyzed = self._template_variables.get(digest)
+                if analyzed is None or analyzed[0] != name:
+                    for key in [
+                        key for key in self._template_variables
+                        if isinstance(key, bytes)
+                    ]:
+                        del self._template_variables[key]
+                    variables, unknown, _ = template_variables(
+                        self._loaded_template.environment,
+                        source,
+                        name
+                    )
+                    analyzed = (name, frozenset(variables), unknown, [])
+                    self._template_variables[digest] = analyzed
+                return analyzed[:3]
+            if self._loaded_template_path is not None:
+                template = self._loaded_template_path
+            elif self._loaded_template is not None:
+                template = self._loaded_template.name
+            else:
+                return None
+        analyzed = self._template_variables.get(template)
+        if analyzed is not None and all(
+            uptodate() for uptodate in analyzed[3]
+        ):
+            return analyzed[:3]
+        if os.path.isfile(template) and os.access(template, os.R_OK):
+            environment = self._file_environment()
+            name = os.path.basename(template)
+            uptodate = file_uptodate(template)
+            with open(template) as template_file:
+                source = template_file.read()
+        elif self._jinja_tpl_library is not None:
+            environment = self._jinja_tpl_library
+            name = template
+            source, _, uptodate = environment.loader.get_source(
+                environment,
+                template
+            )
+        else:
+            raise TemplateNotFound(template)
+        variables, unknown, uptodates = template_variables(
+            environment,
+            source,
+            name
+        )
+        if uptodate is not None:
+            uptodates.insert(0, uptodate)
+        analyzed = (name, frozenset(variables), unknown, uptodates)
+        self._template_variables[template] = analyzed
+        return analyzed[:3]
+
+    def required_variables(self, template=None):
+        """ Required Variables Method
+
+        Class method that returns the set of variables a template reads from
+        the render context, including the variables of the templates it
+        extends, and includes or imports with context. Variables provided
+        by registered globals and Jinja builtins, such as range, are not
+        required. The template can be a template name, a file path, or None
+        for the loaded template. Each template is analyzed once, and again
+        only after it or one of its referenced templates is modified. The
+        set can be incomplete when a template includes a template name held
+        in a variable, which is logged as a warning.
+
+        Parameters:
+            template (str): optional [default=None]
+
+        Returns:
+            frozenset of variable names, or None if the template was not
+            found.
+        """
+        # Define this methods identity for functional logging:
+        __id = sys._getframe().f_code.co_name
+        try:
+            analyzed = self._analyze_variables(template)
+            if analyzed is None:
+                self.log(
+                    "No template loaded, Aborting {}!".format(__id),
+                    'error',
+                    __id
+                )
+                return None
+            name, variables, unknown = analyzed
+            if unknown:
+                self.log(
+                    "{} references templates that can't be analyzed, "
+                    "required variables may be incomplete.".format(name),
+                    'warning',
+                    __id
+                )
+            return variables.difference(
+                DEFAULT_NAMESPACE,
+                self._globals,
+                self._template_globals.get(name, ())
+            )
+        except TemplateNotFound:
+            self.log(
+                "Requested template not found: {}".format(template),
+                'error',
+                __id
+            )
+        except Exception as e:
+            self._exception_handler(__id, e)
+        return None
+
+    def missing_variables(self, context, template=None):
+        """ Missing Variables Method
+
+        Class method that returns the sorted list of variables required by
+        a template, as returned by the required_variables method, that are
+        not keys of the context dict, so a context can be rejected before
+        it is rendered.
+
+        Parameters:
+            context  (dict): required
+            template (str):  optional [default=None]
+
+        Returns:
+            List of missing variable names, or None if the context is not a
+            dict or the template was not found.
+        """
+        # Define this methods identity for functional logging:
+        __id = sys._getframe().f_code.co_name
+        if not isinstance(context, dict):
+            self.log(
+                "{} context expected dict but received: {}".format(
+                    __id,
+                    type(context)
+                ),
+                'error',
+                __id
+            )
+            return None
+        required = self.required_variables(template)
+        if required is None:
+            return None
+        return sorted(name for name in required if name not in context)
+
+    def prune_context(self, context, template=None):
+        """ Prune Context Method
+
+        Class method that returns a new dict holding only the context values
+        a template reads, so large contexts can be trimmed before they are
+        sent to another process. Values overriding a registered global are
+        kept. When a template references templates that can't be analyzed,
+        such as an include of a template name held in a variable, the whole
+        context is returned.
+
+        Parameters:
+            context  (dict): required
+            template (str):  optional [default=None]
+
+        Returns:
+            Pruned context dict, or None if the context is not a dict or the
+            template was not found.
+        """
+        # Define this methods identity for functional logging:
+        __id = sys._getframe().f_code.co_name
+        if not isinstance(context, dict):
+            self.log(
+                "{} context expected dict but received: {}".format(
+                    __id,
+                    type(context)
+                ),
+                'error',
+                __id
+            )
+            return None
+        try:
+            analyzed = self._analyze_variables(template)
+        except TemplateNotFound:
+            self.log(
+                "Requested template not found: {}".format(template),
+                'error',
+                __id
+            )
+            return None
+        except Exception as e:
+            self._exception_handler(__id, e)
+            return None
+        if analyzed is None:
+            self.log(
+                "No template loaded, Aborting {}!".format(__id),
+                'error',
+                __id
+            )
+            return None
+        name, variables, unknown = analyzed
+        if unknown:
+            self.log(
+                "{} references templates that can't be analyzed, returning "
+                "the full context.".format(name),
+                'debug',
+                __id
+            )
+            return dict(context)
+        return {
+            key: value for key, value in context.items() if key in variables
+        }
+
+    def render_stream(self, **kwargs):
+        """ Render Template Stream Method
+
+        Class method that will prepare a streamed render of the template
+        loaded in the objects self._loaded_template property. The template
+        is rendered chunk by chunk as the next write call consumes it, so the
+        full rendered output is never held in memory. Accepts the same
+        keyword arguments as the render method.
+        """
+        # Reinitialize the rendered properties
+        self._rendered_template = None
+        self._rendered_stream = None
+        self._bind_lazy(kwargs)
+        try:
+            # Define this methods identity for functional logging:
+            __id = sys._getframe().f_code.co_name
+            self.log(
+                "{} of loaded template requested.".format(__id),
+                'info',
+                __id
+            )
+            if self._native:
+                self.log(
+                    "Streamed renders are not available in native mode!",
+                    'error',
+                    __id
+                )
+            elif (
+                isinstance(self._loaded_template, Template) and
+                hasattr(self._loaded_template, 'generate')
+            ):
+                # Prepare the template stream passing in the kwargs input.
+                self._rendered_stream = \
+                    self._loaded_template.generate(**kwargs)
+                self.log(
+                    "{} stream ready to write!".format(
+                        self._loaded_template
+                    ),
+                    'info',
+                    __id
+                )
+            else:
+                self.log(
+                    "No template loaded, Aborting render!",
+                    'error',
+                    __id
+                )
+        except Exception as e:  # pragma: no cover
+            self._exception_handler(__id, e)  # pragma: no cover
 
-    def write(self, output_directory, output_file, backup=True):
+    def write(
+        self,
+        output_directory,
+        output_file,
+        backup=True,
+        compression=None,
+        skip_unchanged=False
+    ):
         """ Write Rendered Template Method
 
         Class method that will write the rendered jinja template that
         is currently loaded in memory to disk in the specified
-        directory/path location.
+        directory/path location. If a compression format of gzip, bz2 or
+        lzma is given, the output is compressed while it is written and the
+        matching file extension is appended to the output file name. A
+        template stream prepared by render_stream is compressed and written
+        incrementally. If skip_unchanged is enabled and the existing output
+        already holds the rendered content, the output is left untouched,
+        no backup is taken, and the write is reported as successful.
         """
+        if (
+            self._memory_profiler is not None and
+            not self._memory_profiler.active
+        ):
+            return self._memory_profiler.measure(
+                'write',
+                self._template_label(),
+                self.write,
+                (
+                    output_directory,
+                    output_file,
+                    backup,
+                    compression,
+                    skip_unchanged
+                )
+            )
         try:
             # Define this methods identity for functional logging:
-            __id = inspect.stack()[0][3]
+            __id = sys._getframe().f_code.co_name
             self.log(
                 "{} called on rendered template requested.".format(__id),
                 'info',
@@ -667,12 +2259,24 @@ class JinjaUtils(object):
                     'info',
                     __id
                 )
+            if (
+                compression is not None and
+                compression not in COMPRESSION_FORMATS
+            ):
+                self.log(
+                    "Compression expected one of {} but received: {}".format(
+                        list(COMPRESSION_FORMATS),
+                        compression
+                    ),
+                    'error',
+                    __id
+                )
+                return False
 
             # Set the Output Directory and perform directory validation checks
             if (
                 isinstance(output_directory, str) and
-                os.path.exists(output_directory) and
-                not os.path.isfile(output_directory)
+                self._output_backend.isdir(output_directory)
             ):
                 self._output_directory = output_directory
                 self.log(
@@ -687,6 +2291,10 @@ class JinjaUtils(object):
                     head, tail = ntpath.split(output_file)
                     if tail or ntpath.basename(head) is not None:
                         self._output_file = tail or ntpath.basename(head)
+                        if compression is not None:
+                            extension = COMPRESSION_FORMATS[compression][1]
+                            if not self._output_file.endswith(extension):
+                                self._output_file += extension
                         self.log(
                             "Output file has been set to: {}!".format(
                                 self._output_file
@@ -713,16 +2321,47 @@ class JinjaUtils(object):
                 )
                 return False
 
+            # Leave the output untouched if it already holds the content.
+            if (
+                skip_unchanged and
+                self._rendered_stream is None and
+                self._rendered_template is not None and
+                self._output_backend.exists(os.path.join(
+                    self._output_directory,
+                    self._output_file
+                )) and
+                self._is_unchanged(
+                    os.path.join(self._output_directory, self._output_file),
+                    self._rendered_text(),
+                    compression
+                )
+            ):
+                self.log(
+                    "{} is unchanged, skipping write!".format(
+                        self._output_file
+                    ),
+                    'info',
+                    __id
+                )
+                return True
+
             # Check if file back up is enabled and if so backup the file.
-            if os.path.exists(os.path.join(
+            if self._output_backend.exists(os.path.join(
                 self._output_directory,
                 self._output_file
             )):
                 # If backup enabled, make a backup of the file.
                 if self.__backup:
-                    # Separate the filename from the file extention
+                    # Separate the filename from the file extention,
+                    # keeping any compression extention on the backup.
+                    backup_extention = ""
+                    raw_filename = self._output_file
+                    if compression is not None:
+                        raw_filename, backup_extention = os.path.splitext(
+                            raw_filename
+                        )
                     raw_filename, raw_file_extention = os.path.splitext(
-                        self._output_file
+                        raw_filename
                     )
                     backup_timestamp = datetime.now().strftime(
                         "%Y%m%d_%H%M%S"
@@ -733,11 +2372,25 @@ class JinjaUtils(object):
                     )
                     backup_filename = os.path.join(
                         self._output_directory,
-                        "{}_{}.bak".format(
-                            raw_filename, backup_timestamp
+                        "{}_{}.bak{}".format(
+                            raw_filename, backup_timestamp, backup_extention
+                        )
+                    )
+                    if self._instrumented:
+                        started = self._phase_start(
+                            'backup',
+                            self._template_label()
                         )
+                    self._output_backend.copy(
+                        source_filename,
+                        backup_filename
                     )
-                    shutil.copy(source_filename, backup_filename)
+                    if self._instrumented:
+                        self._phase_end(
+                            'backup',
+                            self._template_label(),
+                            started
+                        )
                     self.log(
                         "{} backed up to: {}".format(
                             self._output_file,
@@ -766,7 +2419,10 @@ class JinjaUtils(object):
                 "debug",
                 __id
             )
-            if self.rendered == "No template has been rendered!":
+            if (
+                self._rendered_stream is None and
+                self.rendered == "No template has been rendered!"
+            ):
                 self.log(
                     "Render method not called or failed to render.",
                     'warning',
@@ -779,9 +2435,43 @@ class JinjaUtils(object):
                 )
                 return False
             else:
-                output = open(write_output_file, "w")
-                output.write(self._rendered_template)
-                output.close()
+                # Write the rendered template, consuming any prepared stream.
+                if self._rendered_stream is not None:
+                    content = self._rendered_stream
+                    self._rendered_stream = None
+                else:
+                    content = self._rendered_text()
+                if self._instrumented:
+                    started = self._phase_start(
+                        'write',
+                        self._template_label()
+                    )
+                    try:
+                        written = self._write_content(
+                            write_output_file,
+                            content,
+                            compression
+                        )
+                    except Exception:
+                        self._phase_end(
+                            'write',
+                            self._template_label(),
+                            started,
+                            error=True
+                        )
+                        raise
+                    self._phase_end(
+                        'write',
+                        self._template_label(),
+                        started,
+                        size=written
+                    )
+                else:
+                    self._write_content(
+                        write_output_file,
+                        content,
+                        compression
+                    )
                 self.log(
                     "{} written successfully!".format(write_output_file),
                     "info",
@@ -790,3 +2480,696 @@ class JinjaUtils(object):
                 return True
         except Exception as e:  # pragma: no cover
             self._exception_handler(__id, e)  # pragma: no cover
+
+    def _write_content(self, output_path, content, compression=None):
+        """ Write Content Helper Method
+
+        Internal helper that writes a str, bytes or an iterable of str/bytes
+        chunks (such as a Jinja template stream) to the given output path
+        using the configured output backend. Streamed content is written
+        chunk by chunk as it is produced, and compressed on the fly when a
+        compression format is given. When the backend provides a temporary
+        path, streamed content is written there and only moved to the output
+        path once the stream completes, so a stream that fails part way
+        leaves any existing output untouched.
+
+        Parameters:
+            output_path (str):  required
+            content     (obj):  required
+            compression (str):  optional [default=None]
+
+        Returns:
+            Number of bytes written to the output file, before compression.
+        """
+        backend = self._output_backend
+        if isinstance(content, (str, bytes, bytearray, memoryview)):
+            content = (content,)
+            temporary_path = None
+        else:
+            temporary_path = backend.temporary_path(output_path)
+        binary = backend.open(temporary_path or output_path)
+        streams = [binary]
+        try:
+            try:
+                if compression is not None:
+                    streams.append(
+                        importlib.import_module(
+                            COMPRESSION_FORMATS[compression][0]
+                        ).open(binary, "wb")
+                    )
+
+                # Write each chunk, encoding text chunks to count their
+                # bytes.
+                written = 0
+                output = streams[-1]
+                for chunk in content:
+                    if isinstance(chunk, str):
+                        chunk = _encode_text(chunk)
+                    written += output.write(chunk)
+            finally:
+                for stream in reversed(streams):
+                    stream.close()
+        except BaseException:
+            if temporary_path is not None:
+                backend.remove(temporary_path)
+            raise
+        if temporary_path is not None:
+            backend.replace(temporary_path, output_path)
+        return written
+
+    def _is_unchanged(self, output_path, content, compression=None):
+        """ Unchanged Output Helper Method
+
+        Internal helper that returns True if the existing output at the path
+        holds exactly the bytes that writing the str or bytes content would
+        produce, decompressing the existing output when a compression format
+        is given. Streamed content and unreadable outputs are treated as
+        changed.
+        """
+        if isinstance(content, str):
+            content = _encode_text(content)
+        elif not isinstance(content, (bytes, bytearray, memoryview)):
+            return False
+        try:
+            existing = self._output_backend.read(output_path)
+            if compression is not None:
+                existing = importlib.import_module(
+                    COMPRESSION_FORMATS[compression][0]
+                ).decompress(existing)
+        except Exception:
+            return False
+        return existing == content
+
+    def write_many(
+        self,
+        items,
+        backup=True,
+        max_workers=None,
+        compression=None,
+        skip_unchanged=False
+    ):
+        """ Write Many Method
+
+        Class method that will write a batch of outputs in a single call.
+        Each item is an (output_path, content) pair where the content can be
+        a str, bytes, or a stream of str/bytes chunks. Each distinct output
+        directory is validated once, missing directories are created up
+        front, and the file writes are run on a bounded thread pool. An
+        output path listed more than once is written once, and its later
+        items are reported as errors, so workers never write the same file.
+        The compression and skip_unchanged options behave the same as they
+        do for the write method, unchanged outputs are counted separately
+        from written outputs, and bytes_written counts the encoded bytes
+        before compression.
+
+        Parameters:
+            items          (list): required
+            backup         (bool): optional [default=True]
+            max_workers    (int):  optional [default=None]
+            compression    (str):  optional [default=None]
+            skip_unchanged (bool): optional [default=False]
+
+        Returns:
+            dict of aggregate write stats with per item errors, or
+            False if the provided items could not be processed.
+        """
+        try:
+            # Define this methods identity for functional logging:
+            __id = sys._getframe().f_code.co_name
+            self.log(
+                "{} called on {} requested.".format(__id, type(items)),
+                'info',
+                __id
+            )
+
+            # Set local method variables
+            if not isinstance(backup, bool):
+                self.log(
+                    "Backup expected bool value but received type: {}".format(
+                        type(backup)
+                    ),
+                    'warning',
+                    __id
+                )
+                self.log(
+                    "Setting backup to default setting...",
+                    'warning',
+                    __id
+                )
+                backup = True
+            if (
+                max_workers is not None and
+                (not isinstance(max_workers, int) or max_workers < 1)
+            ):
+                self.log(
+                    "max_workers expected int > 0 but received: {}".format(
+                        max_workers
+                    ),
+                    'warning',
+                    __id
+                )
+                max_workers = None
+            if (
+                compression is not None and
+                compression not in COMPRESSION_FORMATS
+            ):
+                self.log(
+                    "Compression expected one of {} but received: {}".format(
+                        list(COMPRESSION_FORMATS),
+                        compression
+                    ),
+                    'error',
+                    __id
+                )
+                return False
+            if isinstance(items, (str, bytes)) or not hasattr(
+                items, '__iter__'
+            ):
+                self.log(
+                    "{} expected iterable of items but received: {}".format(
+                        __id,
+                        type(items)
+                    ),
+                    'error',
+                    __id
+                )
+                return False
+
+            stats = {
+                'total': 0,
+                'written': 0,
+                'unchanged': 0,
+                'failed': 0,
+                'backups': 0,
+                'bytes_written': 0,
+                'directories_validated': 0,
+                'directories_created': 0,
+                'errors': {}
+            }
+
+            # Group the requested outputs by their target directory.
+            directories = {}
+            output_paths = set()
+            for item in items:
+                stats['total'] += 1
+                if (
+                    not isinstance(item, (tuple, list)) or
+                    len(item) != 2 or
+                    not isinstance(item[0], str) or
+                    not item[0]
+                ):
+                    stats['failed'] += 1
+                    stats['errors'][repr(item)[:80]] = (
+                        "Item expected (output_path, content) pair."
+                    )
+                    continue
+                output_path = item[0]
+                if compression is not None:
+                    extension = COMPRESSION_FORMATS[compression][1]
+                    if not output_path.endswith(extension):
+                        output_path += extension
+                output_directory, output_file = os.path.split(output_path)
+                if not output_file:
+                    stats['failed'] += 1
+                    stats['errors'][output_path] = (
+                        "Output path has no filename."
+                    )
+                    continue
+                normalized_path = os.path.normpath(output_path)
+                if normalized_path in output_paths:
+                    stats['failed'] += 1
+                    stats['errors'][output_path] = (
+                        "Output path is listed more than once in the batch."
+                    )
+                    continue
+                output_paths.add(normalized_path)
+                directories.setdefault(output_directory or os.curdir, []) \
+                    .append((output_path, output_file, item[1]))
+
+            # Validate each directory once, creating any that are missing and
+            # collecting the existing file names for the backup checks.
+            write_queue = []
+            for output_directory in sorted(directories):
+                pending = directories[output_directory]
+                stats['directories_validated'] += 1
+                try:
+                    existing_files = set(
+                        self._output_backend.listdir(output_directory)
+                    )
+                except FileNotFoundError:
+                    try:
+                        self._output_backend.makedirs(output_directory)
+                        stats['directories_created'] += 1
+                        existing_files = set()
+                        self.log(
+                            "Created output directory: {}".format(
+                                output_directory
+                            ),
+                            'debug',
+                            __id
+                        )
+                    except OSError as e:
+                        for output_path, _, _ in pending:
+                            stats['failed'] += 1
+                            stats['errors'][output_path] = str(e)
+                        continue
+                except OSError as e:
+                    for output_path, _, _ in pending:
+                        stats['failed'] += 1
+                        stats['errors'][output_path] = (
+                            "Invalid output directory: {}".format(e)
+                        )
+                    continue
+                for output_path, output_file, content in pending:
+                    write_queue.append((
+                        output_path,
+                        output_file,
+                        content,
+                        output_file in existing_files
+                    ))
+
+            # Write the queued outputs using a bounded worker pool.
+            backup_timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+
+            # Phases are labelled with the loaded template, as they are by
+            # the write method, such as the template rendered by render_many.
+            instrumented = self._instrumented
+            label = self._template_label()
+
+            def write_item(queued_item):
+                output_path, output_file, content, exists = queued_item
+                if (
+                    skip_unchanged and
+                    exists and
+                    self._is_unchanged(output_path, content, compression)
+                ):
+                    return None
+                needs_backup = backup and exists
+                if needs_backup:
+                    if instrumented:
+                        started = self._phase_start('backup', label)
+                    raw_filename, backup_extention = output_path, ""
+                    if compression is not None:
+                        raw_filename, backup_extention = os.path.splitext(
+                            raw_filename
+                        )
+                    raw_filename, _ = os.path.splitext(raw_filename)
+                    self._output_backend.copy(
+                        output_path,
+                        "{}_{}.bak{}".format(
+                            raw_filename,
+                            backup_timestamp,
+                            backup_extention
+                        )
+                    )
+                    if instrumented:
+                        self._phase_end('backup', label, started)
+                if instrumented:
+                    started = self._phase_start('write', label)
+                try:
+                    written = self._write_content(
+                        output_path,
+                        content,
+                        compression
+                    )
+                except Exception:
+                    if instrumented:
+                        self._phase_end('write', label, started, error=True)
+                    raise
+                if instrumented:
+                    self._phase_end('write', label, started, size=written)
+                return written, needs_backup
+
+            def write_queued(results):
+                for queued_item, result in zip(write_queue, results):
+                    output_path = queued_item[0]
+                    if isinstance(result, Exception):
+                        stats['failed'] += 1
+                        stats['errors'][output_path] = str(result)
+                        self.log(
+                            "Failed to write {}: {}".format(
+                                output_path,
+                                result
+                            ),
+                            'error',
+                            __id
+                        )
+                    elif result is None:
+                        stats['unchanged'] += 1
+                    else:
+                        stats['written'] += 1
+                        stats['bytes_written'] += result[0]
+                        stats['backups'] += int(result[1])
+
+            if len(write_queue) == 1 or max_workers == 1:
+                # A single output is written inline, without the cost of
+                # starting a worker pool.
+                write_queued(
+                    self._safe_call(write_item, queued)
+                    for queued in write_queue
+                )
+            elif write_queue:
+                from concurrent.futures import ThreadPoolExecutor
+                with ThreadPoolExecutor(max_workers=max_workers) as executor:
+                    write_queued(executor.map(
+                        lambda queued: self._safe_call(write_item, queued),
+                        write_queue
+                    ))
+
+            self.log(
+                "{} of {} outputs written successfully!".format(
+                    stats['written'],
+                    stats['total']
+                ),
+                'info',
+                __id
+            )
+            return stats
+        except Exception as e:  # pragma: no cover
+            self._exception_handler(__id, e)  # pragma: no cover
+            return False  # pragma: no cover
+
+    def render_many(
+        self,
+        records,
+        output_pattern,
+        output_directory=None,
+        context=None,
+        chunk_size=1000,
+        backup=True,
+        max_workers=None,
+        compression=None,
+        skip_unchanged=False
+    ):
+        """ Render Many Method
+
+        Class method that renders the loaded template once for each record of
+        an iterable of dicts, or of a JSON Lines, CSV, TSV or newline delimited
+        file read record by record, and writes each output to the path given
+        by the output_pattern template. Records are consumed lazily and the
+        rendered outputs are written with write_many in chunks of chunk_size,
+        so memory use depends on the chunk size and not on the number of
+        records. Each record is rendered with the context dict updated with
+        the record, and the output_pattern is rendered with the same values
+        and the zero based record index, for example
+        "reports/{{ region }}/{{ index }}.txt". Relative output paths are
+        joined to output_directory, and records whose output path resolves
+        outside of output_directory are counted as failed. The backup,
+        max_workers, compression and skip_unchanged options are passed to
+        write_many.
+
+        Parameters:
+            records          (iter|str): required
+            output_pattern   (str):      required
+            output_directory (str):      optional [default=None]
+            context          (dict):     optional [default=None]
+            chunk_size       (int):      optional [default=1000]
+            backup           (bool):     optional [default=True]
+            max_workers      (int):      optional [default=None]
+            compression      (str):      optional [default=None]
+            skip_unchanged   (bool):     optional [default=False]
+
+        Returns:
+            dict of aggregate render and write stats, or False if the
+            provided arguments could not be processed.
+        """
+        try:
+            # Define this methods identity for functional logging:
+            __id = sys._getframe().f_code.co_name
+            self.log(
+                "{} of loaded template requested.".format(__id),
+                'info',
+                __id
+            )
+            if not isinstance(self._loaded_template, Template):
+                self.log(
+                    "No template loaded, Aborting render!",
+                    'error',
+                    __id
+                )
+                return False
+            if not isinstance(output_pattern, str) or not output_pattern:
+                self.log(
+                    "output_pattern expected str but received: {}".format(
+                        type(output_pattern)
+                    ),
+                    'error',
+                    __id
+                )
+                return False
+            if not isinstance(chunk_size, int) or chunk_size < 1:
+                self.log(
+                    "chunk_size expected int > 0 but received: {}".format(
+                        chunk_size
+                    ),
+                    'error',
+                    __id
+                )
+                return False
+            if (
+                compression is not None and
+                compression not in COMPRESSION_FORMATS
+            ):
+                self.log(
+                    "Compression expected one of {} but received: {}".format(
+                        list(COMPRESSION_FORMATS),
+                        compression
+                    ),
+                    'error',
+                    __id
+                )
+                return False
+            if context is not None and not isinstance(context, dict):
+                self.log(
+                    "context expected dict but received: {}".format(
+                        type(context)
+                    ),
+                    'error',
+                    __id
+                )
+                return False
+
+            from .sources import read_records
+            if isinstance(records, (str, os.PathLike)):
+                records = read_records(records)
+            if self._jinja_tpl_library is not None:
+                pattern = self._jinja_tpl_library.from_string(output_pattern)
+            else:
+                pattern = Template(output_pattern)
+
+            stats = {
+                'records': 0,
+                'rendered': 0,
+                'written': 0,
+                'unchanged': 0,
+                'failed': 0,
+                'backups': 0,
+                'bytes_written': 0,
+                'chunks': 0,
+                'errors': {}
+            }
+
+            def record_error(key, message):
+                stats['failed'] += 1
+                if len(stats['errors']) < MAX_RECORDED_ERRORS:
+                    stats['errors'][key] = message
+
+            def collect(written):
+                if written is False:
+                    record_error(
+                        "chunk {}".format(stats['chunks']),
+                        "Failed to write chunk."
+                    )
+                    return
+                for key in (
+                    'written', 'unchanged', 'backups', 'bytes_written'
+                ):
+                    stats[key] += written[key]
+                for output_path, message in written['errors'].items():
+                    record_error(output_path, message)
+
+            # Each chunk is written on a background thread while the next
+            # chunk is rendered, so at most two chunks are held in memory.
+            from concurrent.futures import ThreadPoolExecutor
+            writer = ThreadPoolExecutor(max_workers=1)
+            pending = []
+            items = []
+
+            def flush():
+                if pending:
+                    collect(pending.pop().result())
+                if items:
+                    stats['chunks'] += 1
+                    pending.append(writer.submit(
+                        self.write_many,
+                        list(items),
+                        backup=backup,
+                        max_workers=max_workers,
+                        compression=compression,
+                        skip_unchanged=skip_unchanged
+                    ))
+                    del items[:]
+
+            base_context = context or {}
+            if output_directory is not None:
+                real_directory = os.path.realpath(output_directory)
+            records = iter(records)
+            index = 0
+            try:
+                while True:
+                    try:
+                        record = next(records)
+                    except StopIteration:
+                        break
+                    except (OSError, ValueError) as e:
+                        # The record source failed, the records already
+                        # read are still written.
+                        record_error("record {}".format(index), str(e))
+                        self.log(
+                            "Failed to read record {}: {}".format(index, e),
+                            'error',
+                            __id
+                        )
+                        break
+                    stats['records'] += 1
+                    if not isinstance(record, Mapping):
+                        record_error(
+                            "record {}".format(index),
+                            "Record expected dict but received: {}".format(
+                                type(record)
+                            )
+                        )
+                        index += 1
+                        continue
+                    values = dict(base_context)
+                    values.update(record)
+                    try:
+                        output_path = str(
+                            pattern.render(values, index=index)
+                        )
+                    except Exception as e:
+                        record_error(
+                            "record {}".format(index),
+                            "Invalid output_pattern: {}".format(e)
+                        )
+                        index += 1
+                        continue
+                    if output_directory is not None:
+                        output_path = os.path.normpath(os.path.join(
+                            output_directory,
+                            output_path
+                        ))
+                        # Absolute or parent relative paths rendered from
+                        # record fields must not escape output_directory.
+                        real_path = os.path.realpath(output_path)
+                        if os.path.commonpath(
+                            [real_directory, real_path]
+                        ) != real_directory:
+                            record_error(
+                                output_path,
+                                "Output path is outside the output "
+                                "directory."
+                            )
+                            index += 1
+                            continue
+                    try:
+                        self.render(**values)
+                    except TypeError:
+                        # Record keys that are not str.
+                        self._rendered_template = None
+                    if self._rendered_template is None:
+                        record_error(
+                            output_path,
+                            "Failed to render record {}".format(index)
+                        )
+                    else:
+                        stats['rendered'] += 1
+                        items.append((output_path, self._rendered_text()))
+                        self._rendered_template = None
+                    index += 1
+                    if len(items) >= chunk_size:
+                        flush()
+                flush()
+                flush()
+            finally:
+                writer.shutdown()
+
+            self.log(
+                "{} of {} records written successfully!".format(
+                    stats['written'],
+                    stats['records']
+                ),
+                'info',
+                __id
+            )
+            return stats
+        except Exception as e:  # pragma: no cover
+            self._exception_handler(__id, e)  # pragma: no cover
+            return False  # pragma: no cover
+
+    def archive(self, archive_path, archive_format=None, compression=None):
+        """ Archive Output Method
+
+        Class method that returns a TemplateArchive context manager that
+        writes rendered or streamed template output directly into a tar or
+        zip archive as archive members, in a single pass with no intermediate
+        files. The archive format and compression are inferred from the
+        archive file extention when they are not provided.
+
+        Parameters:
+            archive_path   (str): required
+            archive_format (str): optional [default=None]
+            compression    (str): optional [default=None]
+
+        Returns:
+            TemplateArchive object, or None if the archive can't be created.
+        """
+        try:
+            # Define this methods identity for functional logging:
+            __id = sys._getframe().f_code.co_name
+            self.log(
+                "{} output requested for: {}".format(__id, archive_path),
+                'info',
+                __id
+            )
+            if not isinstance(archive_path, str):
+                self.log(
+                    "Archive path expected str but received: {}".format(
+                        type(archive_path)
+                    ),
+                    'error',
+                    __id
+                )
+                return None
+            archive_directory = os.path.dirname(archive_path)
+            if archive_directory and not os.path.isdir(archive_directory):
+                self.log(
+                    "Invalid archive directory specified in {} call".format(
+                        __id
+                    ),
+                    'error',
+                    __id
+                )
+                return None
+            from .archive import TemplateArchive
+            return TemplateArchive(
+                self,
+                archive_path,
+                archive_format=archive_format,
+                compression=compression
+            )
+        except Exception as e:
+            self._exception_handler(__id, e)
+            return None
+
+    @staticmethod
+    def _safe_call(function, *args):
+        """ Safe Call Helper Method
+
+        Internal helper that calls the provided function, returning any raised
+        exception as the result so that worker threads never raise.
+        """
+        try:
+            return function(*args)
+        except Exception as e:
+            return e
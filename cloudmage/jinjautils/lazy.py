@@ -0,0 +1,260 @@
+##############################################################################
+# CloudMage : JinjaUtils Lazy and Shared Context Values
+# ============================================================================
+# CloudMage Jinja Helper Object Utility/Library
+#   - Compute expensive context values only when a template reads them, and
+#     share global context values across renders without copying them.
+# Author: Richard Nason rnason@cloudmage.io
+# Project Start: 2/13/2020
+# License: GNU GPLv3
+##############################################################################
+
+###############
+# Imports:    #
+###############
+# Import Pip Installed Modules:
+from jinja2.runtime import Context
+from jinja2.utils import missing
+
+# Import Base Python Modules
+from time import perf_counter
+import operator
+
+
+#####################
+# Class Definition: #
+#####################
+class LazyValue(object):
+    """ CloudMage Lazy Context Value Class
+
+    Wraps a function, and the arguments to call it with, that computes a
+    template context value. Passed to render as a keyword argument, the
+    function is only called when the template first reads the variable, and
+    its result is reused for the rest of the render, including included and
+    imported templates. Templates that never reference the variable never
+    call the function.
+    """
+
+    __slots__ = ('function', 'args', 'kwargs', '_value', '_resolved',
+                 'seconds')
+
+    def __init__(self, function, *args, **kwargs):
+        """ LazyValue Class Constructor
+
+        Parameters:
+            function (callable): required
+
+        Attributes:
+            self.function  (callable) : public
+            self.args      (tuple)    : public
+            self.kwargs    (dict)     : public
+            self.seconds   (float)    : public
+            self._value    (obj)      : private
+            self._resolved (bool)     : private
+        """
+        if not callable(function):
+            raise TypeError(
+                "function expected callable but received: {}".format(
+                    type(function)
+                )
+            )
+        self.function = function
+        self.args = args
+        self.kwargs = kwargs
+        self._value = None
+        self._resolved = False
+        self.seconds = 0.0
+
+    @property
+    def resolved(self):
+        """ Return True once the value has been computed. """
+        return self._resolved
+
+    def resolve(self):
+        """ Return the value, calling the function on the first call. """
+        if not self._resolved:
+            started = perf_counter()
+            self._value = self.function(*self.args, **self.kwargs)
+            self.seconds = perf_counter() - started
+            self._resolved = True
+        return self._value
+
+    def bind(self):
+        """ Return a new unresolved LazyValue calling the same function, so
+        each render computes and memoizes its own value.
+        """
+        return type(self)(self.function, *self.args, **self.kwargs)
+
+    def __repr__(self):
+        return "LazyValue({}, resolved={})".format(
+            getattr(self.function, '__name__', self.function),
+            self._resolved
+        )
+
+
+def _resolved(method):
+    """ Return a LazyProxy method that calls method on the resolved value. """
+    def proxy_method(self, *args):
+        return method(self._lazy.resolve(), *args)
+    proxy_method.__name__ = method.__name__
+    return proxy_method
+
+
+class LazyProxy(object):
+    """ CloudMage Lazy Context Value Proxy Class
+
+    Stands in for a LazyValue in a render. Jinja looks up every variable a
+    template references when the template starts rendering, including
+    variables only read within a branch that is never taken, so templates
+    receive this proxy and the LazyValue is only resolved once the value is
+    actually used, by output, attribute or item access, iteration, tests,
+    comparisons, arithmetic or a call.
+    """
+
+    __slots__ = ('_lazy',)
+
+    def __init__(self, lazy):
+        """ LazyProxy Class Constructor
+
+        Parameters:
+            lazy (LazyValue): required
+
+        Attributes:
+            self._lazy (LazyValue) : private
+        """
+        self._lazy = lazy
+
+    @property
+    def __class__(self):
+        # Report the class of the resolved value, so isinstance checks made
+        # by Jinja tests and filters see the value rather than the proxy.
+        return self._lazy.resolve().__class__
+
+    def __getattr__(self, name):
+        return getattr(self._lazy.resolve(), name)
+
+    def __setattr__(self, name, value):
+        if name == '_lazy':
+            object.__setattr__(self, name, value)
+        else:
+            setattr(self._lazy.resolve(), name, value)
+
+    def __dir__(self):
+        return dir(self._lazy.resolve())
+
+    def __hash__(self):
+        return hash(self._lazy.resolve())
+
+    def __format__(self, format_spec):
+        return format(self._lazy.resolve(), format_spec)
+
+    def __bool__(self):
+        return bool(self._lazy.resolve())
+
+    def __round__(self, *args):
+        return round(self._lazy.resolve(), *args)
+
+    __str__ = _resolved(str)
+    __repr__ = _resolved(repr)
+    __bytes__ = _resolved(bytes)
+    __len__ = _resolved(len)
+    __iter__ = _resolved(iter)
+    __reversed__ = _resolved(reversed)
+    __int__ = _resolved(int)
+    __float__ = _resolved(float)
+    __abs__ = _resolved(abs)
+    __neg__ = _resolved(operator.neg)
+    __pos__ = _resolved(operator.pos)
+    __invert__ = _resolved(operator.invert)
+    __index__ = _resolved(operator.index)
+    __contains__ = _resolved(operator.contains)
+    __getitem__ = _resolved(operator.getitem)
+    __setitem__ = _resolved(operator.setitem)
+    __delitem__ = _resolved(operator.delitem)
+    __eq__ = _resolved(operator.eq)
+    __ne__ = _resolved(operator.ne)
+    __lt__ = _resolved(operator.lt)
+    __le__ = _resolved(operator.le)
+    __gt__ = _resolved(operator.gt)
+    __ge__ = _resolved(operator.ge)
+    __add__ = _resolved(operator.add)
+    __sub__ = _resolved(operator.sub)
+    __mul__ = _resolved(operator.mul)
+    __truediv__ = _resolved(operator.truediv)
+    __floordiv__ = _resolved(operator.floordiv)
+    __mod__ = _resolved(operator.mod)
+    __pow__ = _resolved(operator.pow)
+    __and__ = _resolved(operator.and_)
+    __or__ = _resolved(operator.or_)
+    __xor__ = _resolved(operator.xor)
+
+    def __radd__(self, other):
+        return other + self._lazy.resolve()
+
+    def __rsub__(self, other):
+        return other - self._lazy.resolve()
+
+    def __rmul__(self, other):
+        return other * self._lazy.resolve()
+
+    def __rtruediv__(self, other):
+        return other / self._lazy.resolve()
+
+    def __rfloordiv__(self, other):
+        return other // self._lazy.resolve()
+
+    def __rmod__(self, other):
+        return other % self._lazy.resolve()
+
+    def __rpow__(self, other):
+        return other ** self._lazy.resolve()
+
+    def __call__(self, *args, **kwargs):
+        return self._lazy.resolve()(*args, **kwargs)
+
+
+def resolve_lazy(value):
+    """ Return the value behind a LazyProxy, or the value itself. """
+    if type(value) is LazyProxy:
+        return value._lazy.resolve()
+    return value
+
+
+def lazy_json_default(value):
+    """ json.dumps default hook that serializes the value behind a
+    LazyProxy, and rejects any other object json can't serialize.
+    """
+    if type(value) is LazyProxy:
+        return value._lazy.resolve()
+    raise TypeError(
+        "Object of type {} is not JSON serializable".format(
+            type(value).__name__
+        )
+    )
+
+
+class LazyContext(Context):
+    """ Jinja template Context that returns a LazyProxy for LazyValue
+    variables, resolving them when a template first uses them, and falls
+    back to shared globals for variables that are not passed to the render.
+    """
+
+    # Shared globals, set on the context class created for each JinjaUtils
+    # instance. template_globals maps template names to their own globals,
+    # which take precedence over the environment_globals.
+    environment_globals = {}
+    template_globals = {}
+
+    def resolve_or_missing(self, key):
+        value = Context.resolve_or_missing(self, key)
+        if value is missing:
+            template_globals = self.template_globals.get(self.name)
+            if template_globals is not None and key in template_globals:
+                value = template_globals[key]
+            elif key in self.environment_globals:
+                value = self.environment_globals[key]
+            else:
+                return missing
+        if isinstance(value, LazyValue):
+            return LazyProxy(value)
+        return value
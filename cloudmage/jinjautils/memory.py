@@ -0,0 +1,268 @@
+##############################################################################
+# CloudMage : Jinja Template Memory Profiler
+# ============================================================================
+# CloudMage Jinja Helper Object Utility/Library
+#   - Measure peak and retained memory of the load, render and write steps.
+# Author: Richard Nason rnason@cloudmage.io
+# Project Start: 2/13/2020
+# License: GNU GPLv3
+##############################################################################
+
+###############
+# Imports:    #
+###############
+# Import Base Python Modules
+import tracemalloc
+import sys
+
+
+# Container types walked when estimating the size of a render context.
+_CONTAINERS = (dict, list, tuple, set, frozenset)
+
+
+def deep_sizeof(value, limit=100000):
+    """ Deep Size Function
+
+    Estimate the memory held by a value and the dicts, lists, tuples and
+    sets it contains, counting shared objects once. At most limit objects
+    are visited so very large contexts are measured in bounded time.
+
+    Parameters:
+        value (obj): required
+        limit (int): optional [default=100000]
+
+    Returns:
+        int estimated size in bytes.
+    """
+    seen = set()
+    pending = [value]
+    size = 0
+    while pending and len(seen) < limit:
+        item = pending.pop()
+        if id(item) in seen:
+            continue
+        seen.add(id(item))
+        size += sys.getsizeof(item)
+        if isinstance(item, dict):
+            pending.extend(item.keys())
+            pending.extend(item.values())
+        elif isinstance(item, _CONTAINERS):
+            pending.extend(item)
+    return size
+
+
+#####################
+# Class Definition: #
+#####################
+class MemoryProfiler(object):
+    """ CloudMage Jinja Memory Profiler Class
+
+    This class measures each load, render and write call with tracemalloc.
+    The peak is the highest traced memory above the level at the start of
+    the call, and retained memory is what is still allocated when the call
+    returns, such as the compiled template added to the Environment cache
+    or the rendered output string. When sites is non zero, a snapshot is
+    taken around each call and the source lines that retained the most
+    memory are recorded. Renders whose output is more than amplification
+    times the size of their context are flagged.
+    """
+
+    def __init__(self, sites=10, amplification=10.0):
+        """ MemoryProfiler Class Constructor
+
+        Parameters:
+            sites         (int):   optional [default=10]
+            amplification (float): optional [default=10.0]
+
+        Attributes:
+            self._sites         (int)   : private
+            self._amplification (float) : private
+            self._entries       (dict)  : private
+            self._renders       (dict)  : private
+            self._started       (bool)  : private
+            self.active         (bool)  : public
+        """
+        self._sites = sites
+        self._amplification = amplification
+        self._entries = {}
+        self._renders = {}
+        self._started = not tracemalloc.is_tracing()
+        if self._started:
+            tracemalloc.start()
+        self.active = False
+
+    @property
+    def amplification(self):
+        """ Return the output to context size ratio that flags a render. """
+        return self._amplification
+
+    def close(self):
+        """ Stop tracemalloc if it was started by this profiler. """
+        if self._started and tracemalloc.is_tracing():
+            tracemalloc.stop()
+        self._started = False
+
+    def reset(self):
+        """ Discard all collected measurements. """
+        self._entries = {}
+        self._renders = {}
+
+    def measure(self, phase, template, function, args=(), kwargs=None):
+        """ Measure Method
+
+        Call function with the given arguments while measuring its memory
+        use, record the measurement for the phase and template and return
+        the function result. The template can be a callable returning the
+        template name, called once the function returns, so a load can be
+        keyed by the name of the template it loaded. The active attribute is
+        set for the duration of the call so the measured method can detect
+        that it is already being measured.
+
+        Parameters:
+            phase    (str):      required
+            template (str|callable): required
+            function (callable): required
+            args     (tuple):    optional [default=()]
+            kwargs   (dict):     optional [default=None]
+        """
+        if not tracemalloc.is_tracing():
+            # Tracing was stopped by its owner since this profiler started.
+            tracemalloc.start()
+            self._started = True
+        before = self._snapshot()
+        tracemalloc.reset_peak()
+        baseline = tracemalloc.get_traced_memory()[0]
+        self.active = True
+        try:
+            return function(*args, **(kwargs or {}))
+        finally:
+            self.active = False
+            current, peak = tracemalloc.get_traced_memory()
+            after = self._snapshot()
+            self._record(
+                phase,
+                template() if callable(template) else template,
+                max(0, peak - baseline),
+                current - baseline,
+                self._top_sites(before, after)
+            )
+
+    def record_render(self, template, context, output):
+        """ Record Render Method
+
+        Record the context and output size of a completed render, returning
+        True if the output is more than the amplification threshold times
+        the size of the context.
+
+        Parameters:
+            template (str): required
+            context  (dict): required
+            output   (str): required
+        """
+        context_bytes = deep_sizeof(context)
+        output_bytes = sys.getsizeof(output)
+        ratio = output_bytes / context_bytes if context_bytes else 0.0
+        flagged = ratio > self._amplification
+        self._renders[template] = {
+            'context_bytes': context_bytes,
+            'output_bytes': output_bytes,
+            'ratio': ratio,
+            'flagged': flagged
+        }
+        return flagged
+
+    def _snapshot(self):
+        """ Take a filtered tracemalloc snapshot when sites are enabled. """
+        if not self._sites:
+            return None
+        return tracemalloc.take_snapshot().filter_traces((
+            tracemalloc.Filter(False, tracemalloc.__file__),
+            tracemalloc.Filter(False, __file__),
+        ))
+
+    def _top_sites(self, before, after):
+        """ Return the source lines that retained the most memory. """
+        if before is None or after is None:
+            return []
+        sites = []
+        for statistic in after.compare_to(before, 'lineno'):
+            if statistic.size_diff <= 0:
+                continue
+            frame = statistic.traceback[0]
+            sites.append({
+                'location': "{}:{}".format(frame.filename, frame.lineno),
+                'size': statistic.size_diff,
+                'count': statistic.count_diff
+            })
+            if len(sites) >= self._sites:
+                break
+        return sites
+
+    def _record(self, phase, template, peak, retained, sites):
+        """ Add a measurement to the phase and template entry. """
+        templates = self._entries.setdefault(phase, {})
+        entry = templates.get(template)
+        if entry is None:
+            entry = templates[template] = {
+                'count': 0,
+                'peak': 0,
+                'last_peak': 0,
+                'retained': 0,
+                'last_retained': 0,
+                'sites': {}
+            }
+        entry['count'] += 1
+        entry['peak'] = max(entry['peak'], peak)
+        entry['last_peak'] = peak
+        entry['retained'] += retained
+        entry['last_retained'] = retained
+        for site in sites:
+            total = entry['sites'].setdefault(
+                site['location'], {'size': 0, 'count': 0}
+            )
+            total['size'] += site['size']
+            total['count'] += site['count']
+
+    def report(self, template=None, limit=None):
+        """ Report Method
+
+        Return the collected measurements in the format:
+        {'phases': {phase: {template: {count, peak, last_peak, retained,
+        last_retained, sites}}}, 'renders': {template: {context_bytes,
+        output_bytes, ratio, flagged}}} where peak is the largest peak in
+        bytes, retained is the total bytes retained across calls and sites
+        is a list of {location, size, count} entries, largest first.
+
+        Parameters:
+            template (str): optional [default=None]
+            limit    (int): optional [default=None]
+        """
+        phases = {}
+        for phase, templates in self._entries.items():
+            for name, entry in templates.items():
+                if template is not None and name != template:
+                    continue
+                sites = sorted(
+                    (
+                        {
+                            'location': location,
+                            'size': total['size'],
+                            'count': total['count']
+                        }
+                        for location, total in entry['sites'].items()
+                    ),
+                    key=lambda site: site['size'],
+                    reverse=True
+                )
+                phases.setdefault(phase, {})[name] = dict(
+                    entry,
+                    sites=sites[:limit] if limit is not None else sites
+                )
+        return {
+            'phases': phases,
+            'renders': {
+                name: dict(entry)
+                for name, entry in self._renders.items()
+                if template is None or name == template
+            }
+        }
@@ -0,0 +1,174 @@
+##############################################################################
+# CloudMage : Jinja Template Pipeline Metrics
+# ============================================================================
+# CloudMage Jinja Helper Object Utility/Library
+#   - Collect per phase timing, size and error metrics for JinjaUtils.
+# Author: Richard Nason rnason@cloudmage.io
+# Project Start: 2/13/2020
+# License: GNU GPLv3
+##############################################################################
+
+###############
+# Imports:    #
+###############
+# Import Base Python Modules
+from bisect import bisect_left
+import threading
+
+
+# Pipeline phases instrumented by JinjaUtils.
+PHASES = ('lookup', 'compile', 'render', 'backup', 'write')
+
+# Latency histogram bucket upper bounds in seconds, the last bucket
+# collects everything above the largest bound.
+LATENCY_BUCKETS = (
+    0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01,
+    0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0
+)
+
+
+#####################
+# Class Definition: #
+#####################
+class PhaseMetrics(object):
+    """ CloudMage Jinja Phase Metrics Class
+
+    This class collects latency histograms, output byte counts and error
+    counts for each JinjaUtils pipeline phase, keyed by template name.
+    Recording is thread safe so metrics can be collected from the write_many
+    worker threads. Each update holds a single lock for a few dict updates,
+    which costs no measurable time when uncontended, as the read, modify and
+    write of the counters is not atomic without it.
+    """
+
+    def __init__(self, buckets=LATENCY_BUCKETS):
+        """ PhaseMetrics Class Constructor
+
+        Parameters:
+            buckets (tuple): optional [default=LATENCY_BUCKETS]
+
+        Attributes:
+            self._buckets  (tuple) : private
+            self._phases   (dict)  : private
+            self._counters (dict)  : private
+            self._lock     (obj)   : private
+        """
+        self._buckets = tuple(sorted(buckets))
+        self._phases = {}
+        self._counters = {}
+        self._lock = threading.Lock()
+
+    @property
+    def buckets(self):
+        """ Return the latency histogram bucket upper bounds. """
+        return self._buckets
+
+    def record(self, phase, template, seconds, size=None, error=False):
+        """ Record Phase Method
+
+        Record a single execution of a pipeline phase.
+
+        Parameters:
+            phase    (str):   required
+            template (str):   required
+            seconds  (float): required
+            size     (int):   optional [default=None]
+            error    (bool):  optional [default=False]
+        """
+        bucket = bisect_left(self._buckets, seconds)
+        with self._lock:
+            templates = self._phases.get(phase)
+            if templates is None:
+                templates = self._phases[phase] = {}
+            entry = templates.get(template)
+            if entry is None:
+                entry = templates[template] = {
+                    'count': 0,
+                    'errors': 0,
+                    'seconds': 0.0,
+                    'min': seconds,
+                    'max': seconds,
+                    'bytes': 0,
+                    'histogram': [0] * (len(self._buckets) + 1)
+                }
+            entry['count'] += 1
+            entry['seconds'] += seconds
+            entry['histogram'][bucket] += 1
+            if seconds < entry['min']:
+                entry['min'] = seconds
+            if seconds > entry['max']:
+                entry['max'] = seconds
+            if size:
+                entry['bytes'] += size
+            if error:
+                entry['errors'] += 1
+
+    def increment(self, counter, template, value=1):
+        """ Increment Counter Method
+
+        Increment a named event counter, such as template cache hits, for
+        the given template.
+
+        Parameters:
+            counter  (str): required
+            template (str): required
+            value    (int): optional [default=1]
+        """
+        with self._lock:
+            templates = self._counters.get(counter)
+            if templates is None:
+                templates = self._counters[counter] = {}
+            templates[template] = templates.get(template, 0) + value
+
+    def counters(self):
+        """ Counters Method
+
+        Return a copy of the named event counters in the format:
+        {counter: {template: value}}.
+        """
+        with self._lock:
+            return {
+                counter: dict(templates)
+                for counter, templates in self._counters.items()
+            }
+
+    def snapshot(self, reset=False):
+        """ Snapshot Method
+
+        Return a copy of the collected metrics in the format:
+        {phase: {template: {count, errors, seconds, min, max, mean, bytes,
+        histogram}}} where histogram is a list of (upper_bound, count) pairs
+        and the final upper bound is float('inf').
+
+        Parameters:
+            reset (bool): optional [default=False]
+        """
+        bounds = self._buckets + (float('inf'),)
+        with self._lock:
+            snapshot = {}
+            for phase, templates in self._phases.items():
+                snapshot[phase] = {}
+                for template, entry in templates.items():
+                    snapshot[phase][template] = {
+                        'count': entry['count'],
+                        'errors': entry['errors'],
+                        'seconds': entry['seconds'],
+                        'min': entry['min'],
+                        'max': entry['max'],
+                        'mean': entry['seconds'] / entry['count'],
+                        'bytes': entry['bytes'],
+                        'histogram': list(zip(bounds, entry['histogram']))
+                    }
+            if reset:
+                self._phases = {}
+                self._counters = {}
+        return snapshot
+
+    def reset(self):
+        """ Reset Method
+
+        Discard all collected metrics.
+        """
+        with self._lock:
+            self._phases = {}
+            self._counters = {}
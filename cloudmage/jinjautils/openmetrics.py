@@ -0,0 +1,195 @@
+##############################################################################
+# CloudMage : Jinja Template Pipeline OpenMetrics Exposition
+# ============================================================================
+# CloudMage Jinja Helper Object Utility/Library
+#   - Expose JinjaUtils pipeline metrics in the OpenMetrics text format.
+# Author: Richard Nason rnason@cloudmage.io
+# Project Start: 2/13/2020
+# License: GNU GPLv3
+##############################################################################
+
+###############
+# Imports:    #
+###############
+# Import Base Python Modules
+# http.server and threading are imported by MetricsServer when it is
+# started, so generating the exposition stays cheap to import.
+
+
+# OpenMetrics exposition content type.
+CONTENT_TYPE = "application/openmetrics-text; version=1.0.0; charset=utf-8"
+
+# Metric family name prefix.
+PREFIX = "jinjautils"
+
+# Named event counters exposed from PhaseMetrics, with their help text.
+COUNTER_HELP = {
+    'template_cache_hits': "Template loads served from the Environment cache.",
+    'template_cache_misses': "Template loads that required a compile.",
+}
+
+
+def _escape(value):
+    """ Escape a label value for the OpenMetrics text format. """
+    return (
+        str(value if value is not None else "")
+        .replace("\\", "\\\\")
+        .replace("\"", "\\\"")
+        .replace("\n", "\\n")
+    )
+
+
+def _labels(**labels):
+    """ Format a label set for the OpenMetrics text format. """
+    return "{" + ",".join(
+        '{}="{}"'.format(name, _escape(value))
+        for name, value in labels.items()
+    ) + "}"
+
+
+def _number(value):
+    """ Format a sample value for the OpenMetrics text format. """
+    if value == float('inf'):
+        return "+Inf"
+    if isinstance(value, float):
+        return repr(value)
+    return str(value)
+
+
+def generate_openmetrics(phase_metrics):
+    """ Generate OpenMetrics Function
+
+    Render the metrics collected by a PhaseMetrics object in the OpenMetrics
+    text exposition format, terminated by the required # EOF line.
+
+    Parameters:
+        phase_metrics (obj): required
+
+    Returns:
+        str containing the OpenMetrics exposition.
+    """
+    snapshot = phase_metrics.snapshot()
+    counters = phase_metrics.counters()
+    output = []
+
+    # Phase latency histograms.
+    family = "{}_phase_duration_seconds".format(PREFIX)
+    output.append("# TYPE {} histogram".format(family))
+    output.append("# UNIT {} seconds".format(family))
+    output.append(
+        "# HELP {} Latency of each JinjaUtils pipeline phase.".format(family)
+    )
+    for phase, templates in sorted(snapshot.items()):
+        for template, entry in sorted(
+            templates.items(), key=lambda item: str(item[0])
+        ):
+            cumulative = 0
+            for bound, count in entry['histogram']:
+                cumulative += count
+                output.append("{}_bucket{} {}".format(
+                    family,
+                    _labels(phase=phase, template=template, le=_number(bound)),
+                    cumulative
+                ))
+            labels = _labels(phase=phase, template=template)
+            output.append("{}_count{} {}".format(
+                family, labels, entry['count']
+            ))
+            output.append("{}_sum{} {}".format(
+                family, labels, _number(float(entry['seconds']))
+            ))
+
+    # Phase counters derived from the same entries.
+    for name, key, help_text in (
+        ('phase_errors', 'errors', "Failed executions of each phase."),
+        ('phase_bytes', 'bytes', "Bytes rendered or written by each phase."),
+    ):
+        family = "{}_{}".format(PREFIX, name)
+        output.append("# TYPE {} counter".format(family))
+        output.append("# HELP {} {}".format(family, help_text))
+        for phase, templates in sorted(snapshot.items()):
+            for template, entry in sorted(
+                templates.items(), key=lambda item: str(item[0])
+            ):
+                output.append("{}_total{} {}".format(
+                    family,
+                    _labels(phase=phase, template=template),
+                    entry[key]
+                ))
+
+    # Named event counters.
+    for counter, help_text in COUNTER_HELP.items():
+        family = "{}_{}".format(PREFIX, counter)
+        output.append("# TYPE {} counter".format(family))
+        output.append("# HELP {} {}".format(family, help_text))
+        for template, value in sorted(
+            counters.get(counter, {}).items(), key=lambda item: str(item[0])
+        ):
+            output.append("{}_total{} {}".format(
+                family,
+                _labels(template=template),
+                value
+            ))
+
+    output.append("# EOF")
+    return "\n".join(output) + "\n"
+
+
+#####################
+# Class Definition: #
+#####################
+class MetricsServer(object):
+    """ CloudMage Jinja OpenMetrics HTTP Server Class
+
+    Minimal HTTP endpoint that serves the OpenMetrics exposition returned by
+    the provided callable on every GET request. The server runs on a daemon
+    thread and binds to localhost on a random free port by default.
+    """
+
+    def __init__(self, exposition, host='127.0.0.1', port=0):
+        """ MetricsServer Class Constructor
+
+        Parameters:
+            exposition (callable): required
+            host       (str):      optional [default='127.0.0.1']
+            port       (int):      optional [default=0]
+        """
+        from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+        import threading
+
+        class _Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                body = exposition().encode('utf-8')
+                self.send_response(200)
+                self.send_header("Content-Type", CONTENT_TYPE)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass
+
+        self._server = ThreadingHTTPServer((host, port), _Handler)
+        self._server.daemon_threads = True
+        self._thread = threading.Thread(
+            target=self._server.serve_forever,
+            daemon=True
+        )
+        self._thread.start()
+
+    @property
+    def address(self):
+        """ Return the (host, port) the server is listening on. """
+        return self._server.server_address[:2]
+
+    @property
+    def url(self):
+        """ Return the URL of the metrics endpoint. """
+        host, port = self.address
+        return "http://{}:{}/metrics".format(host, port)
+
+    def close(self):
+        """ Stop the server and release its socket. """
+        self._server.shutdown()
+        self._server.server_close()
+        self._thread.join()
@@ -0,0 +1,259 @@
+##############################################################################
+# CloudMage : Jinja Template Line Profiler
+# ============================================================================
+# CloudMage Jinja Helper Object Utility/Library
+#   - Map render time back to Jinja template source lines and blocks.
+# Author: Richard Nason rnason@cloudmage.io
+# Project Start: 2/13/2020
+# License: GNU GPLv3
+##############################################################################
+
+###############
+# Imports:    #
+###############
+# Import Base Python Modules
+from time import perf_counter
+import sys
+
+
+#####################
+# Class Definition: #
+#####################
+class RenderProfiler(object):
+    """ CloudMage Jinja Render Profiler Class
+
+    This class profiles template renders using a trace function that only
+    traces the Python code generated by Jinja for each template. Time spent
+    between trace events is attributed to the template line that is
+    currently executing, including any filters, tests or calls made from
+    that line. Generated Python lines are mapped back to template source
+    lines using the compiled template debug info. Time is exclusive, so a
+    line that includes another template or calls a block or macro is only
+    charged for the work it does itself, while the full call chain is kept
+    for flame graph export.
+    """
+
+    def __init__(self):
+        """ RenderProfiler Class Constructor
+
+        Attributes:
+            self._samples   (dict) : private
+            self._templates (dict) : private
+            self._sources   (dict) : private
+            self._stack     (list) : private
+            self._last      (float): private
+        """
+        self._samples = {}
+        self._templates = {}
+        self._sources = {}
+        self._stack = []
+        self._last = 0.0
+
+    def add_source(self, template_name, source):
+        """ Register the source of a template so reports can show its lines.
+        """
+        self._sources[template_name] = source.splitlines()
+
+    def reset(self):
+        """ Discard all collected profile samples. """
+        self._samples = {}
+        self._templates = {}
+
+    def run(self, function, *args, **kwargs):
+        """ Run Method
+
+        Call the provided function, typically a template render, while
+        profiling every template frame it executes, and return its result.
+        """
+        previous_trace = sys.gettrace()
+        self._stack = []
+        self._last = perf_counter()
+        sys.settrace(self._global_trace)
+        try:
+            return function(*args, **kwargs)
+        finally:
+            sys.settrace(previous_trace)
+            self._account()
+            self._stack = []
+
+    def _account(self):
+        """ Charge the time since the last event to the executing line. """
+        now = perf_counter()
+        if self._stack:
+            key = tuple(
+                (entry[1], entry[2], entry[3]) for entry in self._stack
+            )
+            sample = self._samples.get(key)
+            if sample is None:
+                self._samples[key] = [now - self._last, 1]
+            else:
+                sample[0] += now - self._last
+                sample[1] += 1
+        self._last = now
+
+    def _global_trace(self, frame, event, arg):
+        """ Global trace function, only template frames are traced. """
+        template = frame.f_globals.get('__jinja_template__')
+        if template is None:
+            return None
+        self._account()
+        name = template.name or '<template>'
+        self._templates.setdefault(name, template)
+        self._stack.append(
+            [frame, name, frame.f_code.co_name, frame.f_lineno]
+        )
+        return self._local_trace
+
+    def _local_trace(self, frame, event, arg):
+        """ Local trace function for template frames. """
+        if event == 'line':
+            self._account()
+            self._stack[-1][3] = frame.f_lineno
+        elif event == 'return':
+            self._account()
+            if self._stack and self._stack[-1][0] is frame:
+                self._stack.pop()
+        return self._local_trace
+
+    def _source_lines(self, template_name):
+        """ Return the source lines of a template, using its loader if the
+        source was not registered.
+        """
+        if template_name not in self._sources:
+            lines = None
+            template = self._templates.get(template_name)
+            environment = getattr(template, 'environment', None)
+            if environment is not None and environment.loader is not None:
+                try:
+                    lines = environment.loader.get_source(
+                        environment,
+                        template_name
+                    )[0].splitlines()
+                except Exception:
+                    lines = None
+            self._sources[template_name] = lines
+        return self._sources[template_name]
+
+    def _template_line(self, template_name, python_line):
+        """ Map a generated Python line to its template source line. """
+        template = self._templates.get(template_name)
+        if template is None:
+            return python_line
+        try:
+            return template.get_corresponding_lineno(python_line)
+        except Exception:  # pragma: no cover
+            return python_line
+
+    @staticmethod
+    def _block_name(function_name):
+        """ Convert a generated function name into a template block label.
+        """
+        if function_name.startswith('block_'):
+            return "block {}".format(function_name[6:])
+        if function_name == 'root':
+            return 'root'
+        return function_name
+
+    def report(self, template=None, limit=None):
+        """ Report Method
+
+        Return the profile as a dict keyed by template name. Each template
+        maps to a list of line entries sorted by exclusive time, slowest
+        first. Each entry contains the template line, block, seconds, hits,
+        percent of the total profiled time and the template source line when
+        the source is available.
+
+        Parameters:
+            template (str): optional [default=None]
+            limit    (int): optional [default=None]
+        """
+        lines = {}
+        total = 0.0
+        for stack, (seconds, hits) in self._samples.items():
+            template_name, function_name, python_line = stack[-1]
+            key = (
+                template_name,
+                self._block_name(function_name),
+                self._template_line(template_name, python_line)
+            )
+            entry = lines.setdefault(key, [0.0, 0])
+            entry[0] += seconds
+            entry[1] += hits
+            total += seconds
+
+        report = {}
+        for (template_name, block, line), (seconds, hits) in lines.items():
+            if template is not None and template_name != template:
+                continue
+            source = self._source_lines(template_name)
+            report.setdefault(template_name, []).append({
+                'template': template_name,
+                'line': line,
+                'block': block,
+                'seconds': seconds,
+                'hits': hits,
+                'percent': (seconds / total * 100.0) if total else 0.0,
+                'source': (
+                    source[line - 1].strip()
+                    if source and 0 < line <= len(source) else None
+                )
+            })
+        for template_name in report:
+            report[template_name].sort(
+                key=lambda entry: entry['seconds'],
+                reverse=True
+            )
+            if limit is not None:
+                report[template_name] = report[template_name][:limit]
+        return report
+
+    def format_report(self, template=None, limit=20):
+        """ Format Report Method
+
+        Return the profile report as a human readable text table.
+        """
+        output = []
+        for template_name, entries in sorted(
+            self.report(template, limit).items()
+        ):
+            output.append("Template: {}".format(template_name))
+            output.append("{:>10} {:>7} {:>8} {:>6}  {:<20} {}".format(
+                'seconds', 'percent', 'hits', 'line', 'block', 'source'
+            ))
+            for entry in entries:
+                output.append(
+                    "{:>10.6f} {:>6.2f}% {:>8} {:>6}  {:<20} {}".format(
+                        entry['seconds'],
+                        entry['percent'],
+                        entry['hits'],
+                        entry['line'],
+                        entry['block'],
+                        entry['source'] or ''
+                    )
+                )
+            output.append("")
+        return "\n".join(output)
+
+    def collapsed_stacks(self):
+        """ Collapsed Stacks Method
+
+        Return the profile in the collapsed stack format read by flame
+        graph tools such as flamegraph.pl and speedscope. Each line holds a
+        semicolon separated stack of template:block:line frames followed by
+        the exclusive time in microseconds.
+        """
+        stacks = {}
+        for stack, (seconds, hits) in self._samples.items():
+            frames = ";".join(
+                "{}:{}:{}".format(
+                    template_name,
+                    self._block_name(function_name),
+                    self._template_line(template_name, python_line)
+                )
+                for template_name, function_name, python_line in stack
+            )
+            stacks[frames] = stacks.get(frames, 0.0) + seconds
+        return "".join(
+            "{} {}\n".format(frames, max(1, int(round(seconds * 1e6))))
+            for frames, seconds in sorted(stacks.items())
+        )
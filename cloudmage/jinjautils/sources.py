@@ -0,0 +1,219 @@
+##############################################################################
+# CloudMage : JinjaUtils Streaming Context Sources
+# ============================================================================
+# CloudMage Jinja Helper Object Utility/Library
+#   - Read render contexts record by record from JSON Lines, CSV and text.
+# Author: Richard Nason rnason@cloudmage.io
+# Project Start: 2/13/2020
+# License: GNU GPLv3
+##############################################################################
+
+###############
+# Imports:    #
+###############
+# Import Base Python Modules
+import io
+import os
+import sys
+
+
+# Record formats by file extension.
+SOURCE_FORMATS = {
+    '.jsonl': 'jsonl',
+    '.ndjson': 'jsonl',
+    '.csv': 'csv',
+    '.tsv': 'tsv',
+    '.txt': 'lines',
+}
+
+# Compressed file extensions mapped to the stdlib module that reads them.
+# Modules are imported when first used.
+COMPRESSED_EXTENSIONS = {
+    '.gz': 'gzip',
+    '.bz2': 'bz2',
+    '.xz': 'lzma',
+}
+
+
+def source_format(path):
+    """ Return the record format of a path from its file extension, ignoring
+    a compression extension, or None if the extension is not known.
+    """
+    root, extension = os.path.splitext(path.lower())
+    if extension in COMPRESSED_EXTENSIONS:
+        extension = os.path.splitext(root)[1]
+    return SOURCE_FORMATS.get(extension)
+
+
+def open_source(source, encoding='utf-8', newline=None):
+    """ Open Source Function
+
+    Open a record source for reading text line by line. The source can be a
+    file path, "-" for stdin, or an already open text or binary file object.
+    Paths ending in .gz, .bz2 or .xz are decompressed as they are read.
+
+    Parameters:
+        source   (str|obj): required
+        encoding (str):     optional [default='utf-8']
+        newline  (str):     optional [default=None]
+
+    Returns:
+        Text file object. Paths are opened by this function and should be
+        closed by the caller, file objects are returned wrapped but open.
+    """
+    if source == '-':
+        source = sys.stdin
+    if not isinstance(source, (str, bytes, os.PathLike)):
+        if isinstance(source, io.TextIOBase):
+            return source
+        return io.TextIOWrapper(source, encoding=encoding, newline=newline)
+    compression = COMPRESSED_EXTENSIONS.get(
+        os.path.splitext(os.fsdecode(source))[1].lower()
+    )
+    if compression is not None:
+        import importlib
+        return importlib.import_module(compression).open(
+            source,
+            'rt',
+            encoding=encoding,
+            newline=newline
+        )
+    return open(source, encoding=encoding, newline=newline)
+
+
+class _Source(object):
+    """ Context manager that closes a source only if it opened it. """
+
+    def __init__(self, source, encoding, newline=None):
+        self._owned = isinstance(source, (str, bytes, os.PathLike)) and (
+            source != '-'
+        )
+        self.stream = open_source(source, encoding=encoding, newline=newline)
+
+    def __enter__(self):
+        return self.stream
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        if self._owned:
+            self.stream.close()
+
+
+def read_jsonl(source, encoding='utf-8'):
+    """ Read JSON Lines Function
+
+    Yield each JSON object of a JSON Lines source as a dict, one line at a
+    time. Blank lines are skipped, and a ValueError naming the line number
+    is raised for a line that is not a JSON object.
+
+    Parameters:
+        source   (str|obj): required
+        encoding (str):     optional [default='utf-8']
+    """
+    import json
+    decode = json.JSONDecoder().decode
+    with _Source(source, encoding) as stream:
+        for number, line in enumerate(stream, 1):
+            if not line.strip():
+                continue
+            try:
+                record = decode(line)
+            except ValueError as e:
+                raise ValueError("Invalid JSON on line {}: {}".format(
+                    number, e
+                ))
+            if not isinstance(record, dict):
+                raise ValueError(
+                    "Line {} expected a JSON object but received: {}".format(
+                        number,
+                        type(record).__name__
+                    )
+                )
+            yield record
+
+
+def read_csv(source, encoding='utf-8', delimiter=',', fieldnames=None,
+             **fmtparams):
+    """ Read CSV Function
+
+    Yield each row of a CSV source as a dict keyed by the header row, or by
+    fieldnames when the source has no header row. Extra csv.reader format
+    parameters, such as quotechar, are passed through.
+
+    Parameters:
+        source     (str|obj): required
+        encoding   (str):     optional [default='utf-8']
+        delimiter  (str):     optional [default=',']
+        fieldnames (list):    optional [default=None]
+    """
+    import csv
+    with _Source(source, encoding, newline='') as stream:
+        for row in csv.DictReader(
+            stream,
+            fieldnames=fieldnames,
+            delimiter=delimiter,
+            **fmtparams
+        ):
+            yield row
+
+
+def read_lines(source, encoding='utf-8', key='line', skip_blank=True):
+    """ Read Lines Function
+
+    Yield each line of a newline delimited source as a {key: line} dict,
+    without its line ending. Blank lines are skipped unless skip_blank is
+    False.
+
+    Parameters:
+        source     (str|obj): required
+        encoding   (str):     optional [default='utf-8']
+        key        (str):     optional [default='line']
+        skip_blank (bool):    optional [default=True]
+    """
+    with _Source(source, encoding) as stream:
+        for line in stream:
+            line = line.rstrip('\r\n')
+            if skip_blank and not line.strip():
+                continue
+            yield {key: line}
+
+
+def read_records(source, record_format=None, **options):
+    """ Read Records Function
+
+    Yield the records of a JSON Lines, CSV, TSV or newline delimited source,
+    selecting the reader from record_format (jsonl, csv, tsv or lines) or,
+    when it is not provided, from the source file extension. Extra options
+    are passed to the selected reader.
+
+    Parameters:
+        source        (str|obj): required
+        record_format (str):     optional [default=None]
+    """
+    if record_format is None:
+        if not isinstance(source, (str, bytes, os.PathLike)) or (
+            source == '-'
+        ):
+            raise ValueError(
+                "record_format is required for file objects and stdin."
+            )
+        record_format = source_format(os.fsdecode(source))
+        if record_format is None:
+            raise ValueError(
+                "Record format expected one of {} but received: {}".format(
+                    sorted(SOURCE_FORMATS),
+                    source
+                )
+            )
+    if record_format == 'jsonl':
+        return read_jsonl(source, **options)
+    if record_format == 'csv':
+        return read_csv(source, **options)
+    if record_format == 'tsv':
+        options.setdefault('delimiter', '\t')
+        return read_csv(source, **options)
+    if record_format == 'lines':
+        return read_lines(source, **options)
+    raise ValueError(
+        "Record format expected jsonl, csv, tsv or lines but received: "
+        "{}".format(record_format)
+    )
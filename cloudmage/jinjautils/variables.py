@@ -0,0 +1,210 @@
+##############################################################################
+# CloudMage : JinjaUtils Template Variables
+# ============================================================================
+# CloudMage Jinja Helper Object Utility/Library
+#   - Find the context variables a template reads, including the variables
+#     of the templates it extends, includes and imports.
+# Author: Richard Nason rnason@cloudmage.io
+# Project Start: 2/13/2020
+# License: GNU GPLv3
+##############################################################################
+
+###############
+# Imports:    #
+###############
+# Import Pip Installed Modules:
+from jinja2 import TemplateNotFound, meta, nodes
+
+# Import Base Python Modules
+import os
+
+
+# Template nodes that reference another template.
+_REFERENCE_NODES = (nodes.Extends, nodes.Include, nodes.Import,
+                    nodes.FromImport)
+
+
+def file_uptodate(path):
+    """ Return a function that returns True while the file at path has not
+    been modified, like the uptodate function of a Jinja FileSystemLoader.
+    """
+    mtime = os.path.getmtime(path)
+
+    def uptodate():
+        try:
+            return os.path.getmtime(path) == mtime
+        except OSError:
+            return False
+    return uptodate
+
+
+def _template_names(node):
+    """ Return the template names referenced by a node, or None when the
+    name is only known at render time.
+    """
+    if isinstance(node, nodes.Const) and isinstance(node.value, str):
+        return [node.value]
+    if isinstance(node, (nodes.Tuple, nodes.List)):
+        names = []
+        for item in node.items:
+            if not (
+                isinstance(item, nodes.Const) and isinstance(item.value, str)
+            ):
+                return None
+            names.append(item.value)
+        return names
+    if isinstance(node, nodes.Const) and isinstance(
+        node.value, (tuple, list)
+    ):
+        if all(isinstance(name, str) for name in node.value):
+            return list(node.value)
+    return None
+
+
+def _assigned_names(node):
+    """ Return the names a statement assigns in its own scope, with set,
+    macro, import and from import tags, visible to the statements after it.
+    """
+    if isinstance(node, (nodes.Assign, nodes.AssignBlock)):
+        return _target_names(node.target)
+    if isinstance(node, nodes.Macro):
+        return {node.name}
+    if isinstance(node, nodes.Import):
+        return {node.target}
+    if isinstance(node, nodes.FromImport):
+        return {
+            name if isinstance(name, str) else name[1] for name in node.names
+        }
+    return set()
+
+
+def _target_names(target):
+    """ Return the names bound by an assignment or loop target. """
+    if isinstance(target, nodes.Name):
+        return {target.name}
+    return {name.name for name in target.find_all(nodes.Name)}
+
+
+def _scope_names(node):
+    """ Return the names a statement binds for its body only, such as loop
+    targets, macro and call block arguments, and with targets.
+    """
+    if isinstance(node, nodes.For):
+        return _target_names(node.target) | {'loop'}
+    if isinstance(node, (nodes.Macro, nodes.CallBlock)):
+        names = {arg.name for arg in node.args}
+        names.update(('varargs', 'kwargs', 'caller'))
+        return names
+    if isinstance(node, nodes.With):
+        names = set()
+        for target in node.targets:
+            names |= _target_names(target)
+        return names
+    return set()
+
+
+def _find_references(body, declared, references):
+    """ Append each template reference within a list of statements to
+    references, with the names assigned before it by the statements and
+    scopes enclosing it.
+    """
+    declared = set(declared)
+    for node in body:
+        if isinstance(node, _REFERENCE_NODES):
+            references.append((node, frozenset(declared)))
+        scope = declared | _scope_names(node)
+        for field in node.fields:
+            value = getattr(node, field, None)
+            # Loop targets are not bound in the iterable or the else block.
+            inner = scope if field in ('body', 'test') else declared
+            if isinstance(value, nodes.Node):
+                _find_references([value], inner, references)
+            elif isinstance(value, list) and value and all(
+                isinstance(item, nodes.Node) for item in value
+            ):
+                _find_references(value, inner, references)
+        declared |= _assigned_names(node)
+    return references
+
+
+def _calls_super(block):
+    """ Return True if a block renders its parent block with super(). """
+    return any(
+        isinstance(call.node, nodes.Name) and call.node.name == 'super'
+        for call in block.find_all(nodes.Call)
+    )
+
+
+def template_variables(environment, source, name=None, _overridden=(),
+                       _stack=()):
+    """ Template Variables Function
+
+    Parse a template source and return the context variables it reads,
+    including the variables read by the templates it extends, and includes
+    or imports with context, loaded from the environment loader. Variables
+    of a parent template block replaced by a child block, and variables of
+    referenced templates that the referencing template assigns before
+    referencing them, such as a set before an include, or binds in a scope
+    enclosing the reference, such as a loop variable or macro argument, are
+    not included.
+
+    Parameters:
+        environment (obj): required
+        source      (str): required
+        name        (str): optional [default=None]
+
+    Returns:
+        Tuple of the set of variable names, a bool that is True when a
+        referenced template could not be analyzed, such as an include of a
+        template name held in a variable, and a list of the loader uptodate
+        functions of the referenced templates.
+    """
+    ast = environment.parse(source, name)
+
+    # Blocks replaced by a child template are never rendered.
+    blocks = list(ast.find_all(nodes.Block))
+    for block in blocks:
+        if block.name in _overridden:
+            block.body = []
+    overridden = set(_overridden) | {
+        block.name for block in blocks if not _calls_super(block)
+    }
+
+    variables = set(meta.find_undeclared_variables(ast))
+    unknown = False
+    uptodates = []
+    # Variables of referenced templates are dropped when a statement before
+    # the reference, or a scope enclosing it such as a loop or macro,
+    # assigns them.
+    for node, declared in _find_references(ast.body, (), []):
+        if not isinstance(node, nodes.Extends) and not node.with_context:
+            # Templates rendered without context only read globals.
+            continue
+        names = _template_names(node.template)
+        if names is None or environment.loader is None:
+            unknown = True
+            continue
+        for reference in names:
+            if reference == name or reference in _stack:
+                continue
+            try:
+                reference_source, _, uptodate = \
+                    environment.loader.get_source(environment, reference)
+            except TemplateNotFound:
+                if not getattr(node, 'ignore_missing', False):
+                    unknown = True
+                continue
+            referenced, reference_unknown, reference_uptodates = \
+                template_variables(
+                    environment,
+                    reference_source,
+                    reference,
+                    overridden if isinstance(node, nodes.Extends) else (),
+                    _stack + (name,)
+                )
+            variables.update(referenced - declared)
+            unknown = unknown or reference_unknown
+            if uptodate is not None:
+                uptodates.append(uptodate)
+            uptodates.extend(reference_uptodates)
+    return variables, unknown, uptodates
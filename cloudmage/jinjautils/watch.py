@@ -0,0 +1,612 @@
+##############################################################################
+# CloudMage : JinjaUtils Watch Mode
+# ============================================================================
+# CloudMage Jinja Helper Object Utility/Library
+#   - Re-render the manifest outputs affected by template and data changes.
+# Author: Richard Nason rnason@cloudmage.io
+# Project Start: 2/13/2020
+# License: GNU GPLv3
+##############################################################################
+
+###############
+# Imports:    #
+###############
+# Import Pip Installed Modules:
+from jinja2 import TemplateNotFound
+from jinja2.loaders import split_template_path
+
+# Import Package Modules:
+from .cli import (
+    MAX_CHUNK_SIZE,
+    ManifestError,
+    load_manifest,
+    _create_worker,
+    _render_chunk,
+    _report
+)
+
+# Import Base Python Modules
+from time import perf_counter, sleep
+import select
+import struct
+import os
+
+
+# Seconds between polling scans.
+POLL_INTERVAL = 0.2
+
+# Seconds without further changes that end a burst of changes.
+DEBOUNCE = 0.1
+
+# Longest a continuous burst of changes can delay a render, in seconds.
+MAX_DELAY = 1.0
+
+# Reported by a scanner when change events were lost and every input must
+# be treated as changed.
+RESCAN = None
+
+
+def _ignored(name):
+    """ Return True for hidden files, such as editor swap files. """
+    return name[:1] in ('.', b'.')
+
+
+def _normalize(name):
+    """ Return a template name in the form used by the Jinja loaders. """
+    try:
+        return "/".join(split_template_path(name))
+    except TemplateNotFound:
+        return name
+
+
+#####################
+# Class Definition: #
+#####################
+class PollingScanner(object):
+    """ CloudMage Polling Change Scanner Class
+
+    This class detects changes by comparing the modification time and size
+    of every file below the watched directories, and of the watched files,
+    between scans. Directories are walked with os.scandir so each scan costs
+    one stat call per file.
+    """
+
+    def __init__(self, directories=(), files=(), interval=POLL_INTERVAL):
+        """ PollingScanner Class Constructor
+
+        Parameters:
+            directories (list):  optional [default=()]
+            files       (list):  optional [default=()]
+            interval    (float): optional [default=POLL_INTERVAL]
+        """
+        self._directories = [os.path.abspath(path) for path in directories]
+        self._files = {os.path.abspath(path) for path in files}
+        self.interval = interval
+        self._state = self._scan()
+
+    def _scan(self):
+        """ Return a {path: (mtime_ns, size)} dict of the watched files. """
+        state = {}
+        pending = list(self._directories)
+        while pending:
+            try:
+                entries = os.scandir(pending.pop())
+            except OSError:
+                continue
+            with entries:
+                for entry in entries:
+                    if _ignored(entry.name):
+                        continue
+                    try:
+                        if entry.is_dir(follow_symlinks=False):
+                            pending.append(entry.path)
+                        else:
+                            status = entry.stat()
+                            state[entry.path] = (
+                                status.st_mtime_ns,
+                                status.st_size
+                            )
+                    except OSError:
+                        continue
+        for path in self._files:
+            try:
+                status = os.stat(path)
+            except OSError:
+                continue
+            state[path] = (status.st_mtime_ns, status.st_size)
+        return state
+
+    def wait(self, timeout=None):
+        """ Return the set of paths added, modified or removed within timeout
+        seconds, or an empty set if nothing changed. A timeout of None waits
+        until a change is found.
+        """
+        deadline = (
+            float('inf') if timeout is None else perf_counter() + timeout
+        )
+        while True:
+            sleep(max(0.0, min(self.interval, deadline - perf_counter())))
+            state = self._scan()
+            previous, self._state = self._state, state
+            changed = {
+                path for path in state.keys() | previous.keys()
+                if state.get(path) != previous.get(path)
+            }
+            if changed or perf_counter() >= deadline:
+                return changed
+
+    def close(self):
+        """ Release the scanner resources. """
+
+
+class InotifyScanner(object):
+    """ CloudMage Inotify Change Scanner Class
+
+    This class detects changes with Linux inotify events instead of scans,
+    watching every directory below the watched directories and the parent
+    directories of the watched files. Directories created while watching
+    are added as they appear. Raises OSError or AttributeError when inotify
+    is not available.
+    """
+
+    # IN_MODIFY, IN_ATTRIB, IN_CLOSE_WRITE, IN_MOVED_FROM, IN_MOVED_TO,
+    # IN_CREATE and IN_DELETE.
+    MASK = 0x2 | 0x4 | 0x8 | 0x40 | 0x80 | 0x100 | 0x200
+    IN_MOVED_TO = 0x80
+    IN_CREATE = 0x100
+    IN_Q_OVERFLOW = 0x4000
+    IN_IGNORED = 0x8000
+    IN_ISDIR = 0x40000000
+    EVENT = struct.Struct("iIII")
+
+    def __init__(self, directories=(), files=()):
+        """ InotifyScanner Class Constructor
+
+        Parameters:
+            directories (list): optional [default=()]
+            files       (list): optional [default=()]
+        """
+        import ctypes
+        self._libc = ctypes.CDLL(None, use_errno=True)
+        self._fd = self._libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        if self._fd < 0:
+            error = ctypes.get_errno()
+            raise OSError(error, os.strerror(error))
+        self._get_errno = ctypes.get_errno
+        self._watches = {}
+        self._recursive = set()
+        self._files = {os.path.abspath(path) for path in files}
+        try:
+            for directory in directories:
+                self._watch_tree(os.path.abspath(directory))
+            for directory in {os.path.dirname(path) for path in self._files}:
+                self._watch(directory, False)
+        except Exception:
+            self.close()
+            raise
+
+    def _watch(self, directory, recursive):
+        """ Add an inotify watch for a directory. """
+        wd = self._libc.inotify_add_watch(
+            self._fd,
+            os.fsencode(directory),
+            self.MASK
+        )
+        if wd < 0:
+            error = self._get_errno()
+            raise OSError(error, os.strerror(error), directory)
+        self._watches[wd] = directory
+        if recursive:
+            self._recursive.add(wd)
+
+    def _watch_tree(self, directory):
+        """ Watch a directory and its sub directories, returning the files
+        they already hold.
+        """
+        files = []
+        pending = [directory]
+        while pending:
+            directory = pending.pop()
+            try:
+                self._watch(directory, True)
+                entries = list(os.scandir(directory))
+            except FileNotFoundError:
+                continue
+            for entry in entries:
+                if _ignored(entry.name):
+                    continue
+                if entry.is_dir(follow_symlinks=False):
+                    pending.append(entry.path)
+                else:
+                    files.append(entry.path)
+        return files
+
+    def wait(self, timeout=None):
+        """ Return the set of paths added, modified or removed within timeout
+        seconds, or an empty set if nothing changed. A timeout of None waits
+        until a change is found. RESCAN is included when events were lost.
+        """
+        if not select.select([self._fd], [], [], timeout)[0]:
+            return set()
+        changed = set()
+        while True:
+            try:
+                data = os.read(self._fd, 65536)
+            except BlockingIOError:
+                return changed
+            offset = 0
+            while offset < len(data):
+                wd, mask, _, length = self.EVENT.unpack_from(data, offset)
+                name = data[
+                    offset + self.EVENT.size:offset + self.EVENT.size + length
+                ].rstrip(b"\0")
+                offset += self.EVENT.size + length
+                if mask & self.IN_Q_OVERFLOW:
+                    changed.add(RESCAN)
+                    continue
+                if mask & self.IN_IGNORED:
+                    self._watches.pop(wd, None)
+                    self._recursive.discard(wd)
+                    continue
+                directory = self._watches.get(wd)
+                if directory is None or not name:
+                    continue
+                path = os.path.join(directory, os.fsdecode(name))
+                if wd not in self._recursive:
+                    if path in self._files:
+                        changed.add(path)
+                elif not _ignored(name):
+                    if (
+                        mask & self.IN_ISDIR and
+                        mask & (self.IN_CREATE | self.IN_MOVED_TO)
+                    ):
+                        changed.update(self._watch_tree(path))
+                    else:
+                        changed.add(path)
+
+    def close(self):
+        """ Close the inotify file descriptor. """
+        if self._fd >= 0:
+            os.close(self._fd)
+            self._fd = -1
+
+
+def create_scanner(directories=(), files=(), inotify=None,
+                   interval=POLL_INTERVAL):
+    """ Create Scanner Function
+
+    Return an InotifyScanner when inotify is available, falling back to a
+    PollingScanner. Set inotify to False to always poll, or True to raise
+    if inotify is not available.
+    """
+    if inotify is not False:
+        try:
+            return InotifyScanner(directories, files)
+        except (OSError, AttributeError):
+            if inotify:
+                raise
+    return PollingScanner(directories, files, interval)
+
+
+class DependencyGraph(object):
+    """ CloudMage Jinja Template Dependency Graph Class
+
+    This class records the templates each template extends, includes or
+    imports, found with jinja2.meta in the parsed template source, and
+    returns the templates affected by a template change. Templates that
+    reference a template name computed at render time are treated as
+    depending on every template.
+    """
+
+    def __init__(self, environment):
+        """ DependencyGraph Class Constructor
+
+        Parameters:
+            environment (obj): required
+
+        Attributes:
+            self._environment (obj)  : private
+            self._references  (dict) : private
+            self._dependents  (dict) : private
+            self._dynamic     (set)  : private
+        """
+        self._environment = environment
+        self._references = {}
+        self._dependents = {}
+        self._dynamic = set()
+
+    def __len__(self):
+        """ Return the number of parsed templates. """
+        return len(self._references)
+
+    def references(self, name):
+        """ Return the template names referenced by a template. """
+        return set(self._references.get(name, ()))
+
+    def add(self, names):
+        """ Parse the named templates and every template they reference. """
+        pending = list(names)
+        while pending:
+            name = pending.pop()
+            if name not in self._references:
+                pending.extend(self._parse(name))
+
+    def _parse(self, name):
+        """ Parse a template, replacing its recorded references. """
+        from jinja2 import meta
+        self._remove(name)
+        try:
+            source = self._environment.loader.get_source(
+                self._environment,
+                name
+            )[0]
+            references = set(meta.find_referenced_templates(
+                self._environment.parse(source)
+            ))
+        except Exception:
+            # Missing or invalid templates are parsed again once changed.
+            references = set()
+        if None in references:
+            self._dynamic.add(name)
+            references.discard(None)
+        references = {_normalize(reference) for reference in references}
+        self._references[name] = references
+        for reference in references:
+            self._dependents.setdefault(reference, set()).add(name)
+        return references
+
+    def _remove(self, name):
+        """ Remove the recorded references of a template. """
+        for reference in self._references.pop(name, ()):
+            self._dependents.get(reference, set()).discard(name)
+        self._dynamic.discard(name)
+
+    def changed(self, names):
+        """ Changed Method
+
+        Parse the changed templates again and return the set of template
+        names affected by the change: the changed templates, the templates
+        that extend, include or import them directly or indirectly, and the
+        templates with dynamic references. A name that is not a known
+        template is treated as a directory holding changed templates.
+
+        Parameters:
+            names (list): required
+        """
+        known = self._references.keys() | self._dependents.keys()
+        changed = set()
+        for name in names:
+            if name in known:
+                changed.add(name)
+            else:
+                prefix = name + "/"
+                changed.add(name)
+                changed.update(
+                    template for template in known
+                    if template.startswith(prefix)
+                )
+        for name in changed:
+            if name in self._references:
+                self.add(self._parse(name))
+        affected = set(changed)
+        if changed:
+            affected.update(self._dynamic)
+        pending = list(affected)
+        while pending:
+            for dependent in self._dependents.get(pending.pop(), ()):
+                if dependent not in affected:
+                    affected.add(dependent)
+                    pending.append(dependent)
+        return affected
+
+
+class ManifestWatcher(object):
+    """ CloudMage Jinja Manifest Watcher Class
+
+    This class renders a manifest and then waits for changes to its
+    template_directory, its context files and the manifest itself. Bursts
+    of changes are debounced into a single batch, and only the outputs whose
+    template, extended, included or imported templates, or context files
+    changed are rendered again. A manifest change reloads the manifest and
+    renders every output. Renders run in the current process, and the
+    Environment template cache holds every watched template, so compiled
+    templates stay warm between batches.
+    """
+
+    def __init__(
+        self,
+        manifest_path,
+        skip_unchanged=True,
+        backup=None,
+        compression=None,
+        debounce=DEBOUNCE,
+        interval=POLL_INTERVAL,
+        inotify=None
+    ):
+        """ ManifestWatcher Class Constructor
+
+        Parameters:
+            manifest_path  (str):   required
+            skip_unchanged (bool):  optional [default=True]
+            backup         (bool):  optional [default=None]
+            compression    (str):   optional [default=None]
+            debounce       (float): optional [default=DEBOUNCE]
+            interval       (float): optional [default=POLL_INTERVAL]
+            inotify        (bool):  optional [default=None]
+        """
+        self._manifest_path = os.path.abspath(manifest_path)
+        self._skip_unchanged = skip_unchanged
+        self._backup = backup
+        self._compression = compression
+        self.debounce = debounce
+        self._interval = interval
+        self._inotify = inotify
+        self._scanner = None
+        self.load()
+
+    @property
+    def scanner(self):
+        """ Return the change scanner in use. """
+        return self._scanner
+
+    def load(self):
+        """ Load Method
+
+        Load the manifest, create the warm Environment, build the template
+        dependency graph and start watching the manifest inputs.
+        """
+        manifest = load_manifest(self._manifest_path)
+        template_directory = manifest['template_directory']
+        # Keep every watched template compiled between batches, Jinja never
+        # evicts templates from the Environment cache with cache_size=-1.
+        self._worker = _create_worker(
+            template_directory,
+            manifest['context'],
+            {
+                'backup': (
+                    manifest['backup'] if self._backup is None else
+                    self._backup
+                ),
+                'compression': self._compression or manifest['compression'],
+                'skip_unchanged': self._skip_unchanged,
+                'io_workers': 4
+            },
+            cache_size=-1
+        )
+        by_template = {}
+        by_file = {}
+        for job in manifest['jobs']:
+            template = job[0]
+            if template_directory is not None:
+                template = _normalize(template)
+            by_template.setdefault(template, []).append(job)
+            for path in job[2]:
+                by_file.setdefault(path, []).append(job)
+        self._manifest = manifest
+        self._by_template = by_template
+        self._by_file = by_file
+        self._graph = None
+        files = set(by_file)
+        files.add(self._manifest_path)
+        if template_directory is not None:
+            self._graph = DependencyGraph(
+                self._worker['jinja']._jinja_tpl_library
+            )
+            self._graph.add(by_template)
+        else:
+            files.update(by_template)
+
+        if self._scanner is not None:
+            self._scanner.close()
+        self._scanner = create_scanner(
+            [template_directory] if template_directory is not None else [],
+            files,
+            inotify=self._inotify,
+            interval=self._interval
+        )
+
+    def close(self):
+        """ Stop watching the manifest inputs. """
+        if self._scanner is not None:
+            self._scanner.close()
+            self._scanner = None
+
+    def affected(self, paths):
+        """ Affected Method
+
+        Return the manifest jobs affected by a set of changed paths, or None
+        when the manifest itself changed or change events were lost.
+
+        Parameters:
+            paths (set): required
+        """
+        if RESCAN in paths or self._manifest_path in paths:
+            return None
+        jobs = {}
+        templates = set()
+        template_directory = self._manifest['template_directory']
+        for path in paths:
+            if path in self._by_file:
+                self._worker['context_files'].pop(path, None)
+                jobs.update((job[1], job) for job in self._by_file[path])
+            if template_directory is None:
+                jobs.update(
+                    (job[1], job) for job in self._by_template.get(path, ())
+                )
+                continue
+            name = os.path.relpath(path, template_directory)
+            if name != os.curdir and not name.startswith(os.pardir):
+                templates.add(name.replace(os.sep, "/"))
+        if templates:
+            for name in self._graph.changed(templates):
+                jobs.update(
+                    (job[1], job) for job in self._by_template.get(name, ())
+                )
+        return list(jobs.values())
+
+    def render(self, jobs=None):
+        """ Render the given jobs, or every manifest job, and return the run
+        report.
+        """
+        started = perf_counter()
+        if jobs is None:
+            jobs = self._manifest['jobs']
+        results = [
+            _render_chunk(jobs[index:index + MAX_CHUNK_SIZE], self._worker)
+            for index in range(0, len(jobs), MAX_CHUNK_SIZE)
+        ]
+        return _report(results, len(jobs), 1, started)
+
+    def poll(self, timeout=None):
+        """ Poll Method
+
+        Wait up to timeout seconds for a change, or until a change when
+        timeout is None. Changes are collected until none arrive for the
+        debounce period, and the affected outputs are rendered. Returns the
+        run report with the sorted changed paths added as changed, or None
+        if nothing changed.
+
+        Parameters:
+            timeout (float): optional [default=None]
+        """
+        changed = self._scanner.wait(timeout)
+        if not changed:
+            return None
+        deadline = perf_counter() + MAX_DELAY
+        while perf_counter() < deadline:
+            more = self._scanner.wait(self.debounce)
+            if not more:
+                break
+            changed |= more
+
+        started = perf_counter()
+        jobs = self.affected(changed)
+        if jobs is None:
+            try:
+                self.load()
+            except ManifestError as e:
+                report = _report(
+                    [({}, {self._manifest_path: str(e)}, {})], 0, 1, started
+                )
+                report['changed'] = [self._manifest_path]
+                return report
+        report = self.render(jobs)
+        report['changed'] = sorted(path for path in changed if path)
+        return report
+
+    def run(self, callback=None):
+        """ Run Method
+
+        Render every manifest output, then render the affected outputs after
+        each change until interrupted. Each run report is passed to callback.
+
+        Parameters:
+            callback (callable): optional [default=None]
+        """
+        report = self.render()
+        if callback is not None:
+            callback(report)
+        while True:
+            report = self.poll()
+            if report is not None and callback is not None:
+                callback(report)
@@ -0,0 +1,111 @@
+# Run PyTest:
+# `poetry run pytest tests -v`
+# Run single test file instead of entire test suite:
+# `poetry run pytest tests/test_archive.py -v`
+################
+# Imports:     #
+################
+
+# Pip Installed Imports:
+from cloudmage.jinjautils import JinjaUtils, TemplateArchive
+
+# Base Python Module Imports:
+import pytest
+import tarfile
+import zipfile
+import os
+
+
+######################################
+# Define Set and Teardown Fixtures:  #
+######################################
+@pytest.fixture
+def jinja(tmp_path):
+    """ TemplateArchive PyTest Fixture
+
+    Create a JinjaUtils object with a loaded template that can be rendered
+    into the archive members under test.
+    """
+    template_file = os.path.join(str(tmp_path), 'archive_tpl.j2')
+    with open(template_file, "w") as template:
+        template.write("hello {{ world }}")
+    Jinja = JinjaUtils(verbose=True)
+    Jinja.load = template_file
+    return Jinja
+
+
+######################################
+# Test Archive Output:               #
+######################################
+def test_archive_tar(jinja, tmp_path):
+    """ TemplateArchive Tar Output Test
+
+    This test will render and stream templates into a gzip compressed tar
+    archive, inferring the format and compression from the file extention.
+
+    Expected Result:
+        The archive will contain the rendered and streamed members.
+    """
+    archive_path = os.path.join(str(tmp_path), 'output.tar.gz')
+    with jinja.archive(archive_path) as archive:
+        assert(isinstance(archive, TemplateArchive))
+        jinja.render(world="Rendered")
+        assert(archive.add('configs/rendered.txt'))
+        jinja.render_stream(world="Streamed")
+        assert(archive.add('configs/streamed.txt'))
+        assert(jinja._rendered_stream is None)
+        assert(archive.add('raw.bin', b"raw"))
+    assert(archive.stats['members'] == 3)
+
+    with tarfile.open(archive_path, "r:gz") as tar:
+        assert(sorted(tar.getnames()) == [
+            'configs/rendered.txt', 'configs/streamed.txt', 'raw.bin'
+        ])
+        streamed = tar.extractfile('configs/streamed.txt').read()
+        assert(streamed == b"hello Streamed")
+
+
+def test_archive_zip(jinja, tmp_path):
+    """ TemplateArchive Zip Output Test
+
+    This test will render and stream templates into a deflate compressed
+    zip archive.
+
+    Expected Result:
+        The archive will contain the rendered and streamed members.
+    """
+    archive_path = os.path.join(str(tmp_path), 'output.zip')
+    with jinja.archive(archive_path, compression='gzip') as archive:
+        jinja.render_stream(world="Streamed")
+        assert(archive.add('streamed.txt'))
+        jinja.render(world="Rendered")
+        assert(archive.add('rendered.txt'))
+
+    with zipfile.ZipFile(archive_path) as zip_archive:
+        assert(zip_archive.read('streamed.txt') == b"hello Streamed")
+        assert(zip_archive.read('rendered.txt') == b"hello Rendered")
+        info = zip_archive.getinfo('rendered.txt')
+        assert(info.compress_type == zipfile.ZIP_DEFLATED)
+
+
+def test_archive_invalid(jinja, tmp_path, capsys):
+    """ TemplateArchive Invalid Output Test
+
+    This test will attempt to create archives with an unknown format and an
+    invalid directory, and add a member with nothing rendered.
+
+    Expected Result:
+        Errors are logged and handled gracefully.
+    """
+    assert(jinja.archive(os.path.join(str(tmp_path), 'output.rar')) is None)
+    assert(jinja.archive('/foo/bar/no/love/output.tar') is None)
+    out, err = capsys.readouterr()
+    assert "Archive format expected tar or zip but received: None" in err
+    assert "ERROR   CLS->JinjaUtils.archive: \
+-> Invalid archive directory specified in archive call" in err
+
+    with jinja.archive(os.path.join(str(tmp_path), 'output.tar')) as archive:
+        assert(not archive.add('empty.txt'))
+    out, err = capsys.readouterr()
+    assert "WARNING CLS->JinjaUtils.add: \
+-> No rendered template available for archive member!" in out
@@ -0,0 +1,223 @@
+# Run PyTest:
+# `poetry run pytest tests -v`
+# Run single test file instead of entire test suite:
+# `poetry run pytest tests/test_backends.py -v`
+################
+# Imports:     #
+################
+
+# Pip Installed Imports:
+from cloudmage.jinjautils import (
+    JinjaUtils,
+    OutputBackend,
+    LocalBackend,
+    MemoryBackend,
+    CallbackBackend,
+    StreamBackend,
+    ContentAddressedBackend
+)
+
+# Base Python Module Imports:
+import gzip
+import io
+import os
+
+import pytest
+
+
+######################################
+# Test Output Backends:              #
+######################################
+def test_output_backend_property(capsys):
+    """ JinjaUtils Class Output Backend Property Test
+
+    This test will test the output_backend getter and setter property
+    methods, including setting an invalid value and resetting to default.
+
+    Expected Result:
+        The default backend is the local backend, invalid values are ignored.
+    """
+    Jinja = JinjaUtils(verbose=True)
+    assert(isinstance(Jinja.output_backend, LocalBackend))
+
+    backend = MemoryBackend()
+    Jinja.output_backend = backend
+    assert(Jinja.output_backend is backend)
+
+    Jinja.output_backend = 42
+    assert(Jinja.output_backend is backend)
+    out, err = capsys.readouterr()
+    assert "ERROR   CLS->JinjaUtils.output_backend: \
+-> output_backend property argument expected type OutputBackend" in err
+
+    Jinja.output_backend = None
+    assert(isinstance(Jinja.output_backend, LocalBackend))
+
+
+def test_output_backend_abstract():
+    """ JinjaUtils Output Backend Abstract Base Class Test
+
+    This test will create a backend that does not implement every output
+    backend method.
+
+    Expected Result:
+        The incomplete backend raises TypeError when it is created.
+    """
+    class WriteOnlyBackend(OutputBackend):
+        def open(self, path):
+            return io.BytesIO()
+
+    with pytest.raises(TypeError):
+        WriteOnlyBackend()
+    with pytest.raises(TypeError):
+        OutputBackend()
+
+
+def test_memory_backend_write(tmp_path):
+    """ JinjaUtils Memory Backend Write Test
+
+    This test will render and write templates to the in memory backend using
+    the write and write_many methods, including backup and compression.
+
+    Expected Result:
+        Outputs are stored in the backend, and nothing is written to disk.
+    """
+    template_file = os.path.join(str(tmp_path), 'memory_tpl.j2')
+    with open(template_file, "w") as template:
+        template.write("hello {{ world }}")
+
+    backend = MemoryBackend()
+    Jinja = JinjaUtils()
+    Jinja.output_backend = backend
+    Jinja.load = template_file
+
+    # The output directory must exist in the backend.
+    Jinja.render(world="Memory")
+    assert(not Jinja.write('/preview', 'index.txt'))
+    backend.makedirs('/preview')
+    assert(Jinja.write('/preview', 'index.txt'))
+    assert(backend.read('/preview/index.txt') == b"hello Memory")
+
+    # Write again to take a backup, then stream a compressed output.
+    assert(Jinja.write('/preview', 'index.txt'))
+    assert(
+        [name for name in backend.listdir('/preview')
+         if name.endswith('.bak')]
+    )
+    Jinja.render_stream(world="Gzip")
+    assert(Jinja.write('/preview', 'index.txt', compression='gzip'))
+    assert(
+        gzip.decompress(backend.read('/preview/index.txt.gz')) ==
+        b"hello Gzip"
+    )
+
+    # Write many outputs, creating the missing directories in memory.
+    stats = Jinja.write_many([
+        ('/preview/a/one.txt', "one"),
+        ('/preview/a/b/two.txt', iter([b"tw", b"o"])),
+    ])
+    assert(stats['written'] == 2)
+    assert(stats['directories_created'] == 2)
+    assert(backend.isdir('/preview/a/b'))
+    assert(backend.listdir('/preview/a') == ['b', 'one.txt'])
+    assert(backend.read('/preview/a/b/two.txt') == b"two")
+
+    # A failed stream leaves the stored output and no temporary output.
+    def failing_stream():
+        yield "partial"
+        raise RuntimeError("stream failure")
+
+    stats = Jinja.write_many(
+        [('/preview/a/b/two.txt', failing_stream())],
+        backup=False
+    )
+    assert(stats['failed'] == 1)
+    assert(backend.read('/preview/a/b/two.txt') == b"two")
+    assert(backend.listdir('/preview/a/b') == ['two.txt'])
+    assert(not os.path.exists('/preview'))
+
+
+def test_callback_and_stream_backends():
+    """ JinjaUtils Callback and Stream Backend Write Test
+
+    This test will write outputs through the callback and stream backends.
+
+    Expected Result:
+        The callback receives each output, the stream receives every chunk.
+    """
+    received = []
+    Jinja = JinjaUtils()
+    Jinja.output_backend = CallbackBackend(
+        lambda path, data: received.append((path, data))
+    )
+    stats = Jinja.write_many([('out/one.txt', "one"), ('two.txt', b"two")])
+    assert(stats['written'] == 2)
+    assert(sorted(received) == [('out/one.txt', b"one"), ('two.txt', b"two")])
+
+    stream = io.BytesIO()
+    Jinja.output_backend = StreamBackend(stream)
+    stats = Jinja.write_many([('one.txt', iter(["o", "n", "e"]))])
+    assert(stats['written'] == 1)
+    assert(stream.getvalue() == b"one")
+
+
+def test_content_addressed_backend(tmp_path):
+    """ JinjaUtils Content Addressed Backend Write Test
+
+    This test will write duplicate and distinct outputs through the content
+    addressed backend using hard links, then overwrite a deduplicated output.
+
+    Expected Result:
+        Duplicate outputs share a single stored blob, and overwriting an
+        output never modifies the shared blob.
+    """
+    store = os.path.join(str(tmp_path), 'store')
+    output = os.path.join(str(tmp_path), 'output')
+    backend = ContentAddressedBackend(store, spool_size=2)
+    Jinja = JinjaUtils()
+    Jinja.output_backend = backend
+
+    stats = Jinja.write_many([
+        (os.path.join(output, 'tenant1.txt'), "shared"),
+        (os.path.join(output, 'tenant2.txt'), iter(["sha", "red"])),
+        (os.path.join(output, 'tenant3.txt'), "unique"),
+    ], max_workers=1)
+    assert(stats['written'] == 3)
+    assert(backend.stats['hits'] == 1)
+    assert(backend.stats['misses'] == 2)
+    assert(backend.stats['bytes_deduplicated'] == 6)
+    first = os.stat(os.path.join(output, 'tenant1.txt'))
+    second = os.stat(os.path.join(output, 'tenant2.txt'))
+    assert(first.st_ino == second.st_ino)
+    assert(first.st_nlink == 3)
+
+    # Overwrite a deduplicated output, backing it up as another link.
+    stats = Jinja.write_many([(os.path.join(output, 'tenant1.txt'), "new")])
+    assert(stats['backups'] == 1)
+    assert(open(os.path.join(output, 'tenant1.txt')).read() == "new")
+    assert(open(os.path.join(output, 'tenant2.txt')).read() == "shared")
+    assert(not [f for f in os.listdir(store) if f.endswith('.tmp')])
+
+
+def test_content_addressed_backend_symlink(tmp_path):
+    """ JinjaUtils Content Addressed Backend Symlink Test
+
+    This test will write duplicate outputs using symlinks to the store.
+
+    Expected Result:
+        Each output is a symlink to the same stored blob.
+    """
+    store = os.path.join(str(tmp_path), 'store')
+    backend = ContentAddressedBackend(store, link='symlink')
+    Jinja = JinjaUtils()
+    Jinja.output_backend = backend
+    Jinja.write_many([
+        (os.path.join(str(tmp_path), 'one.txt'), "same"),
+        (os.path.join(str(tmp_path), 'two.txt'), "same"),
+    ])
+    one = os.path.join(str(tmp_path), 'one.txt')
+    two = os.path.join(str(tmp_path), 'two.txt')
+    assert(os.path.islink(one) and os.path.islink(two))
+    assert(os.readlink(one) == os.readlink(two))
+    assert(os.readlink(one).startswith(store))
+    assert(backend.stats['hits'] == 1)
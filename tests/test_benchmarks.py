@@ -0,0 +1,105 @@
+# Run PyTest:
+# `poetry run pytest tests -v`
+# Run single test file instead of entire test suite:
+# `poetry run pytest tests/test_benchmarks.py -v`
+################
+# Imports:     #
+################
+
+# Project Imports:
+from benchmarks.corpus import CorpusGenerator
+from benchmarks.suite import BENCHMARKS, compare, main, run_benchmarks
+from cloudmage.jinjautils import JinjaUtils
+
+# Base Python Module Imports:
+import json
+
+
+######################################
+# Test Benchmark Suite:              #
+######################################
+def test_run_benchmarks():
+    """ Benchmark Suite Run Test
+
+    This test will run every benchmark once against a tiny corpus.
+
+    Expected Result:
+        Every registered benchmark returns a positive timing.
+    """
+    results = run_benchmarks(corpus_size=3, rows=10, repeat=1, min_time=0)
+    assert(set(results) == set(BENCHMARKS))
+    for result in results.values():
+        assert(result['number'] >= 1)
+        assert(result['best'] > 0 and result['median'] >= result['best'])
+
+
+def test_compare_baseline(tmp_path):
+    """ Benchmark Suite Baseline Compare Test
+
+    This test will compare results against a stored baseline.
+
+    Expected Result:
+        Only benchmarks slower than the threshold are reported, and the
+        command line exits non zero when a regression is found.
+    """
+    baseline = {'results': {
+        'render_small': {'median': 1.0},
+        'render_large': {'median': 1.0}
+    }}
+    results = {
+        'render_small': {'median': 1.05},
+        'render_large': {'median': 1.5},
+        'write_backup': {'median': 9.0}
+    }
+    regressions = compare(results, baseline, threshold=0.10)
+    assert([entry[0] for entry in regressions] == ['render_large'])
+    assert(regressions[0][3] == 1.5)
+
+    baseline_path = str(tmp_path / 'baseline.json')
+    options = ['log_verbose_off', '--corpus-size', '1', '--repeat', '1',
+               '--min-time', '0']
+    assert(main(options + ['--save-baseline', baseline_path]) == 0)
+    with open(baseline_path) as baseline_file:
+        stored = json.load(baseline_file)
+    assert(list(stored['results']) == ['log_verbose_off'])
+    stored['results']['log_verbose_off']['median'] = 1e-12
+    with open(baseline_path, "w") as baseline_file:
+        json.dump(stored, baseline_file)
+    assert(main(options + ['--compare', baseline_path]) == 1)
+
+
+######################################
+# Test Corpus Generator:             #
+######################################
+def test_corpus_generator(tmp_path):
+    """ Synthetic Corpus Generator Test
+
+    This test will generate the same corpus twice and render its pages.
+
+    Expected Result:
+        Both corpora are identical, pages are nested to the requested
+        depth, render through the layout chain and includes, and are close
+        to the requested output size.
+    """
+    settings = dict(
+        seed=7, files=5, depth=3, fanout=2, inheritance=3, includes=2,
+        loop_size=4, output_size=2048
+    )
+    first = CorpusGenerator(**settings).generate(str(tmp_path / 'a'))
+    second = CorpusGenerator(**settings).generate(str(tmp_path / 'b'))
+    assert(first == second)
+    assert(first['fingerprint'] != CorpusGenerator(
+        **dict(settings, seed=8)
+    ).fingerprint())
+    assert(len(first['pages']) == 5)
+    assert(all(page.count("/") == 4 for page in first['pages']))
+    assert(len(first['context']['items']) == 4)
+
+    jinja = JinjaUtils()
+    jinja.template_directory = str(tmp_path / 'a')
+    assert(len(jinja.available_templates) == first['templates'])
+    jinja.load = first['pages'][0]
+    jinja.render(**first['context'])
+    assert("[layout_02]" in jinja.rendered)
+    assert(jinja.rendered.count("item_0003=") == 3)
+    assert(1800 < len(jinja.rendered) < 2300)
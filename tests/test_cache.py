@@ -0,0 +1,57 @@
+# Run PyTest:
+# `poetry run pytest tests -v`
+# Run single test file instead of entire test suite:
+# `poetry run pytest tests/test_cache.py -v`
+################
+# Imports:     #
+################
+
+# Pip Installed Imports:
+from cloudmage.jinjautils.cache import (
+    TemplateCache,
+    source_digest,
+    template_size
+)
+
+
+######################################
+# Test Compiled Template Cache:      #
+######################################
+def test_template_cache():
+    """ JinjaUtils Template Cache Test
+
+    This test will cache templates past the memory limit of the cache,
+    read them back, and lower the limit.
+
+    Expected Result:
+        The least recently used templates are evicted first, templates
+        larger than the limit are not cached, and the stats count every
+        hit, miss and eviction.
+    """
+    assert(source_digest("{{ a }}") == source_digest("{{ a }}"))
+    assert(source_digest("{{ a }}") != source_digest("{{ b }}"))
+    assert(template_size("ab") > template_size("a"))
+
+    cache = TemplateCache(max_bytes=300)
+    assert(cache.put('a', 'A', 100))
+    assert(cache.put('b', 'B', 100))
+    assert(cache.put('c', 'C', 100))
+    assert(cache.get('a') == 'A')
+    assert(cache.put('d', 'D', 100))
+    assert('b' not in cache and 'a' in cache and len(cache) == 3)
+    assert(cache.get('b') is None)
+    assert(not cache.put('e', 'E', 301) and 'e' not in cache)
+
+    cache.max_bytes = 150
+    assert(list(cache._templates) == ['d'])
+    assert(cache.stats() == {
+        'templates': 1,
+        'bytes': 100,
+        'max_bytes': 150,
+        'hits': 1,
+        'misses': 1,
+        'evictions': 3
+    })
+    cache.discard('d')
+    cache.clear()
+    assert(cache.stats()['bytes'] == 0 and len(cache) == 0)
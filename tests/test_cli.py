@@ -0,0 +1,157 @@
+# Run PyTest:
+# `poetry run pytest tests -v`
+# Run single test file instead of entire test suite:
+# `poetry run pytest tests/test_cli.py -v`
+################
+# Imports:     #
+################
+
+# Pip Installed Imports:
+from cloudmage.jinjautils.cli import main, run_manifest
+
+# Base Python Module Imports:
+import json
+import gzip
+import os
+
+
+def _write_manifest(tmp_path, manifest, name='manifest.json'):
+    """ Write the test templates, context file and manifest. """
+    templates = os.path.join(str(tmp_path), 'templates')
+    os.makedirs(templates)
+    with open(os.path.join(templates, 'hello.j2'), "w") as template:
+        template.write("Hello {{ name }}{{ suffix }}")
+    with open(os.path.join(templates, 'items.j2'), "w") as template:
+        template.write("{{ items | to_json }}")
+    with open(os.path.join(str(tmp_path), 'data.json'), "w") as data:
+        json.dump({'items': [1, 2, 3]}, data)
+    manifest_path = os.path.join(str(tmp_path), name)
+    with open(manifest_path, "w") as manifest_file:
+        manifest_file.write(
+            manifest if isinstance(manifest, str) else json.dumps(manifest)
+        )
+    return manifest_path
+
+
+######################################
+# Test Command Line Interface:       #
+######################################
+def test_cli_manifest(tmp_path, capsys):
+    """ JinjaUtils CLI Manifest Test
+
+    This test will render a manifest twice and then force a re-render.
+
+    Expected Result:
+        The outputs are rendered with merged contexts, unchanged outputs
+        are skipped on the second run and rewritten when forced.
+    """
+    manifest_path = _write_manifest(tmp_path, {
+        'template_directory': 'templates',
+        'output_directory': 'out',
+        'defaults': {'context': {'name': 'world', 'suffix': '!'}},
+        'renders': [
+            {'template': 'hello.j2', 'output': 'hello.txt'},
+            {
+                'template': 'hello.j2',
+                'output': 'nested/bob.txt',
+                'context': {'name': 'bob'}
+            },
+            {
+                'template': 'items.j2',
+                'output': 'items.txt',
+                'context_file': 'data.json'
+            },
+        ]
+    })
+    out = os.path.join(str(tmp_path), 'out')
+
+    assert(main([manifest_path, '-j', '1']) == 0)
+    assert("3 renders: 3 written, 0 unchanged" in capsys.readouterr().out)
+    assert(open(os.path.join(out, 'hello.txt')).read() == "Hello world!")
+    assert(open(os.path.join(out, 'nested', 'bob.txt')).read() == "Hello bob!")
+    assert(open(os.path.join(out, 'items.txt')).read() == "[1, 2, 3]")
+    mtime = os.stat(os.path.join(out, 'hello.txt')).st_mtime_ns
+
+    report = run_manifest(manifest_path, workers=2)
+    assert(report['written'] == 0 and report['unchanged'] == 3)
+    assert(os.stat(os.path.join(out, 'hello.txt')).st_mtime_ns == mtime)
+
+    report = run_manifest(manifest_path, skip_unchanged=False)
+    assert(report['written'] == 3 and report['bytes_written'] > 0)
+    assert(set(report['timings']) == {
+        os.path.join(out, 'hello.txt'),
+        os.path.join(out, 'nested', 'bob.txt'),
+        os.path.join(out, 'items.txt')
+    })
+    assert(not any(name.endswith('.bak') for name in os.listdir(out)))
+
+
+def test_cli_failures(tmp_path, capsys):
+    """ JinjaUtils CLI Failure Test
+
+    This test will render a manifest with a missing template, and run
+    invalid manifests.
+
+    Expected Result:
+        Failed renders are reported with a non zero exit code, while valid
+        renders are still written. Invalid manifests exit with status 2.
+    """
+    manifest_path = _write_manifest(tmp_path, (
+        "template_directory = 'templates'\n"
+        "[defaults]\n"
+        "compression = 'gzip'\n"
+        "context = { name = 'toml', suffix = '' }\n"
+        "[[renders]]\n"
+        "template = 'hello.j2'\n"
+        "output = 'hello.txt'\n"
+        "[[renders]]\n"
+        "template = 'missing.j2'\n"
+        "output = 'missing.txt'\n"
+    ), name='manifest.toml')
+
+    assert(main([manifest_path, '--json']) == 1)
+    report = json.loads(capsys.readouterr().out)
+    assert(report['written'] == 1 and report['failed'] == 1)
+    missing = os.path.join(str(tmp_path), 'missing.txt.gz')
+    assert(list(report['errors']) == [os.path.join(
+        str(tmp_path), 'missing.txt'
+    )])
+    assert("not found" in list(report['errors'].values())[0])
+    assert(not os.path.exists(missing))
+    with gzip.open(os.path.join(str(tmp_path), 'hello.txt.gz'), "rt") as f:
+        assert(f.read() == "Hello toml")
+
+    invalid_path = os.path.join(str(tmp_path), 'invalid.json')
+    with open(invalid_path, "w") as manifest_file:
+        json.dump({'renders': [{'template': 'hello.j2'}]}, manifest_file)
+    assert(main([invalid_path]) == 2)
+    assert("expected template and output" in capsys.readouterr().err)
+    assert(main([os.path.join(str(tmp_path), 'manifest.ini')]) == 2)
+
+
+def test_cli_workers(tmp_path):
+    """ JinjaUtils CLI Worker Pool Test
+
+    This test will render a manifest large enough to use several worker
+    processes.
+
+    Expected Result:
+        Every output is written by the worker pool.
+    """
+    manifest_path = _write_manifest(tmp_path, {
+        'template_directory': 'templates',
+        'renders': [
+            {
+                'template': 'hello.j2',
+                'output': "out/{}.txt".format(index),
+                'context': {'name': index}
+            }
+            for index in range(32)
+        ]
+    })
+    report = run_manifest(manifest_path, workers=2)
+    assert(report['workers'] == 2)
+    assert(report['written'] == 32 and not report['errors'])
+    assert(open(os.path.join(str(tmp_path), 'out', '31.txt')).read() == (
+        "Hello 31"
+    ))
@@ -0,0 +1,97 @@
+# Run PyTest:
+# `poetry run pytest tests -v`
+# Run single test file instead of entire test suite:
+# `poetry run pytest tests/test_columnar.py -v`
+################
+# Imports:     #
+################
+
+# Pip Installed Imports:
+from cloudmage.jinjautils import ColumnarTable, JinjaUtils
+from cloudmage.jinjautils.sources import read_csv
+
+# Base Python Module Imports:
+from array import array
+import sys
+import io
+import os
+
+import pytest
+
+
+######################################
+# Test Columnar Table:               #
+######################################
+def test_columnar_table():
+    """ JinjaUtils Columnar Table Test
+
+    This test will build a table from list, array and memoryview columns
+    and access its rows by index, slice and iteration.
+
+    Expected Result:
+        Rows are read only views reading values from the columns, available
+        as attributes, items and mapping methods.
+    """
+    table = ColumnarTable({
+        'name': ['a', 'b', 'c'],
+        'value': array('d', [1.5, 2.5, 3.5]),
+        'count': memoryview(array('q', [1, 2, 3])),
+        'not-identifier': (7, 8, 9),
+        'items': ['x', 'y', 'z'],
+    })
+    assert(len(table) == 3 and table.names[0] == 'name')
+    row = table[1]
+    assert(row.name == 'b' and row['value'] == 2.5 and row.count == 2)
+    assert(row['not-identifier'] == 8 and row['items'] == 'y')
+    assert(row.get('missing') is None and 'name' in row)
+    assert(row.as_dict() == dict(row))
+    assert(not hasattr(row, '__dict__'))
+    assert([item.name for item in table] == ['a', 'b', 'c'])
+    assert(table[-1].name == 'c' and len(table[1:]) == 2)
+    assert(table[1:][0].value == 2.5)
+    assert(table.column('count')[2] == 3)
+    assert(len(ColumnarTable({})) == 0)
+    with pytest.raises(IndexError):
+        table[3]
+    with pytest.raises(ValueError):
+        ColumnarTable({'a': [1, 2], 'b': [1]})
+    with pytest.raises(TypeError):
+        ColumnarTable({'a': "abc"})
+    with pytest.raises(TypeError):
+        ColumnarTable([('a', [1])])
+
+
+def test_columnar_table_records_render(tmp_path):
+    """ JinjaUtils Columnar Table Records and Render Test
+
+    This test will build a table from CSV records with typed columns and
+    render it in a template loop.
+
+    Expected Result:
+        Typed columns are stored in arrays, and the template renders the
+        same output as it would for a list of dicts.
+    """
+    table = ColumnarTable.from_records(
+        read_csv(io.StringIO("name,amount\na,1.5\nb,2\n")),
+        typecodes={'amount': 'd'}
+    )
+    assert(isinstance(table.column('amount'), array))
+    assert(table[1].amount == 2.0)
+    records = [row.as_dict() for row in table]
+    assert(sys.getsizeof(table) > sys.getsizeof(table.column('amount')))
+
+    template_path = os.path.join(str(tmp_path), 'rows.j2')
+    with open(template_path, 'w') as template_file:
+        template_file.write(
+            "{% for row in rows %}{{ loop.index }} {{ row.name }}="
+            "{{ row['amount'] }}{% endfor %}"
+            "{{ rows | map(attribute='amount') | sum }}"
+            "{{ rows | selectattr('amount', 'gt', 1.5) | list | length }}"
+        )
+    Jinja = JinjaUtils()
+    Jinja.template_directory = str(tmp_path)
+    Jinja.load = 'rows.j2'
+    Jinja.render(rows=table)
+    columnar = Jinja.rendered
+    Jinja.render(rows=records)
+    assert(columnar == Jinja.rendered == "1 a=1.52 b=2.03.51")
@@ -0,0 +1,124 @@
+# Run PyTest:
+# `poetry run pytest tests -v`
+# Run single test file instead of entire test suite:
+# `poetry run pytest tests/test_daemon.py -v`
+################
+# Imports:     #
+################
+
+# Pip Installed Imports:
+from cloudmage.jinjautils.daemon import RenderDaemon
+from cloudmage.jinjautils.client import (
+    DaemonClient,
+    send_frame,
+    recv_frame,
+    main
+)
+
+# Base Python Module Imports:
+from concurrent.futures import ThreadPoolExecutor
+import tempfile
+import socket
+import json
+import os
+
+import pytest
+
+
+@pytest.fixture
+def daemon(tmp_path):
+    """ Start a render daemon serving a test template directory. """
+    templates = os.path.join(str(tmp_path), 'templates')
+    os.makedirs(templates)
+    with open(os.path.join(templates, 'hello.j2'), "w") as template:
+        template.write("Hello {{ name }}{{ suffix }}")
+    # Unix socket paths are limited to about 100 characters.
+    directory = tempfile.mkdtemp()
+    daemon = RenderDaemon(os.path.join(directory, 'd.sock'), templates)
+    daemon.start()
+    yield daemon
+    daemon.close()
+    os.rmdir(directory)
+
+
+######################################
+# Test Render Daemon:                #
+######################################
+def test_daemon_render_write(daemon, tmp_path):
+    """ JinjaUtils Render Daemon Test
+
+    This test will render and write templates through a daemon client.
+
+    Expected Result:
+        Renders are returned, writes are skipped when unchanged, errors are
+        reported in the response and the Environment is shared.
+    """
+    data = os.path.join(str(tmp_path), 'data.json')
+    with open(data, "w") as data_file:
+        json.dump({'name': 'file', 'suffix': '?'}, data_file)
+    output = os.path.join(str(tmp_path), 'out', 'hello.txt')
+
+    with DaemonClient(daemon.socket_path) as client:
+        assert(client.ping())
+        response = client.render('hello.j2', context={'name': 'world'})
+        assert(response['ok'] and response['rendered'] == "Hello world")
+        response = client.render(
+            'hello.j2',
+            context={'suffix': '!'},
+            context_file=data
+        )
+        assert(response['rendered'] == "Hello file!")
+
+        response = client.write('hello.j2', output, context={'name': 'a'})
+        assert(response['ok'] and response['written'])
+        assert(open(output).read() == "Hello a")
+        response = client.write('hello.j2', output, context={'name': 'a'})
+        assert(response['unchanged'] and not response['written'])
+
+        response = client.render('missing.j2')
+        assert(not response['ok'] and "not found" in response['error'])
+        response = client.request({'op': 'unknown'})
+        assert(not response['ok'])
+
+        stats = client.stats()
+        assert(stats['renders'] == 2 and stats['writes'] == 2)
+        assert(stats['errors'] == 2 and stats['cached_templates'] == 1)
+
+    def render(name):
+        with DaemonClient(daemon.socket_path) as client:
+            return client.render('hello.j2', context={'name': name})
+
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        names = [str(index) for index in range(20)]
+        results = list(executor.map(render, names))
+    assert([result['rendered'] for result in results] == [
+        "Hello {}".format(name) for name in names
+    ])
+
+
+def test_daemon_protocol(daemon, capsys):
+    """ JinjaUtils Render Daemon Protocol Test
+
+    This test will send raw frames and run the client command.
+
+    Expected Result:
+        Invalid frames are answered with an error, and the client command
+        prints renders and shuts the daemon down.
+    """
+    connection = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    connection.connect(daemon.socket_path)
+    send_frame(connection, ['not', 'a', 'request'])
+    assert(not recv_frame(connection)['ok'])
+    connection.sendall(b"\x00\x00\x00\x02{x")
+    assert("Invalid frame" in recv_frame(connection)['error'])
+    assert(recv_frame(connection) is None)
+    connection.close()
+
+    assert(main([
+        '-s', daemon.socket_path, 'render', 'hello.j2', '-c', '{"name": "c"}'
+    ]) == 0)
+    assert(capsys.readouterr().out == "Hello c")
+    assert(main(['-s', daemon.socket_path, 'render', 'missing.j2']) == 1)
+    assert(main(['-s', daemon.socket_path, 'shutdown']) == 0)
+    daemon.close()
+    assert(not os.path.exists(daemon.socket_path))
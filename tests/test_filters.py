@@ -0,0 +1,235 @@
+# Run PyTest:
+# `poetry run pytest tests -v`
+# Run single test file instead of entire test suite:
+# `poetry run pytest tests/test_filters.py -v`
+################
+# Imports:     #
+################
+
+# Pip Installed Imports:
+from cloudmage.jinjautils import ColumnarTable, JinjaUtils
+from cloudmage.jinjautils.filters import (
+    to_aligned_table,
+    to_csv,
+    to_json,
+    to_json_chunks,
+    to_markdown_table,
+    to_yaml,
+    to_yaml_chunks
+)
+
+# Base Python Module Imports:
+from array import array
+import json
+import os
+
+import pytest
+
+
+ROWS = [
+    {'name': 'web', 'port': 80, 'note': 'a|b'},
+    {'name': 'database', 'port': 5432, 'note': None},
+    {'name': 'dns', 'port': 53},
+]
+
+
+######################################
+# Test Table Filters:                #
+######################################
+def test_table_filters():
+    """ JinjaUtils Table Filters Test
+
+    This test will emit CSV, Markdown and aligned text tables from dict
+    rows, sequence rows, dict columns and a ColumnarTable.
+
+    Expected Result:
+        Every input emits the same table, missing values and the end of
+        shorter dict columns are empty, numeric columns are right aligned
+        and Markdown cells are escaped.
+    """
+    assert(to_csv(ROWS) == (
+        'name,port,note\nweb,80,a|b\ndatabase,5432,\ndns,53,'
+    ))
+    assert(to_csv(ROWS, columns=['port'], header=False) == '80\n5432\n53')
+    assert(to_csv(
+        [('a', 'x,y')], headers=['name', 'value'], delimiter=';'
+    ) == 'name;value\na;x,y')
+    assert(to_csv(iter([]), columns=['name']) == 'name')
+    assert(to_csv([]) == '')
+
+    assert(to_markdown_table(ROWS, align={'name': 'center'}) == (
+        "| name | port | note |\n"
+        "| :---: | ---: | --- |\n"
+        "| web | 80 | a\\|b |\n"
+        "| database | 5432 |  |\n"
+        "| dns | 53 |  |"
+    ))
+
+    aligned = (
+        "name      port  note\n"
+        "--------  ----  ----\n"
+        "web         80  a|b\n"
+        "database  5432\n"
+        "dns         53"
+    )
+    columns = {
+        'name': ['web', 'database', 'dns'],
+        'port': array('H', [80, 5432, 53]),
+        'note': ['a|b', None, None],
+    }
+    assert(to_aligned_table(ROWS) == aligned)
+    assert(to_aligned_table(columns) == aligned)
+    assert(to_aligned_table(ColumnarTable(columns)) == aligned)
+    # Shorter dict columns are padded with missing values, not truncated.
+    assert(to_csv({'a': [1, 2, 3], 'b': [1]}) == 'a,b\n1,1\n2,\n3,')
+    assert(to_aligned_table(dict(columns, note=['a|b'])) == aligned)
+    assert(to_markdown_table({'a': [1, 2], 'b': []}) == (
+        "| a | b |\n"
+        "| ---: | --- |\n"
+        "| 1 |  |\n"
+        "| 2 |  |"
+    ))
+    assert(to_aligned_table(
+        [(1, 'x'), (22, 'y')], header=False, separator=' | '
+    ) == " 1 | x\n22 | y")
+    with pytest.raises(ValueError):
+        to_csv(ROWS, headers=['name'])
+
+
+def test_table_filters_environment(tmp_path):
+    """ JinjaUtils Table Filters Environment Test
+
+    This test will render a template using the table filters from a
+    template directory.
+
+    Expected Result:
+        The filters are registered on the Jinja Environment.
+    """
+    with open(os.path.join(str(tmp_path), 'table.j2'), 'w') as template:
+        template.write(
+            "{{ rows | to_csv(columns=['name']) }}\n"
+            "{{ rows | to_markdown_table(columns=['port']) }}\n"
+            "{{ rows | to_aligned_table(headers=['N', 'P', 'X']) }}"
+        )
+    Jinja = JinjaUtils()
+    Jinja.template_directory = str(tmp_path)
+    Jinja.load = 'table.j2'
+    Jinja.render(rows=ROWS[:1])
+    assert(Jinja.rendered == (
+        "name\nweb\n| port |\n| ---: |\n| 80 |\nN     P  X\n---  --  ---\n"
+        "web  80  a|b"
+    ))
+
+
+######################################
+# Test JSON and YAML Filters:        #
+######################################
+@pytest.mark.parametrize('options', [
+    {},
+    {'indent': 2},
+    {'indent': '\t', 'sort_keys': True},
+    {'separators': [',', ':']},
+])
+def test_json_filters(options):
+    """ JinjaUtils JSON Filters Test
+
+    This test will serialize values with the to_json and to_json_chunks
+    filters, using more list and dict items than are encoded in a batch.
+
+    Expected Result:
+        The filters return the json.dumps output, and joined chunks match
+        it.
+    """
+    values = [
+        [{'id': index, 'tags': ['a', 'b\n']} for index in range(600)],
+        {'k{}'.format(index): [index] for index in range(300)},
+        {2: 'b', 1: 'a'},
+        [],
+        {},
+        'text',
+        None,
+    ]
+    dumps_options = dict(options)
+    if 'separators' in options:
+        dumps_options['separators'] = tuple(options['separators'])
+    for value in values:
+        expected = json.dumps(value, **dumps_options)
+        assert(to_json(value, **options) == expected)
+        chunks = list(to_json_chunks(value, chunk_size=1000, **options))
+        assert(''.join(chunks) == expected)
+    assert(to_json({'a': [1]}, compact=True) == '{"a":[1]}')
+    assert(len(list(to_json_chunks(values[0], chunk_size=1000))) > 2)
+
+
+def test_yaml_filters():
+    """ JinjaUtils YAML Filters Test
+
+    This test will serialize values with the to_yaml and to_yaml_chunks
+    filters in block and compact flow style, with document markers and
+    with shared objects.
+
+    Expected Result:
+        The YAML text loads back to the value, does not end with a line
+        break, and joined chunks match the to_yaml output, including its
+        document markers, anchors and aliases.
+    """
+    yaml = pytest.importorskip('yaml')
+    value = {'b': [1, 2], 'a': {'name': 'x'}}
+    assert(to_yaml(value) == "b:\n- 1\n- 2\na:\n  name: x")
+    assert(to_yaml(value, sort_keys=True).startswith("a:"))
+    assert(to_yaml(value, compact=True) == "{b: [1, 2], a: {name: x}}")
+    assert(to_yaml('text') == "text")
+    records = [{'id': index} for index in range(100)]
+    for data in (value, records, [], 'text'):
+        for options in ({}, {'sort_keys': True}, {'compact': True}):
+            assert(''.join(
+                to_yaml_chunks(data, chunk_size=64, **options)
+            ) == to_yaml(data, **options))
+    # Document markers are written once, and shared objects keep their
+    # anchors and aliases.
+    shared = {'name': 'x'}
+    for data, options in (
+        (records, {'explicit_start': True}),
+        (records, {'explicit_end': True, 'version': (1, 1)}),
+        ([shared, shared], {}),
+        ({'a': shared, 'b': [shared]}, {}),
+    ):
+        expected = to_yaml(data, **options)
+        assert(''.join(
+            to_yaml_chunks(data, chunk_size=64, **options)
+        ) == expected)
+        assert(yaml.safe_load(expected) == data)
+    assert(to_yaml(records, explicit_start=True).count('---') == 1)
+    assert("&id001" in to_yaml([shared, shared]))
+    assert(yaml.safe_load(to_yaml(records)) == records)
+
+
+def test_json_filters_render_stream(tmp_path):
+    """ JinjaUtils JSON Filters Render Stream Test
+
+    This test will stream a template writing a large list with the
+    to_json_chunks filter.
+
+    Expected Result:
+        The written file holds the full JSON document.
+    """
+    with open(os.path.join(str(tmp_path), 'data.j2'), 'w') as template:
+        template.write(
+            "{{ records[:1] | to_json(compact=True) }}\n"
+            "{% for chunk in records | to_json_chunks(chunk_size=100) %}"
+            "{{ chunk }}{% endfor %}"
+        )
+    records = [{'id': index} for index in range(1000)]
+    Jinja = JinjaUtils()
+    Jinja.template_directory = str(tmp_path)
+    Jinja.load = 'data.j2'
+    Jinja.render_stream(records=records)
+    assert(Jinja.write(
+        output_directory=str(tmp_path),
+        output_file='data.json',
+        backup=False
+    ))
+    with open(os.path.join(str(tmp_path), 'data.json')) as output:
+        first, document = output.read().split('\n', 1)
+    assert(first == '[{"id":0}]')
+    assert(json.loads(document) == records)
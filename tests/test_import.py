@@ -0,0 +1,111 @@
+# Run PyTest:
+# `poetry run pytest tests -v`
+# Run single test file instead of entire test suite:
+# `poetry run pytest tests/test_import.py -v`
+################
+# Imports:     #
+################
+
+# Base Python Module Imports:
+import subprocess
+import json
+import sys
+import os
+
+
+# Import time budgets in seconds, measured in a fresh interpreter.
+PACKAGE_IMPORT_BUDGET = 0.05
+JINJAUTILS_IMPORT_BUDGET = 0.05
+
+# Repository root, so the child interpreter imports this checkout.
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def _run(code):
+    """ Run code in a fresh interpreter and return its JSON output. """
+    env = dict(os.environ)
+    env['PYTHONPATH'] = os.pathsep.join(
+        filter(None, [ROOT, env.get('PYTHONPATH')])
+    )
+    output = subprocess.run(
+        [sys.executable, "-c", code],
+        env=env,
+        check=True,
+        capture_output=True,
+        text=True
+    ).stdout
+    return json.loads(output.splitlines()[-1])
+
+
+def _best_import_time(setup, statement, runs=3):
+    """ Return the fastest of several timed imports in fresh interpreters.
+    """
+    code = (
+        "import time\n"
+        "{}\n"
+        "started = time.perf_counter()\n"
+        "{}\n"
+        "print(time.perf_counter() - started)\n"
+    ).format(setup, statement)
+    return min(_run(code) for _ in range(runs))
+
+
+######################################
+# Test Package Import:               #
+######################################
+def test_import_is_lazy():
+    """ Package Import Laziness Test
+
+    This test will import the package and the JinjaUtils class in a fresh
+    interpreter and list the modules that were imported.
+
+    Expected Result:
+        Importing the package, or the template cache module, imports neither
+        Jinja nor the stdlib modules that are only needed on specific paths,
+        such as hashlib, and importing JinjaUtils
+        does not import the archive, metrics endpoint, batch write or
+        memory profiling dependencies.
+    """
+    deferred = [
+        'http.server', 'tarfile', 'zipfile', 'concurrent.futures',
+        'tracemalloc', 'cloudmage.jinjautils.archive',
+        'cloudmage.jinjautils.openmetrics', 'cloudmage.jinjautils.memory'
+    ]
+    code = (
+        "import sys\n"
+        "import cloudmage.jinjautils\n"
+        "package = sorted(sys.modules)\n"
+        "import cloudmage.jinjautils.cache\n"
+        "cache = sorted(sys.modules)\n"
+        "from cloudmage.jinjautils import JinjaUtils\n"
+        "JinjaUtils()\n"
+        "import json\n"
+        "print(json.dumps([package, cache, sorted(sys.modules)]))\n"
+    )
+    package, cache, jinjautils = _run(code)
+    for module in deferred + ['jinja2', 'inspect', 'json', 'shutil']:
+        assert(module not in package)
+    # Jinja imports hashlib itself, the template cache must not.
+    for module in ['hashlib', 'jinja2']:
+        assert(module not in package and module not in cache)
+    for module in deferred:
+        assert(module not in jinjautils)
+    assert('jinja2' in jinjautils)
+
+
+def test_import_time_budget():
+    """ Package Import Time Budget Test
+
+    This test will time the package import, and the JinjaUtils import on
+    top of an already imported Jinja, in fresh interpreters.
+
+    Expected Result:
+        Both imports complete within their budget.
+    """
+    package = _best_import_time("", "import cloudmage.jinjautils")
+    assert(package < PACKAGE_IMPORT_BUDGET)
+    jinjautils = _best_import_time(
+        "import jinja2",
+        "from cloudmage.jinjautils import JinjaUtils"
+    )
+    assert(jinjautils < JINJAUTILS_IMPORT_BUDGET)
@@ -1417,6 +1417,296 @@ def test_render_exception_template_object(capsys):
 -> No template loaded, Aborting render!" in err
 
 
+def test_render_native(tmp_path, capsys):
+    """ JinjaUtils Class Jinja Native Render Test
+
+    This test will test the native property and render the templates of a
+    template directory and a template file path in native mode.
+
+    Expected Result:
+        Templates made of a single expression render to Python objects,
+        other templates render to str, and native results are written as
+        text while streamed renders are refused.
+    """
+    with open(os.path.join(str(tmp_path), 'config.j2'), 'w') as template:
+        template.write(
+            "{{ {'name': name, 'replicas': replicas * 2, 'ports': ports} }}\n"
+        )
+    with open(os.path.join(str(tmp_path), 'text.j2'), 'w') as template:
+        template.write("name: {{ name }}")
+
+    # Instantiate a JinjaUtils object, and test for expected test values.
+    Jinja = JinjaUtils(verbose=True, native=True)
+    assert(Jinja.native is True)
+    Jinja.template_directory = str(tmp_path)
+    Jinja.load = 'config.j2'
+    Jinja.render(name='web', replicas=2, ports=[80, 443])
+    assert(Jinja.rendered == {
+        'name': 'web', 'replicas': 4, 'ports': [80, 443]
+    })
+    assert(Jinja.write(
+        output_directory=str(tmp_path),
+        output_file='config.txt',
+        backup=False
+    ))
+    with open(os.path.join(str(tmp_path), 'config.txt')) as output:
+        assert(output.read() == str(Jinja.rendered))
+    Jinja.render_stream(name='web', replicas=2, ports=[])
+    assert(Jinja._rendered_stream is None)
+
+    Jinja.load = 'text.j2'
+    Jinja.render(name='web')
+    assert(Jinja.rendered == "name: web")
+    Jinja.load = os.path.join(str(tmp_path), 'config.j2')
+    Jinja.render(name='db', replicas=1, ports=[])
+    assert(Jinja.rendered['replicas'] == 2)
+
+    # Disabling native mode applies to the next template directory.
+    Jinja.native = 'yes'
+    assert(Jinja.native is True)
+    Jinja.native = False
+    Jinja.template_directory = str(tmp_path)
+    Jinja.load = 'config.j2'
+    Jinja.render(name='web', replicas=2, ports=[])
+    assert(Jinja.rendered == "{'name': 'web', 'replicas': 4, 'ports': []}")
+
+    # Capture stdout, stderr to check the log messages
+    # for the expected outputs.
+    out, err = capsys.readouterr()
+    assert "ERROR   CLS->JinjaUtils.render_stream: \
+-> Streamed renders are not available in native mode!" in err
+    assert "ERROR   CLS->JinjaUtils.native: \
+-> native argument expected bool but received type: <class 'str'>" in err
+
+
+def test_render_globals(tmp_path, capsys):
+    """ JinjaUtils Class Jinja Render Globals Test
+
+    This test will register shared and template globals, and render
+    templates of a template directory and a template file path with them.
+
+    Expected Result:
+        Render arguments override template globals, which override shared
+        globals, included templates see the shared globals, and removed
+        globals are no longer defined.
+    """
+    templates = {
+        'page.j2': "{{ site }}|{{ title }}|{% include 'part.j2' %}",
+        'part.j2': "{{ site }}:{{ title | default('none') }}",
+    }
+    for name, source in templates.items():
+        with open(os.path.join(str(tmp_path), name), 'w') as template:
+            template.write(source)
+
+    Jinja = JinjaUtils(verbose=True)
+    assert(Jinja.add_globals({'site': 'shared'}, title='shared'))
+    Jinja.template_directory = str(tmp_path)
+    assert(Jinja.add_globals(title='page', template='page.j2'))
+    Jinja.load = 'page.j2'
+    Jinja.render()
+    assert(Jinja.rendered == "shared|page|shared:shared")
+    Jinja.render(site='arg', title='arg')
+    assert(Jinja.rendered == "arg|arg|arg:arg")
+    Jinja.load = os.path.join(str(tmp_path), 'part.j2')
+    Jinja.render()
+    assert(Jinja.rendered == "shared:shared")
+
+    assert(Jinja.remove_globals('title') == 1)
+    Jinja.render()
+    assert(Jinja.rendered == "shared:none")
+    assert(Jinja.remove_globals(template='page.j2') == 1)
+    assert(Jinja.remove_globals() == 1)
+    assert(Jinja.remove_globals('missing') == 0)
+    assert(not Jinja.add_globals(['site']))
+    assert(not Jinja.add_globals())
+
+    # Capture stdout, stderr to check the log messages
+    # for the expected outputs.
+    out, err = capsys.readouterr()
+    assert "Registered page.j2 globals: ['title']" in out
+    assert "add_globals values expected dict but received" in err
+
+
+def test_required_variables(tmp_path, capsys):
+    """ JinjaUtils Class Jinja Required Variables Test
+
+    This test will analyze the variables of a template that extends,
+    includes and imports other templates, validate and prune contexts with
+    them, and modify a template to check the analysis is refreshed.
+
+    Expected Result:
+        Required variables include the variables of referenced templates,
+        except overridden blocks, names the template assigns before the
+        reference or binds in an enclosing loop, macro or with scope,
+        globals and builtins, and pruned contexts only keep the variables
+        read.
+    """
+    templates = {
+        'base.j2': "{% block title %}{{ default }}{% endblock %}{{ footer }}",
+        'page.j2': (
+            "{% extends 'base.j2' %}"
+            "{% block title %}{{ title }}{% endblock %}"
+            "{% block body %}{% for user in users %}"
+            "{% include 'row.j2' %}{% endfor %}{{ range(2) | list }}"
+            "{{ site }}{% endblock %}"
+        ),
+        'row.j2': (
+            "{{ user }}{{ css }}{% include 'other.j2' without context %}"
+        ),
+        'other.j2': "{{ unused }}",
+        'dynamic.j2': "{% include name %}{{ title }}",
+        'hello.j2': "Hello {{ name }}",
+        'macro.j2': (
+            "{% macro row(name) %}{{ name }}{% endmacro %}"
+            "{% include 'hello.j2' %}"
+        ),
+        'assigned.j2': "{% set name = 'x' %}{% include 'hello.j2' %}",
+        'late.j2': "{% include 'hello.j2' %}{% set name = 'x' %}",
+        'item.j2': "{{ item.name }}",
+        'loop.j2': (
+            "{% for item in items %}{% include 'item.j2' %}{% endfor %}"
+        ),
+        'argument.j2': (
+            "{% macro greet(name) %}{% include 'hello.j2' %}{% endmacro %}"
+            "{{ greet('ann') }}"
+        ),
+        'scoped.j2': (
+            "{% for user in users %}{% with name = user %}"
+            "{% include 'hello.j2' %}{% endwith %}{% endfor %}"
+            "{% for other in users %}{% else %}{% include 'item.j2' %}"
+            "{% endfor %}"
+        ),
+    }
+    for name, source in templates.items():
+        with open(os.path.join(str(tmp_path), name), 'w') as template:
+            template.write(source)
+
+    Jinja = JinjaUtils(verbose=True)
+    Jinja.template_directory = str(tmp_path)
+    Jinja.add_globals(site='site')
+    assert(
+        Jinja.required_variables('page.j2') ==
+        {'title', 'users', 'css', 'footer'}
+    )
+    Jinja.load = 'page.j2'
+    assert(Jinja.required_variables() == {'title', 'users', 'css', 'footer'})
+    assert(
+        Jinja.missing_variables({'title': 'x', 'users': []}) ==
+        ['css', 'footer']
+    )
+    assert(
+        Jinja.prune_context({'title': 'x', 'site': 'y', 'extra': 'z'}) ==
+        {'title': 'x', 'site': 'y'}
+    )
+    assert(Jinja.required_variables('dynamic.j2') == {'name', 'title'})
+    assert(
+        Jinja.prune_context({'extra': 'z'}, 'dynamic.j2') == {'extra': 'z'}
+    )
+    assert(Jinja.required_variables('macro.j2') == {'name'})
+    assert(
+        Jinja.prune_context({'name': 'ann'}, 'macro.j2') == {'name': 'ann'}
+    )
+    assert(Jinja.required_variables('assigned.j2') == frozenset())
+    assert(Jinja.required_variables('late.j2') == {'name'})
+    # Loop targets, macro arguments and with targets enclosing a reference
+    # are bound for the referenced template.
+    assert(Jinja.required_variables('loop.j2') == {'items'})
+    assert(
+        Jinja.missing_variables({'items': [{'name': 'a'}]}, 'loop.j2') == []
+    )
+    assert(Jinja.render_string(
+        "{% include 'loop.j2' %}", items=[{'name': 'a'}]
+    ) == "a")
+    assert(Jinja.required_variables('argument.j2') == frozenset())
+    assert(Jinja.required_variables('scoped.j2') == {'users', 'item'})
+    row_path = os.path.join(str(tmp_path), 'row.j2')
+    assert(Jinja.required_variables(row_path) == {'user', 'css'})
+
+    # A modified template is analyzed again.
+    with open(row_path, 'w') as template:
+        template.write("{{ user }}{{ row_class }}")
+    os.utime(row_path, (0, 0))
+    assert(
+        Jinja.required_variables('page.j2') ==
+        {'title', 'users', 'row_class', 'footer'}
+    )
+    assert(Jinja.required_variables('missing.j2') is None)
+    assert(Jinja.prune_context(['title']) is None)
+
+    # Capture stdout, stderr to check the log messages
+    # for the expected outputs.
+    out, err = capsys.readouterr()
+    assert "dynamic.j2 references templates that can't be analyzed" in out
+    assert "Requested template not found: missing.j2" in err
+    assert "prune_context context expected dict but received" in err
+
+
+def test_render_string(tmp_path, capsys):
+    """ JinjaUtils Class Jinja Render String Test
+
+    This test will load and render templates from source strings, with and
+    without a template directory, and with different settings.
+
+    Expected Result:
+        Repeated sources are served from the string template cache, the
+        settings and name are part of the cache key, string templates can
+        include directory templates, and invalid sources are rejected.
+    """
+    with open(os.path.join(str(tmp_path), 'part.j2'), 'w') as template:
+        template.write("[{{ title }}]")
+
+    Jinja = JinjaUtils(verbose=True)
+    source = "Hello {{ name }}!"
+    assert(Jinja.render_string(source, name='one') == "Hello one!")
+    assert(Jinja.render_string(source, name='two') == "Hello two!")
+    assert(Jinja.string_cache_stats()['hits'] == 1)
+    assert(Jinja.required_variables() == {'name'})
+    # Unnamed string templates are named after their source digest.
+    assert(Jinja.load_string("hi {{ n }}"))
+    unnamed = Jinja.load
+    assert(unnamed.startswith("<string:") and len(unnamed) == 21)
+    assert(Jinja.load_string("bye {{ n }}") and Jinja.load != unnamed)
+
+    Jinja.template_directory = str(tmp_path)
+    Jinja.add_globals(title='page', template='page')
+    assert(Jinja.load_string("{% include 'part.j2' %}", name='page'))
+    assert(Jinja.load == 'page')
+    Jinja.render(title='arg')
+    assert(Jinja.rendered == "[arg]")
+    Jinja.render()
+    assert(Jinja.rendered == "[]")
+    assert(Jinja.render_string(
+        "{{ title }}:{{ name }}", template_name='page', name='n'
+    ) == "page:n")
+    assert(Jinja.load == 'page')
+
+    source = "{% if True %}\n  {{ value }}\n{% endif %}"
+    assert(Jinja.render_string(source, value=1) == "  1\n")
+    Jinja.trim_blocks = False
+    Jinja.lstrip_blocks = False
+    assert(Jinja.render_string(source, value=1) == "\n  1\n")
+    Jinja.native = True
+    assert(Jinja.render_string("{{ value }}", value=[1]) == [1])
+    assert(Jinja.string_cache_stats()['templates'] == 5)
+
+    Jinja.string_cache_size = 0
+    assert(Jinja.string_cache_stats()['templates'] == 0)
+    assert(Jinja.render_string("{{ value }}", value=[1]) == [1])
+    assert(Jinja.string_cache_stats()['templates'] == 0)
+    Jinja.string_cache_size = -1
+    assert(Jinja.string_cache_size == 0)
+    assert(not Jinja.load_string(None))
+    assert(Jinja.render_string("{% if %}") is None)
+    assert(Jinja.load == 'No template has been loaded!')
+
+    # Capture stdout, stderr to check the log messages
+    # for the expected outputs.
+    out, err = capsys.readouterr()
+    assert "Loaded template from the string template cache." in out
+    assert "string_cache_size argument expected int >= 0" in err
+    assert "load_string expected str source and name but received" in err
+
+
 ###############################
 # Test Write template method: #
 ###############################
@@ -2046,3 +2336,439 @@ def test_write_backup_invalid(capsys):
     assert "written successfully!" in out
     assert(backup_file)
     assert(write_template)
+
+
+####################################
+# Test Write Many template method:  #
+####################################
+def test_write_many(tmp_path, capsys):
+    """ JinjaUtils Class Jinja Write Many Method Test
+
+    This test will test JinjaUtils write_many method. This test will write a
+    batch of str, bytes and streamed outputs across an existing and a missing
+    nested output directory, then write the batch a second time to trigger
+    the backup case.
+
+    Expected Result:
+        All outputs are written, the missing directory is created once, and
+        the second write backs up each of the existing files.
+    """
+    # Instantiate a JinjaUtils object, and test for expected test values.
+    Jinja = JinjaUtils(verbose=True)
+    assert(isinstance(Jinja, object))
+
+    # Define the batch of outputs to write.
+    nested_directory = os.path.join(str(tmp_path), 'nested', 'output')
+    items = [
+        (os.path.join(str(tmp_path), 'one.txt'), "one"),
+        (os.path.join(str(tmp_path), 'two.txt'), b"two"),
+        (os.path.join(nested_directory, 'three.txt'), iter(["th", "ree"])),
+    ]
+
+    # Write the batch and test the returned stats.
+    stats = Jinja.write_many(items)
+    assert(stats['total'] == 3)
+    assert(stats['written'] == 3)
+    assert(stats['failed'] == 0)
+    assert(stats['backups'] == 0)
+    assert(stats['directories_validated'] == 2)
+    assert(stats['directories_created'] == 1)
+    assert(not stats['errors'])
+    assert(open(os.path.join(nested_directory, 'three.txt')).read() == "three")
+
+    # Write the batch a second time to trigger the backups.
+    items[2] = (os.path.join(nested_directory, 'three.txt'), "3")
+    stats = Jinja.write_many(items, max_workers=2)
+    assert(stats['written'] == 3)
+    assert(stats['backups'] == 3)
+    assert(stats['directories_created'] == 0)
+    assert(
+        [f for f in os.listdir(nested_directory) if f.endswith('.bak')]
+    )
+
+    # bytes_written counts encoded bytes, and a repeated output path is only
+    # written once.
+    unicode_path = os.path.join(str(tmp_path), 'unicode.txt')
+    stats = Jinja.write_many([
+        (unicode_path, "café"),
+        (os.path.join(str(tmp_path), '.', 'unicode.txt'), "other"),
+    ], max_workers=2)
+    assert(stats['written'] == 1 and stats['failed'] == 1)
+    assert(stats['bytes_written'] == len("café".encode()))
+    assert(open(unicode_path, encoding='utf-8').read() == "café")
+    assert(
+        "listed more than once" in
+        stats['errors'][os.path.join(str(tmp_path), '.', 'unicode.txt')]
+    )
+
+    # Capture stdout, stderr to check the log messages
+    # for the expected outputs.
+    out, err = capsys.readouterr()
+    assert "INFO    CLS->JinjaUtils.write_many: \
+-> 3 of 3 outputs written successfully!" in out
+
+
+def test_write_many_invalid(tmp_path, capsys):
+    """ JinjaUtils Class Jinja Write Many Invalid Items Method Test
+
+    This test will test JinjaUtils write_many method. This test will pass
+    invalid items, an output directory that is a file, and a failing stream,
+    to ensure that the errors are reported per item without aborting the
+    valid writes.
+
+    Expected Result:
+        Valid items are written, each invalid item is reported in the
+        returned errors, and a failed stream leaves the existing output.
+    """
+    # Instantiate a JinjaUtils object, and test for expected test values.
+    Jinja = JinjaUtils(verbose=True)
+    assert(isinstance(Jinja, object))
+
+    # Create a file that will be used as an invalid output directory.
+    file_directory = os.path.join(str(tmp_path), 'not_a_directory')
+    open(file_directory, "w").close()
+
+    stats = Jinja.write_many([
+        (os.path.join(str(tmp_path), 'valid.txt'), "valid"),
+        (os.path.join(file_directory, 'invalid.txt'), "invalid"),
+        ('no_content',),
+    ])
+    assert(stats['total'] == 3)
+    assert(stats['written'] == 1)
+    assert(stats['failed'] == 2)
+    assert(os.path.join(file_directory, 'invalid.txt') in stats['errors'])
+
+    # A stream that fails part way leaves the existing output untouched.
+    def failing_stream():
+        yield "partial"
+        raise RuntimeError("stream failure")
+
+    existing = os.path.join(str(tmp_path), 'existing.txt')
+    with open(existing, "w") as output:
+        output.write("previous")
+    stats = Jinja.write_many([(existing, failing_stream())], backup=False)
+    assert(stats['failed'] == 1 and stats['written'] == 0)
+    assert(open(existing).read() == "previous")
+    assert(not [name for name in os.listdir(str(tmp_path))
+                if name.endswith('.tmp')])
+    stats = Jinja.write_many([(existing, iter(["new", "er"]))], backup=False)
+    assert(stats['written'] == 1 and open(existing).read() == "newer")
+
+    # A non iterable batch should fail gracefully.
+    assert(not Jinja.write_many(42))
+    out, err = capsys.readouterr()
+    assert "ERROR   CLS->JinjaUtils.write_many: \
+-> write_many expected iterable of items but received:" in err
+
+
+####################################
+# Test Render Many template method:  #
+####################################
+def test_render_many(tmp_path, capsys):
+    """ JinjaUtils Class Jinja Render Many Method Test
+
+    This test will test JinjaUtils render_many method. This test will render
+    the loaded template for a generator of records and for a JSON Lines file
+    in small chunks, writing each output to a templated output path.
+
+    Expected Result:
+        Each record is rendered with the shared context to its own output
+        path, records that fail are reported without aborting the batch.
+    """
+    # Instantiate a JinjaUtils object, and test for expected test values.
+    Jinja = JinjaUtils(verbose=True)
+    Jinja.template_directory = os.path.join(
+        os.getcwd(),
+        'pytest_template_directory'
+    )
+    assert(Jinja.render_many([], 'out.txt') is False)
+    Jinja.load = 'test_tpl.j2'
+    assert(Jinja.render_many([], 'out.txt', chunk_size=0) is False)
+
+    records = (
+        {'name': "record_{}".format(index), 'context': {'index': index}}
+        for index in range(5)
+    )
+    stats = Jinja.render_many(
+        records,
+        "{{ debug }}/{{ name }}_{{ index }}.txt",
+        output_directory=str(tmp_path),
+        context={'debug': 'batch'},
+        chunk_size=2
+    )
+    assert(stats['records'] == 5 and stats['rendered'] == 5)
+    assert(stats['written'] == 5 and stats['chunks'] == 3)
+    assert(not stats['errors'])
+    output = open(
+        os.path.join(str(tmp_path), 'batch', 'record_3_3.txt')
+    ).read()
+    assert("name = record_3" in output and "index = 3" in output)
+
+    jsonl = os.path.join(str(tmp_path), 'records.jsonl')
+    with open(jsonl, "w") as records_file:
+        records_file.write(
+            '{"name": "a", "context": {}}\n'
+            '{"name": "b"}\n'
+            '{"name": "c", "context": {}}\n'
+            'not json\n'
+        )
+    stats = Jinja.render_many(
+        jsonl,
+        os.path.join(str(tmp_path), 'jsonl', '{{ name }}.txt'),
+        chunk_size=2,
+        skip_unchanged=True
+    )
+    assert(stats['records'] == 3 and stats['written'] == 2)
+    assert(stats['chunks'] == 1)
+    assert(stats['failed'] == 2)
+    assert(
+        os.path.join(str(tmp_path), 'jsonl', 'b.txt') in stats['errors']
+    )
+    assert("Invalid JSON on line 4" in stats['errors']['record 3'])
+    assert(os.path.exists(os.path.join(str(tmp_path), 'jsonl', 'c.txt')))
+
+    # Output paths rendered from record fields can't escape output_directory.
+    contained = os.path.join(str(tmp_path), 'contained')
+    os.makedirs(contained)
+    stats = Jinja.render_many(
+        [
+            {'name': '../escaped', 'context': {}},
+            {'name': os.path.join(str(tmp_path), 'absolute'), 'context': {}},
+            {'name': 'sub/../kept', 'context': {}}
+        ],
+        "{{ name }}.txt",
+        output_directory=contained
+    )
+    assert(stats['records'] == 3 and stats['written'] == 1)
+    assert(stats['failed'] == 2)
+    assert(
+        stats['errors'][os.path.join(str(tmp_path), 'escaped.txt')] ==
+        "Output path is outside the output directory."
+    )
+    assert(not os.path.exists(os.path.join(str(tmp_path), 'escaped.txt')))
+    assert(not os.path.exists(os.path.join(str(tmp_path), 'absolute.txt')))
+    assert(os.path.exists(os.path.join(contained, 'kept.txt')))
+
+    # Records that are not dicts are reported without failing the batch.
+    stats = Jinja.render_many(
+        [['not', 'a', 'dict'], {'name': 'valid', 'context': {}}, None],
+        "{{ name }}.txt",
+        output_directory=contained
+    )
+    assert(stats['records'] == 3 and stats['written'] == 1)
+    assert(stats['failed'] == 2)
+    assert("Record expected dict" in stats['errors']['record 0'])
+    assert("NoneType" in stats['errors']['record 2'])
+
+    # Capture stdout, stderr to check the log messages
+    # for the expected outputs.
+    out, err = capsys.readouterr()
+    assert "INFO    CLS->JinjaUtils.render_many: \
+-> 5 of 5 records written successfully!" in out
+
+
+####################################
+# Test Compressed Write method:    #
+####################################
+def test_write_compressed_stream(tmp_path, capsys):
+    """ JinjaUtils Class Jinja Compressed Stream Write Method Test
+
+    This test will test JinjaUtils render_stream and write methods. This test
+    will stream a rendered template into a gzip compressed output file, then
+    write a compressed rendered template over it to trigger the backup case.
+
+    Expected Result:
+        The output file name will have the .gz extension appended, contain
+        the compressed rendered template, and the backup will keep the
+        compression extension.
+    """
+    import gzip
+
+    # Declare the test template directory thats constructed during test setup
+    current_directory = os.getcwd()
+    test_template_directory = os.path.join(
+        current_directory,
+        'pytest_template_directory'
+    )
+
+    # Instantiate a JinjaUtils object, and load the test template.
+    Jinja = JinjaUtils(verbose=True)
+    Jinja.template_directory = test_template_directory
+    Jinja.load = 'test_tpl.j2'
+
+    # Stream the template render into a compressed output file.
+    Jinja.render_stream(name="PyTest", debug=True, context={'key': 'value'})
+    assert(Jinja._rendered_stream is not None)
+    assert(Jinja._rendered_template is None)
+    write_template = Jinja.write(
+        output_directory=str(tmp_path),
+        output_file='stream.txt',
+        compression='gzip'
+    )
+    assert(write_template)
+    assert(Jinja._rendered_stream is None)
+    assert(Jinja._output_file == 'stream.txt.gz')
+    with gzip.open(os.path.join(str(tmp_path), 'stream.txt.gz'), 'rt') as f:
+        assert('name = PyTest' in f.read())
+
+    # Overwrite the compressed output to trigger the backup.
+    Jinja.render(name="OverWrite", debug=True, context={'key': 'value'})
+    write_template = Jinja.write(
+        output_directory=str(tmp_path),
+        output_file='stream.txt.gz',
+        compression='gzip'
+    )
+    assert(write_template)
+    backup_files = [
+        f for f in os.listdir(str(tmp_path)) if f.endswith('.bak.gz')
+    ]
+    assert(len(backup_files) == 1)
+    assert(backup_files[0].startswith('stream_'))
+    with gzip.open(os.path.join(str(tmp_path), 'stream.txt.gz'), 'rt') as f:
+        assert('name = OverWrite' in f.read())
+
+
+def test_write_compression_invalid(tmp_path, capsys):
+    """ JinjaUtils Class Jinja Write Invalid Compression Method Test
+
+    This test will test JinjaUtils write method. This test will attempt to
+    write a rendered template using an unsupported compression format.
+
+    Expected Result:
+        Template write method will error gracefully on write attempt.
+    """
+    # Instantiate a JinjaUtils object, and test for expected test values.
+    Jinja = JinjaUtils(verbose=True)
+    write_template = Jinja.write(
+        output_directory=str(tmp_path),
+        output_file='test.txt',
+        compression='zip'
+    )
+    assert(not write_template)
+
+    # Capture stdout, stderr to check the log messages
+    # for the expected outputs.
+    out, err = capsys.readouterr()
+    assert "ERROR   CLS->JinjaUtils.write: \
+-> Compression expected one of ['gzip', 'bz2', 'lzma'] but received: zip" \
+        in err
+
+
+def test_write_skip_unchanged(tmp_path, capsys):
+    """ JinjaUtils Class Jinja Write Skip Unchanged Method Test
+
+    This test will test JinjaUtils write and write_many methods with
+    skip_unchanged enabled. This test will write the same rendered template
+    twice, then write a changed render.
+
+    Expected Result:
+        Unchanged outputs are left untouched without a backup, changed
+        outputs are written and backed up.
+    """
+    # Declare the test template directory thats constructed during test setup
+    current_directory = os.getcwd()
+    test_template_directory = os.path.join(
+        current_directory,
+        'pytest_template_directory'
+    )
+
+    # Instantiate a JinjaUtils object, and render the test template.
+    Jinja = JinjaUtils(verbose=True)
+    Jinja.template_directory = test_template_directory
+    Jinja.load = 'test_tpl.j2'
+    Jinja.render(name="PyTest", debug=True, context={'key': 'value'})
+    output_path = os.path.join(str(tmp_path), 'skip.txt.gz')
+    for _ in range(2):
+        assert(Jinja.write(
+            str(tmp_path), 'skip.txt', compression='gzip', skip_unchanged=True
+        ))
+    out, err = capsys.readouterr()
+    assert("skip.txt.gz is unchanged, skipping write!" in out)
+    assert(os.listdir(str(tmp_path)) == ['skip.txt.gz'])
+
+    # Unchanged batch items are counted separately from written items.
+    stats = Jinja.write_many(
+        [(output_path, Jinja.rendered), (output_path[:-3] + '.new', 'new')],
+        compression='gzip',
+        skip_unchanged=True
+    )
+    assert(stats['unchanged'] == 1)
+    assert(stats['written'] == 1 and stats['backups'] == 0)
+
+    # A changed render is written and backed up.
+    Jinja.render(name="Changed", debug=True, context={'key': 'value'})
+    assert(Jinja.write(
+        str(tmp_path), 'skip.txt', compression='gzip', skip_unchanged=True
+    ))
+    assert(len([
+        f for f in os.listdir(str(tmp_path)) if f.endswith('.bak.gz')
+    ]) == 1)
+
+
+####################################
+# Test Pipeline Hook methods:      #
+####################################
+def test_pipeline_hooks(tmp_path, capsys):
+    """ JinjaUtils Class Pipeline Hooks Method Test
+
+    This test will register before and after hooks on every pipeline phase,
+    then load, render and write the test template twice.
+
+    Expected Result:
+        Hooks are called around each phase with the template name, timings
+        and sizes, and a failing hook does not interrupt the pipeline.
+    """
+    # Declare the test template directory thats constructed during test setup
+    current_directory = os.getcwd()
+    test_template_directory = os.path.join(
+        current_directory,
+        'pytest_template_directory'
+    )
+
+    # Instantiate a JinjaUtils object, and register the hooks.
+    Jinja = JinjaUtils()
+    assert(not Jinja._instrumented)
+    events = []
+
+    def before(phase, template):
+        events.append(('before', phase, template))
+
+    def after(phase, template, seconds, size, error):
+        events.append(('after', phase, template, size, error))
+        assert(seconds >= 0)
+
+    def failing(phase, template):
+        raise RuntimeError("hook failure")
+
+    for phase in ('lookup', 'compile', 'render', 'backup', 'write'):
+        assert(Jinja.add_hook(phase, before=before, after=after))
+    assert(Jinja.add_hook('render', before=failing))
+    assert(Jinja._instrumented)
+    assert(Jinja._metrics is None)
+
+    # Run the pipeline.
+    Jinja.template_directory = test_template_directory
+    Jinja.load = 'test_tpl.j2'
+    Jinja.render(name="PyTest", debug=True, context={'key': 'value'})
+    assert('name = PyTest' in Jinja.rendered)
+    Jinja.write(str(tmp_path), 'hooks.txt')
+    Jinja.write(str(tmp_path), 'hooks.txt')
+
+    phases = [event[1] for event in events if event[0] == 'before']
+    assert(phases == [
+        'lookup', 'compile', 'render', 'write', 'backup', 'write'
+    ])
+    render_after = [e for e in events if e[:2] == ('after', 'render')][0]
+    assert(render_after[2] == 'test_tpl.j2')
+    assert(render_after[3] == len(Jinja.rendered))
+    assert(not render_after[4])
+    out, err = capsys.readouterr()
+    assert "EXCEPTION occurred in: CLS->JinjaUtils.hook" in err
+
+    # Remove the hooks, and test that invalid hooks are rejected.
+    assert(Jinja.remove_hook('render', before=failing) == 1)
+    assert(Jinja.remove_hook() == 5)
+    assert(not Jinja._instrumented)
+    assert(not Jinja.add_hook('parse', before=before))
+    assert(not Jinja.add_hook('render'))
+    assert(not Jinja.add_hook('render', after=42))
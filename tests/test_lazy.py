@@ -0,0 +1,153 @@
+# Run PyTest:
+# `poetry run pytest tests -v`
+# Run single test file instead of entire test suite:
+# `poetry run pytest tests/test_lazy.py -v`
+################
+# Imports:     #
+################
+
+# Pip Installed Imports:
+from cloudmage.jinjautils import JinjaUtils, LazyValue
+
+# Base Python Module Imports:
+import os
+
+import pytest
+
+
+######################################
+# Test Lazy Context Values:          #
+######################################
+def test_lazy_value():
+    """ JinjaUtils Lazy Value Test
+
+    This test will resolve a LazyValue and bind a new copy of it.
+
+    Expected Result:
+        The function is called once with its arguments, and a bound copy is
+        unresolved.
+    """
+    calls = []
+
+    def lookup(key, default=None):
+        calls.append(key)
+        return {'key': key, 'default': default}
+
+    value = LazyValue(lookup, 'users', default=[])
+    assert(not value.resolved and "resolved=False" in repr(value))
+    assert(value.resolve() == {'key': 'users', 'default': []})
+    assert(value.resolve() is value.resolve() and calls == ['users'])
+    assert(value.resolved and value.seconds >= 0)
+    assert(not value.bind().resolved)
+    with pytest.raises(TypeError):
+        LazyValue('not callable')
+
+
+def test_lazy_render(tmp_path):
+    """ JinjaUtils Lazy Render Test
+
+    This test will render templates from a template directory and a file
+    path with LazyValue arguments that are read, read by an included
+    template, read only within an untaken branch, and never read.
+
+    Expected Result:
+        Values are computed once per render when read, never computed when
+        not read, and the lazy statistics report both.
+    """
+    templates = {
+        'page.j2': "{{ users | length }}{% include 'part.j2' %}",
+        'part.j2': ":{{ users[0] }}",
+        'static.j2': "static",
+        'branch.j2': "{% if show %}{{ audit }}{% endif %}done",
+    }
+    for name, source in templates.items():
+        with open(os.path.join(str(tmp_path), name), 'w') as template:
+            template.write(source)
+    calls = []
+
+    def load_users():
+        calls.append('users')
+        return ['ann', 'bob']
+
+    def load_audit():
+        calls.append('audit')
+        return []
+
+    Jinja = JinjaUtils()
+    Jinja.template_directory = str(tmp_path)
+    context = {
+        'users': LazyValue(load_users),
+        'audit': LazyValue(load_audit),
+    }
+    Jinja.load = 'page.j2'
+    Jinja.render(**context)
+    assert(Jinja.rendered == "2:ann" and calls == ['users'])
+    Jinja.render(**context)
+    assert(calls == ['users', 'users'])
+    Jinja.load = 'static.j2'
+    Jinja.render(**context)
+    Jinja.load = os.path.join(str(tmp_path), 'part.j2')
+    Jinja.render(**context)
+    assert(Jinja.rendered == ":ann" and calls.count('users') == 3)
+    assert('audit' not in calls)
+    assert(not context['users'].resolved)
+
+    # Variables only read within a branch that is not taken are never
+    # computed, although Jinja looks them up when the render starts.
+    Jinja.load = 'branch.j2'
+    Jinja.render(show=False, **context)
+    assert(Jinja.rendered == "done" and 'audit' not in calls)
+    Jinja.render(show=True, **context)
+    assert(Jinja.rendered == "[]done" and calls.count('audit') == 1)
+
+    stats = Jinja.lazy_stats(reset=True)
+    assert(stats['users']['renders'] == 6)
+    assert(stats['users']['resolved'] == 3)
+    assert(stats['audit']['renders'] == 6)
+    assert(stats['audit']['resolved'] == 1)
+    assert(Jinja.lazy_stats() == {})
+
+
+def test_lazy_proxy(tmp_path):
+    """ JinjaUtils Lazy Proxy Test
+
+    This test will use a LazyValue argument in expressions, tests, loops,
+    the tojson and to_json filters, and as a native render result.
+
+    Expected Result:
+        The value is computed once, on first use, and every use sees the
+        computed value rather than its proxy.
+    """
+    calls = []
+
+    def load_config():
+        calls.append('config')
+        return {'ports': [80, 443], 'name': 'web'}
+
+    Jinja = JinjaUtils()
+    Jinja.template_directory = str(tmp_path)
+    source = (
+        "{{ config.name }}:{{ config['ports'][0] + 1 }}:"
+        "{{ config is mapping }}:{{ config.ports | length }}:"
+        "{% for port in config.ports %}{{ port }},{% endfor %}:"
+        "{{ config | tojson }}:{{ {'c': config} | to_json(compact=True) }}"
+    )
+    rendered = Jinja.render_string(source, config=LazyValue(load_config))
+    assert(rendered == (
+        'web:81:True:2:80,443,:{"name": "web", "ports": [80, 443]}:'
+        '{"c":{"ports":[80,443],"name":"web"}}'
+    ))
+    assert(calls == ['config'])
+
+    Jinja.native = True
+    Jinja.template_directory = str(tmp_path)
+    assert(Jinja.render_string(
+        "{{ config }}",
+        config=LazyValue(load_config)
+    ) == {'ports': [80, 443], 'name': 'web'})
+    assert(Jinja.render_string(
+        "{{ config.ports | sum if enabled else 0 }}",
+        config=LazyValue(load_config),
+        enabled=False
+    ) == 0)
+    assert(calls == ['config', 'config'])
@@ -0,0 +1,111 @@
+# Run PyTest:
+# `poetry run pytest tests -v`
+# Run single test file instead of entire test suite:
+# `poetry run pytest tests/test_memory.py -v`
+################
+# Imports:     #
+################
+
+# Pip Installed Imports:
+from cloudmage.jinjautils import JinjaUtils
+from cloudmage.jinjautils.memory import deep_sizeof
+
+# Base Python Module Imports:
+import tracemalloc
+import sys
+import gc
+import os
+
+
+######################################
+# Test Memory Profiler:              #
+######################################
+def test_memory_profile(tmp_path):
+    """ JinjaUtils Class Memory Profile Test
+
+    This test will load, render and write a template that produces an
+    output far larger than its context with memory profiling enabled.
+
+    Expected Result:
+        Peak and retained memory are reported for each phase, the rendered
+        output is the top retained allocation of the render, and the
+        render is flagged as amplified.
+    """
+    with open(os.path.join(str(tmp_path), 'big.j2'), "w") as template:
+        template.write(
+            "{% for i in range(n) %}{{ name }} {{ i }}\n{% endfor %}"
+        )
+
+    Jinja = JinjaUtils()
+    assert(Jinja.memory_report() == {})
+    Jinja.memory_profile = True
+    assert(Jinja.memory_profile)
+    assert(tracemalloc.is_tracing())
+    Jinja.template_directory = str(tmp_path)
+    Jinja.load = 'big.j2'
+    Jinja.render(name='row', n=5000)
+    assert(Jinja.rendered.startswith("row 0\n"))
+    assert(Jinja.write(str(tmp_path), 'big.txt'))
+
+    report = Jinja.memory_report(limit=3)
+    assert(set(report['phases']) == {'load', 'render', 'write'})
+    render = report['phases']['render']['big.j2']
+    output_size = sys.getsizeof(Jinja.rendered)
+    assert(render['count'] == 1)
+    assert(render['peak'] >= output_size)
+    assert(render['last_retained'] >= output_size)
+    assert(len(render['sites']) <= 3)
+    assert(render['sites'][0]['size'] >= output_size)
+    assert(report['phases']['load']['big.j2']['retained'] > 0)
+    assert(report['renders']['big.j2']['flagged'])
+    assert(report['renders']['big.j2']['output_bytes'] == output_size)
+
+    Jinja.render(name='x' * 100, n=1)
+    report = Jinja.memory_report(template='big.j2')
+    assert(report['phases']['render']['big.j2']['count'] == 2)
+    assert(not report['renders']['big.j2']['flagged'])
+
+    Jinja.memory_profile = False
+    assert(not tracemalloc.is_tracing())
+    assert(Jinja.memory_report() == {})
+
+
+def test_memory_profile_file_template(tmp_path):
+    """ JinjaUtils Class Memory Profile File Template Test
+
+    This test will profile a template loaded from a file path, then drop
+    the profiling object without disabling memory profiling.
+
+    Expected Result:
+        Every phase is keyed by the template file name, and tracemalloc is
+        stopped once the object is dropped.
+    """
+    template_path = os.path.join(str(tmp_path), 'file.j2')
+    with open(template_path, "w") as template:
+        template.write("{{ name }}")
+
+    Jinja = JinjaUtils()
+    Jinja.memory_profile = True
+    Jinja.load = template_path
+    Jinja.render(name='file')
+    assert(Jinja.write(str(tmp_path), 'file.txt'))
+    phases = Jinja.memory_report()['phases']
+    assert(all(list(phases[phase]) == ['file.j2'] for phase in phases))
+
+    del Jinja
+    gc.collect()
+    assert(not tracemalloc.is_tracing())
+
+
+def test_deep_sizeof():
+    """ Deep Size Estimate Test
+
+    This test will estimate the size of nested and shared containers.
+
+    Expected Result:
+        Nested values are counted and shared objects are counted once.
+    """
+    shared = ['x' * 1000]
+    size = deep_sizeof({'a': shared, 'b': shared})
+    assert(size >= sys.getsizeof('x' * 1000) + sys.getsizeof(shared))
+    assert(size < 2 * sys.getsizeof('x' * 1000))
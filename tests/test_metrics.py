@@ -0,0 +1,117 @@
+# Run PyTest:
+# `poetry run pytest tests -v`
+# Run single test file instead of entire test suite:
+# `poetry run pytest tests/test_metrics.py -v`
+################
+# Imports:     #
+################
+
+# Pip Installed Imports:
+from cloudmage.jinjautils import JinjaUtils
+from cloudmage.jinjautils.metrics import PhaseMetrics, LATENCY_BUCKETS
+
+# Base Python Module Imports:
+import os
+
+
+######################################
+# Test Phase Metrics:                #
+######################################
+def test_phase_metrics_record():
+    """ PhaseMetrics Record and Snapshot Test
+
+    This test will record phase timings and test the returned snapshot.
+
+    Expected Result:
+        Counts, errors, bytes and histogram buckets match the records.
+    """
+    metrics = PhaseMetrics()
+    metrics.record('render', 'a.j2', 0.00005, size=10)
+    metrics.record('render', 'a.j2', 0.2, size=5, error=True)
+    snapshot = metrics.snapshot(reset=True)
+    entry = snapshot['render']['a.j2']
+    assert(entry['count'] == 2)
+    assert(entry['errors'] == 1)
+    assert(entry['bytes'] == 15)
+    assert(entry['min'] == 0.00005 and entry['max'] == 0.2)
+    assert(len(entry['histogram']) == len(LATENCY_BUCKETS) + 1)
+    assert(entry['histogram'][0] == (0.0001, 1))
+    assert(sum(count for bound, count in entry['histogram']) == 2)
+    assert(metrics.snapshot() == {})
+
+
+def test_metrics_pipeline(tmp_path):
+    """ JinjaUtils Class Metrics Pipeline Test
+
+    This test will enable metrics, then load, render and write a template
+    from the test template directory twice to capture each phase.
+
+    Expected Result:
+        Each pipeline phase is recorded, keyed by the template name, and
+        compile is only recorded when the template is compiled.
+    """
+    # Declare the test template directory thats constructed during test setup
+    test_template_directory = os.path.join(
+        os.getcwd(),
+        'pytest_template_directory'
+    )
+
+    Jinja = JinjaUtils(metrics=True)
+    assert(Jinja.metrics)
+    Jinja.template_directory = test_template_directory
+    Jinja.load = 'test_tpl.j2'
+    Jinja.render(name="PyTest", debug=True, context={'key': 'value'})
+    Jinja.write(str(tmp_path), 'metrics.txt')
+    Jinja.write(str(tmp_path), 'metrics.txt')
+    Jinja.render(debug=True)
+
+    snapshot = Jinja.metrics_snapshot()
+    assert(set(snapshot) == {'lookup', 'compile', 'render', 'backup', 'write'})
+    assert(snapshot['lookup']['test_tpl.j2']['count'] == 1)
+    assert(snapshot['compile']['test_tpl.j2']['count'] == 1)
+    assert(snapshot['render']['test_tpl.j2']['count'] == 2)
+    assert(snapshot['render']['test_tpl.j2']['errors'] == 1)
+    assert(snapshot['render']['test_tpl.j2']['bytes'] > 0)
+    assert(snapshot['backup']['test_tpl.j2']['count'] == 1)
+    assert(snapshot['write']['test_tpl.j2']['count'] == 2)
+
+    # write_many phases use the same template label as write.
+    Jinja.write_many([(os.path.join(str(tmp_path), 'many.txt'), "many")])
+    snapshot = Jinja.metrics_snapshot()
+    assert(snapshot['write']['test_tpl.j2']['count'] == 3)
+    assert(snapshot['write']['test_tpl.j2']['bytes'] > 4)
+    assert('write_many' not in snapshot['write'])
+
+    # A template served from the Environment cache is not compiled again,
+    # and templates loaded from a file path are keyed by the file name.
+    Jinja.load = 'test_tpl.j2'
+    template_path = os.path.join(test_template_directory, 'test_tpl.j2')
+    Jinja.load = template_path
+    snapshot = Jinja.metrics_snapshot()
+    assert(snapshot['lookup']['test_tpl.j2']['count'] == 3)
+    assert(snapshot['compile']['test_tpl.j2']['count'] == 2)
+    assert(not any(
+        template_path in templates for templates in snapshot.values()
+    ))
+
+
+def test_metrics_disabled():
+    """ JinjaUtils Class Metrics Disabled Test
+
+    This test will test the metrics getter and setter property methods.
+
+    Expected Result:
+        No metrics are collected while metrics are disabled.
+    """
+    Jinja = JinjaUtils()
+    assert(not Jinja.metrics)
+    assert(Jinja.metrics_snapshot() == {})
+    Jinja.write_many([])
+    assert(Jinja.metrics_snapshot() == {})
+
+    Jinja.metrics = True
+    assert(Jinja.metrics and Jinja._instrumented)
+    Jinja.metrics = 42
+    assert(Jinja.metrics)
+    Jinja.metrics = False
+    assert(not Jinja._instrumented)
@@ -0,0 +1,100 @@
+# Run PyTest:
+# `poetry run pytest tests -v`
+# Run single test file instead of entire test suite:
+# `poetry run pytest tests/test_openmetrics.py -v`
+################
+# Imports:     #
+################
+
+# Pip Installed Imports:
+from cloudmage.jinjautils import JinjaUtils
+from cloudmage.jinjautils.metrics import PhaseMetrics
+from cloudmage.jinjautils.openmetrics import (
+    generate_openmetrics,
+    CONTENT_TYPE
+)
+
+# Base Python Module Imports:
+import urllib.request
+import os
+
+
+######################################
+# Test OpenMetrics Exposition:       #
+######################################
+def test_generate_openmetrics():
+    """ OpenMetrics Exposition Format Test
+
+    This test will generate the exposition for recorded phase metrics.
+
+    Expected Result:
+        Histogram buckets are cumulative, counters use the _total suffix,
+        label values are escaped and the exposition ends with # EOF.
+    """
+    metrics = PhaseMetrics(buckets=(0.1, 1.0))
+    metrics.record('render', 'a"b.j2', 0.05, size=10)
+    metrics.record('render', 'a"b.j2', 0.5, error=True)
+    metrics.increment('template_cache_hits', 'a"b.j2')
+    exposition = generate_openmetrics(metrics)
+    lines = exposition.splitlines()
+    assert(lines[-1] == "# EOF")
+    assert("# TYPE jinjautils_phase_duration_seconds histogram" in lines)
+    assert('jinjautils_phase_duration_seconds_bucket{phase="render",\
+template="a\\"b.j2",le="0.1"} 1' in lines)
+    assert('jinjautils_phase_duration_seconds_bucket{phase="render",\
+template="a\\"b.j2",le="+Inf"} 2' in lines)
+    assert('jinjautils_phase_duration_seconds_count{phase="render",\
+template="a\\"b.j2"} 2' in lines)
+    assert('jinjautils_phase_errors_total{phase="render",\
+template="a\\"b.j2"} 1' in lines)
+    assert('jinjautils_phase_bytes_total{phase="render",\
+template="a\\"b.j2"} 10' in lines)
+    assert('jinjautils_template_cache_hits_total{template="a\\"b.j2"} 1' in
+           lines)
+
+
+def test_metrics_export_and_serve(tmp_path):
+    """ JinjaUtils Class Metrics Export and Serve Test
+
+    This test will load a template twice to record a cache hit, then
+    export the metrics to a file and a callable, and scrape the built in
+    HTTP endpoint.
+
+    Expected Result:
+        Each target receives the same exposition.
+    """
+    test_template_directory = os.path.join(
+        os.getcwd(),
+        'pytest_template_directory'
+    )
+    Jinja = JinjaUtils()
+    assert(Jinja.metrics_openmetrics() is None)
+    assert(not Jinja.metrics_export(str(tmp_path)))
+    assert(Jinja.metrics_serve() is None)
+
+    Jinja.metrics = True
+    Jinja.template_directory = test_template_directory
+    Jinja.load = 'test_tpl.j2'
+    Jinja.load = 'test_tpl.j2'
+    Jinja.render(name="PyTest", debug=True, context={})
+    exposition = Jinja.metrics_openmetrics()
+    assert('jinjautils_template_cache_misses_total{template="test_tpl.j2"} 1'
+           in exposition)
+    assert('jinjautils_template_cache_hits_total{template="test_tpl.j2"} 1'
+           in exposition)
+
+    export_file = os.path.join(str(tmp_path), 'jinjautils.prom')
+    assert(Jinja.metrics_export(export_file))
+    assert(open(export_file).read() == exposition)
+    received = []
+    assert(Jinja.metrics_export(received.append))
+    assert(received == [exposition])
+    assert(not Jinja.metrics_export(42))
+
+    server = Jinja.metrics_serve()
+    try:
+        with urllib.request.urlopen(server.url) as response:
+            assert(response.headers['Content-Type'] == CONTENT_TYPE)
+            assert(response.read().decode('utf-8') == exposition)
+    finally:
+        server.close()
@@ -0,0 +1,92 @@
+# Run PyTest:
+# `poetry run pytest tests -v`
+# Run single test file instead of entire test suite:
+# `poetry run pytest tests/test_profiler.py -v`
+################
+# Imports:     #
+################
+
+# Pip Installed Imports:
+from cloudmage.jinjautils import JinjaUtils
+
+# Base Python Module Imports:
+import os
+
+
+######################################
+# Test Render Profiler:              #
+######################################
+def test_profile_template_directory(tmp_path):
+    """ JinjaUtils Class Render Profile Template Directory Test
+
+    This test will profile the render of a template from a template
+    directory that extends a base template and includes another template.
+
+    Expected Result:
+        The report maps time back to the lines of each template, and the
+        collapsed stack export includes the include call chain.
+    """
+    templates = {
+        'base.j2': "head\n{% block body %}{% endblock %}\ntail",
+        'page.j2': (
+            "{% extends 'base.j2' %}{% block body %}\n"
+            "{% for i in items %}\n"
+            "{{ i | upper }}\n"
+            "{% include 'item.j2' %}\n"
+            "{% endfor %}{% endblock %}"
+        ),
+        'item.j2': "item {{ i }}",
+    }
+    for name, source in templates.items():
+        with open(os.path.join(str(tmp_path), name), "w") as template:
+            template.write(source)
+
+    Jinja = JinjaUtils()
+    Jinja.profile = True
+    assert(Jinja.profile)
+    Jinja.template_directory = str(tmp_path)
+    Jinja.load = 'page.j2'
+    Jinja.render(items=['a', 'b', 'c'])
+    assert('item c' in Jinja.rendered)
+
+    report = Jinja.profile_report()
+    assert(set(report) == {'base.j2', 'page.j2', 'item.j2'})
+    page_lines = {entry['line']: entry for entry in report['page.j2']}
+    assert(page_lines[3]['source'] == "{{ i | upper }}")
+    assert(page_lines[3]['block'] == "block body")
+    assert(page_lines[4]['hits'] >= 3)
+    assert(report['item.j2'][0]['source'] == "item {{ i }}")
+
+    export_file = os.path.join(str(tmp_path), 'profile.folded')
+    collapsed = Jinja.profile_export(export_file)
+    assert("page.j2:block body:4;item.j2:root:1 " in collapsed)
+    assert(open(export_file).read() == collapsed)
+
+
+def test_profile_template_file(tmp_path, capsys):
+    """ JinjaUtils Class Render Profile Template File Test
+
+    This test will profile the render of a template loaded from a path.
+
+    Expected Result:
+        The report includes the template source lines, and disabling
+        profiling discards the profile.
+    """
+    template_file = os.path.join(str(tmp_path), 'file_tpl.j2')
+    with open(template_file, "w") as template:
+        template.write("{% for i in range(3) %}\n{{ i }}\n{% endfor %}")
+
+    Jinja = JinjaUtils()
+    assert(Jinja.profile_report() == {})
+    assert(Jinja.profile_export() is None)
+    Jinja.profile = True
+    Jinja.load = template_file
+    Jinja.render()
+    report = Jinja.profile_report(template='file_tpl.j2', limit=1)
+    assert(len(report['file_tpl.j2']) == 1)
+    sources = [e['source'] for e in Jinja.profile_report()['file_tpl.j2']]
+    assert("{{ i }}" in sources)
+
+    Jinja.profile = False
+    assert(not Jinja.profile)
+    assert(Jinja.profile_report() == {})
@@ -0,0 +1,83 @@
+# Run PyTest:
+# `poetry run pytest tests -v`
+# Run single test file instead of entire test suite:
+# `poetry run pytest tests/test_sources.py -v`
+################
+# Imports:     #
+################
+
+# Pip Installed Imports:
+from cloudmage.jinjautils.sources import (
+    read_csv,
+    read_jsonl,
+    read_lines,
+    read_records,
+    source_format
+)
+
+# Base Python Module Imports:
+import gzip
+import io
+import os
+
+import pytest
+
+
+######################################
+# Test Record Readers:               #
+######################################
+def test_read_records(tmp_path):
+    """ JinjaUtils Streaming Context Sources Test
+
+    This test will read JSON Lines, gzip compressed JSON Lines, CSV, TSV
+    and newline delimited sources.
+
+    Expected Result:
+        Each source yields one dict per record, blank lines are skipped and
+        the record format is selected from the file extension.
+    """
+    jsonl = os.path.join(str(tmp_path), 'data.jsonl.gz')
+    with gzip.open(jsonl, 'wt') as data:
+        data.write('{"name": "a", "value": 1}\n\n{"name": "b", "value": 2}\n')
+    csv_path = os.path.join(str(tmp_path), 'data.csv')
+    with open(csv_path, 'w') as data:
+        data.write('name,value\na,"1,5"\nb,2\n')
+
+    assert(source_format(jsonl) == 'jsonl')
+    assert(source_format('data.TSV') == 'tsv')
+    assert(source_format('data.json') is None)
+    assert(list(read_records(jsonl)) == [
+        {'name': 'a', 'value': 1}, {'name': 'b', 'value': 2}
+    ])
+    assert(list(read_records(csv_path)) == [
+        {'name': 'a', 'value': '1,5'}, {'name': 'b', 'value': '2'}
+    ])
+    assert(list(read_csv(
+        io.StringIO("a\t1\n"), delimiter='\t', fieldnames=['name', 'value']
+    )) == [{'name': 'a', 'value': '1'}])
+    assert(list(read_records(
+        io.BytesIO(b"x\t1\n"), 'tsv', fieldnames=['name', 'value']
+    )) == [{'name': 'x', 'value': '1'}])
+    assert(list(read_lines(io.StringIO("one\r\n\ntwo\n"), key='host')) == [
+        {'host': 'one'}, {'host': 'two'}
+    ])
+
+
+def test_read_records_invalid(tmp_path):
+    """ JinjaUtils Streaming Context Sources Invalid Input Test
+
+    This test will read invalid JSON Lines and unknown formats.
+
+    Expected Result:
+        A ValueError naming the failing line or format is raised.
+    """
+    with pytest.raises(ValueError, match="line 2"):
+        list(read_jsonl(io.StringIO('{"a": 1}\n{"a": \n')))
+    with pytest.raises(ValueError, match="Line 1 expected a JSON object"):
+        list(read_jsonl(io.StringIO('[1, 2]\n')))
+    with pytest.raises(ValueError, match="Record format"):
+        read_records(os.path.join(str(tmp_path), 'data.json'))
+    with pytest.raises(ValueError, match="record_format is required"):
+        read_records(io.StringIO(""))
+    with pytest.raises(ValueError, match="Record format"):
+        read_records(io.StringIO(""), 'xml')
@@ -0,0 +1,189 @@
+# Run PyTest:
+# `poetry run pytest tests -v`
+# Run single test file instead of entire test suite:
+# `poetry run pytest tests/test_watch.py -v`
+################
+# Imports:     #
+################
+
+# Pip Installed Imports:
+from cloudmage.jinjautils.watch import (
+    DependencyGraph,
+    InotifyScanner,
+    ManifestWatcher,
+    PollingScanner
+)
+from jinja2 import Environment, DictLoader
+
+# Base Python Module Imports:
+import json
+import sys
+import os
+
+import pytest
+
+
+def _write(path, content):
+    """ Write a test file, creating its directory. """
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "w") as output_file:
+        output_file.write(content)
+
+
+######################################
+# Test Dependency Graph:             #
+######################################
+def test_dependency_graph():
+    """ JinjaUtils Watch Dependency Graph Test
+
+    This test will build a dependency graph from extends, include, import
+    and dynamic include references.
+
+    Expected Result:
+        Changes affect the changed template and every template depending on
+        it directly or indirectly, and dynamic templates are always affected.
+    """
+    graph = DependencyGraph(Environment(loader=DictLoader({
+        'base.j2': "{% block body %}{% endblock %}",
+        'layout.j2': "{% extends 'base.j2' %}",
+        'macros.j2': "{% macro m() %}m{% endmacro %}",
+        'partial.j2': "{% import 'macros.j2' as macros %}{{ macros.m() }}",
+        'page_a.j2': (
+            "{% extends 'layout.j2' %}"
+            "{% block body %}{% include 'partial.j2' %}{% endblock %}"
+        ),
+        'page_b.j2': "{% extends 'base.j2' %}",
+        'page_c.j2': "plain",
+        'page_d.j2': "{% include name %}",
+    })))
+    graph.add(['page_a.j2', 'page_b.j2', 'page_c.j2', 'page_d.j2'])
+    assert(graph.references('page_a.j2') == {'layout.j2', 'partial.j2'})
+    assert(graph.changed(['macros.j2']) == {
+        'macros.j2', 'partial.j2', 'page_a.j2', 'page_d.j2'
+    })
+    assert(graph.changed(['base.j2']) == {
+        'base.j2', 'layout.j2', 'page_a.j2', 'page_b.j2', 'page_d.j2'
+    })
+    assert(graph.changed(['page_c.j2']) == {'page_c.j2', 'page_d.j2'})
+    assert(graph.changed([]) == set())
+
+
+######################################
+# Test Manifest Watcher:             #
+######################################
+@pytest.mark.parametrize('inotify', [False, None])
+def test_manifest_watcher(tmp_path, inotify):
+    """ JinjaUtils Manifest Watcher Test
+
+    This test will watch a manifest and change a partial, a context file,
+    a new sub directory template and the manifest.
+
+    Expected Result:
+        Only the outputs affected by each change are rendered again, and a
+        manifest change renders every output.
+    """
+    root = str(tmp_path)
+    templates = os.path.join(root, 'templates')
+    out = os.path.join(root, 'out')
+    _write(os.path.join(templates, 'partial.j2'), "p1")
+    _write(
+        os.path.join(templates, 'page_a.j2'),
+        "a:{% include 'partial.j2' %}"
+    )
+    _write(
+        os.path.join(templates, 'page_b.j2'),
+        "b:{{ name }}{% include 'sub/new.j2' ignore missing %}"
+    )
+    _write(os.path.join(root, 'data.json'), json.dumps({'name': 'x'}))
+    manifest = {
+        'template_directory': 'templates',
+        'output_directory': 'out',
+        'renders': [
+            {'template': 'page_a.j2', 'output': 'a.txt'},
+            {
+                'template': 'page_b.j2',
+                'output': 'b.txt',
+                'context_file': 'data.json'
+            },
+        ]
+    }
+    manifest_path = os.path.join(root, 'manifest.json')
+    _write(manifest_path, json.dumps(manifest))
+
+    watcher = ManifestWatcher(manifest_path, inotify=inotify, interval=0.05)
+    try:
+        if inotify is None and sys.platform.startswith('linux'):
+            assert(isinstance(watcher.scanner, InotifyScanner))
+        elif inotify is False:
+            assert(isinstance(watcher.scanner, PollingScanner))
+        assert(watcher.render()['written'] == 2)
+        assert(watcher.poll(timeout=0.1) is None)
+
+        _write(os.path.join(templates, 'partial.j2'), "p22")
+        report = watcher.poll(timeout=5)
+        assert(report['total'] == 1 and report['written'] == 1)
+        assert(report['changed'] == [os.path.join(templates, 'partial.j2')])
+        assert(open(os.path.join(out, 'a.txt')).read() == "a:p22")
+
+        _write(os.path.join(root, 'data.json'), json.dumps({'name': 'yy'}))
+        report = watcher.poll(timeout=5)
+        assert(report['total'] == 1)
+        assert(open(os.path.join(out, 'b.txt')).read() == "b:yy")
+
+        _write(os.path.join(templates, 'sub', 'new.j2'), "+new")
+        report = watcher.poll(timeout=5)
+        assert(report['total'] == 1)
+        assert(open(os.path.join(out, 'b.txt')).read() == "b:yy+new")
+
+        manifest['renders'].append({'template': 'partial.j2', 'output': 'p'})
+        _write(manifest_path, json.dumps(manifest))
+        report = watcher.poll(timeout=5)
+        assert(report['total'] == 3 and report['written'] == 1)
+        assert(report['unchanged'] == 2)
+        assert(open(os.path.join(out, 'p')).read() == "p22")
+    finally:
+        watcher.close()
+
+
+def test_manifest_watchers_isolated(tmp_path):
+    """ JinjaUtils Manifest Watchers Isolation Test
+
+    This test will create two watchers of different manifests in the same
+    process and run a third manifest between their renders.
+
+    Expected Result:
+        Each watcher renders with its own templates and context, and keeps
+        an Environment that never evicts its compiled templates.
+    """
+    from cloudmage.jinjautils.cli import run_manifest
+    manifests = []
+    for name in ('one', 'two', 'three'):
+        root = os.path.join(str(tmp_path), name)
+        _write(os.path.join(root, 'templates', 'page.j2'), name + ":{{ v }}")
+        manifest_path = os.path.join(root, 'manifest.json')
+        _write(manifest_path, json.dumps({
+            'template_directory': 'templates',
+            'output_directory': 'out',
+            'defaults': {'context': {'v': name.upper()}},
+            'renders': [{'template': 'page.j2', 'output': 'page.txt'}]
+        }))
+        manifests.append(manifest_path)
+
+    watchers = [
+        ManifestWatcher(path, inotify=False) for path in manifests[:2]
+    ]
+    try:
+        assert(run_manifest(manifests[2])['written'] == 1)
+        for watcher, name in zip(watchers, ('one', 'two')):
+            assert(watcher.render()['written'] == 1)
+            output = os.path.join(
+                str(tmp_path), name, 'out', 'page.txt'
+            )
+            assert(open(output).read() == name + ":" + name.upper())
+            environment = watcher._worker['jinja']._jinja_tpl_library
+            assert(environment.cache is None or isinstance(
+                environment.cache, dict
+            ))
+    finally:
+        for watcher in watchers:
+            watcher.close()